@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import subprocess
-import shutil
 import sys
 import os
 
+import pdf_engine
+
 # --- PDF 압축 핵심 기능 ---
 def compress_pdf(input_path, output_path, quality_level):
     """
@@ -22,17 +23,7 @@ def compress_pdf(input_path, output_path, quality_level):
         return False
 
     # Ghostscript 명령어 구성
-    command = [
-        gs_command,
-        "-sDEVICE=pdfwrite",
-        "-dCompatibilityLevel=1.4",
-        f"-dPDFSETTINGS=/{quality_level}",
-        "-dNOPAUSE",
-        "-dQUIET",
-        "-dBATCH",
-        f"-sOutputFile={output_path}",
-        input_path
-    ]
+    command = pdf_engine.build_command(gs_command, input_path, output_path, f"/{quality_level}")
 
     try:
         # 서브프로세스로 Ghostscript 실행
@@ -49,6 +40,8 @@ def compress_pdf(input_path, output_path, quality_level):
             stderr=subprocess.PIPE,
             startupinfo=startupinfo
         )
+        # 압축 결과가 원본보다 크면 원본으로 교체
+        pdf_engine.keep_smaller(input_path, output_path)
         return True
     except FileNotFoundError:
         messagebox.showerror("오류", "Ghostscript를 실행할 수 없습니다. 설치를 확인해주세요.")
@@ -66,14 +59,7 @@ def find_ghostscript_executable():
     시스템에서 Ghostscript 실행 파일을 찾습니다.
     (Windows: gswin64c.exe, gswin32c.exe / Linux/macOS: gs)
     """
-    if sys.platform == "win32":
-        for cmd in ["gswin64c", "gswin32c", "gs"]:
-            if shutil.which(cmd):
-                return shutil.which(cmd)
-    else: # Linux, macOS
-        if shutil.which("gs"):
-            return shutil.which("gs")
-    return None
+    return pdf_engine.find_ghostscript()
 
 # --- GUI 애플리케이션 ---
 class PDFCompressorApp:
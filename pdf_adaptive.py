@@ -0,0 +1,231 @@
+"""
+동시 실행 수 자동 조절
+- ConcurrencyLimit: 실행 중에 크기를 바꿀 수 있는 동시 실행 수 제한 (BoundedSemaphore 대신 with 문으로 사용)
+- ConcurrencyController: 주기적으로 부하 평균, 사용 가능한 메모리, gs 자식 프로세스별 메모리(RSS),
+  I/O 압박(PSI)을 읽고 정해진 범위 안에서 동시 실행 수를 늘리거나 줄임
+  - 메모리가 부족하면 바로 줄임 (자식 프로세스 하나당 메모리로 필요한 만큼)
+  - 부하 평균이나 I/O 압박이 높으면 하나씩 줄임
+  - 작업이 자리를 기다리고 있고 CPU, 메모리, I/O 모두 여유가 있을 때만 하나씩 늘림
+  - 바꿀 때마다 이유와 함께 기록하고 이벤트 큐로 알림
+
+줄여도 이미 실행 중인 작업은 그대로 끝까지 실행되고, 새 작업만 자리가 날 때까지 기다립니다.
+/proc이 없는 환경(Windows, macOS)에서는 메모리/I/O 항목을 건너뛰고 부하 평균만 사용합니다.
+"""
+import math
+import os
+import threading
+import time
+
+# 상태를 읽는 간격 (초)
+CONTROL_INTERVAL = 2.0
+# 동시 실행 수를 바꾼 뒤 다시 늘리기 전까지 기다리는 시간 (초, 부하 평균이 따라올 시간)
+GROW_COOLDOWN = 15.0
+# 부하/I/O 때문에 줄인 뒤 다시 줄이기 전까지 기다리는 시간 (초)
+SHRINK_COOLDOWN = 10.0
+# CPU 하나당 부하 평균: 이보다 높으면 줄이고, 낮으면 늘릴 수 있음
+LOAD_HIGH = 1.5
+LOAD_LOW = 0.8
+# I/O 압박 (/proc/pressure/io "some avg10", %): 이보다 높으면 줄이고, 낮으면 늘릴 수 있음
+IO_PRESSURE_HIGH = 40.0
+IO_PRESSURE_LOW = 10.0
+# 항상 남겨 둘 메모리 (전체 메모리 대비 비율과 최소 바이트 중 큰 값)
+MEMORY_RESERVE_SHARE = 0.1
+MEMORY_RESERVE_MIN = 256 * 1024 * 1024
+# 자식 프로세스 메모리를 모를 때 가정하는 값 (바이트)
+DEFAULT_CHILD_RSS = 256 * 1024 * 1024
+# 늘릴 때 자식 프로세스 하나당 필요한 여유 메모리 배수
+CHILD_RSS_HEADROOM = 1.5
+
+
+class ConcurrencyLimit:
+    """
+    크기를 바꿀 수 있는 동시 실행 수 제한
+    - with 문으로 자리를 얻고 반납 (자리가 없으면 날 때까지 대기)
+    - set_limit()으로 줄이면 실행 중인 작업은 그대로 두고 새 작업부터 적용
+    """
+    def __init__(self, limit):
+        self.limit = max(1, limit)
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            self.waiting += 1
+            try:
+                while self.active >= self.limit:
+                    self._condition.wait()
+            finally:
+                self.waiting -= 1
+            self.active += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def set_limit(self, limit):
+        with self._condition:
+            self.limit = max(1, limit)
+            self._condition.notify_all()
+
+
+def read_meminfo():
+    """(전체 메모리, 사용 가능한 메모리) 바이트 (/proc/meminfo가 없으면 (None, None))"""
+    values = {}
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in ("MemTotal", "MemAvailable"):
+                    values[name] = int(rest.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None, None
+    return values.get("MemTotal"), values.get("MemAvailable")
+
+
+def read_io_pressure():
+    """I/O 압박 "some avg10" (%, PSI를 지원하지 않으면 None)"""
+    try:
+        with open("/proc/pressure/io") as f:
+            for line in f:
+                if line.startswith("some "):
+                    for field in line.split()[1:]:
+                        key, _, value = field.partition("=")
+                        if key == "avg10":
+                            return float(value)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def process_rss(pid):
+    """프로세스 하나의 현재 RSS (바이트, 읽을 수 없으면 None)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def load_average():
+    """1분 부하 평균 (지원하지 않으면 None)"""
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+
+class ConcurrencyController:
+    """
+    동시 실행 수 자동 조절기 (start()로 백그라운드 스레드 시작, stop()으로 중지)
+    - limit: 조절할 ConcurrencyLimit
+    - minimum, maximum: 조절 범위
+    - child_pids: 지금 실행 중인 자식 프로세스 pid 목록을 돌려주는 함수
+    - events: 이벤트 큐 (바꿀 때마다 ("concurrency", 이전 값, 새 값, 이유) 전달)
+    - 결정 기록은 decisions에 [{"time", "from", "to", "reason", 측정값...}]로 남음
+    """
+    def __init__(self, limit, minimum, maximum, child_pids, events=None, interval=CONTROL_INTERVAL):
+        self.limit = limit
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.child_pids = child_pids
+        self.events = events
+        self.interval = interval
+        self.cpu_count = os.cpu_count() or 1
+        self.decisions = []
+        # 지금까지 본 자식 프로세스 하나의 가장 큰 메모리 (늘릴 때 필요한 여유 계산에 사용)
+        self.peak_child_rss = None
+        self._last_change = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.step()
+
+    def sample(self):
+        """현재 상태 측정값"""
+        total, available = read_meminfo()
+        rss = [value for value in map(process_rss, self.child_pids()) if value]
+        if rss:
+            self.peak_child_rss = max(self.peak_child_rss or 0, max(rss))
+        return {
+            "load": load_average(),
+            "memory_total": total,
+            "memory_available": available,
+            "children": len(rss),
+            "child_rss": round(sum(rss) / len(rss)) if rss else None,
+            "io_pressure": read_io_pressure(),
+            "active": self.limit.active,
+            "waiting": self.limit.waiting,
+        }
+
+    def decide(self, sample, now):
+        """측정값 -> (새 동시 실행 수, 이유) (바꾸지 않으면 (현재 값, None))"""
+        current = self.limit.limit
+        if current > self.maximum:
+            return self.maximum, f"최대값({self.maximum})으로 맞춤"
+        if current < self.minimum:
+            return self.minimum, f"최소값({self.minimum})으로 맞춤"
+        child_rss = self.peak_child_rss or sample["child_rss"] or DEFAULT_CHILD_RSS
+        since_change = now - self._last_change
+
+        # 메모리: 남겨 둘 양보다 적으면 모자란 만큼 바로 줄임 (스왑/OOM 방지)
+        headroom = None
+        if sample["memory_available"] is not None:
+            reserve = max(MEMORY_RESERVE_MIN, (sample["memory_total"] or 0) * MEMORY_RESERVE_SHARE)
+            headroom = sample["memory_available"] - reserve
+            if headroom < 0 and current > self.minimum:
+                shortage = math.ceil(-headroom / child_rss)
+                target = max(self.minimum, min(current, sample["active"]) - shortage)
+                if target < current:
+                    return target, f"메모리 부족 (사용 가능 {sample['memory_available'] // (1024 * 1024)}MB)"
+
+        load = sample["load"] / self.cpu_count if sample["load"] is not None else None
+        io_pressure = sample["io_pressure"]
+        if since_change >= SHRINK_COOLDOWN and current > self.minimum:
+            if load is not None and load > LOAD_HIGH:
+                return current - 1, f"부하 평균 높음 (CPU당 {load:.2f})"
+            if io_pressure is not None and io_pressure > IO_PRESSURE_HIGH:
+                return current - 1, f"I/O 압박 높음 ({io_pressure:.1f}%)"
+
+        # 늘리기: 자리를 기다리는 작업이 있고 모든 항목에 여유가 있을 때만
+        if current >= self.maximum or sample["waiting"] == 0 or since_change < GROW_COOLDOWN:
+            return current, None
+        if load is not None and load >= LOAD_LOW:
+            return current, None
+        if io_pressure is not None and io_pressure >= IO_PRESSURE_LOW:
+            return current, None
+        if headroom is not None and headroom < child_rss * CHILD_RSS_HEADROOM:
+            return current, None
+        reason = "여유 있음" + (f" (CPU당 부하 {load:.2f})" if load is not None else "")
+        return current + 1, reason
+
+    def step(self):
+        """한 번 측정하고 필요하면 동시 실행 수 변경 (변경했으면 결정 기록 반환)"""
+        now = time.monotonic()
+        sample = self.sample()
+        target, reason = self.decide(sample, now)
+        current = self.limit.limit
+        if reason is None or target == current:
+            return None
+        self.limit.set_limit(target)
+        self._last_change = now
+        decision = {"time": round(time.time(), 3), "from": current, "to": target, "reason": reason}
+        decision.update(sample)
+        self.decisions.append(decision)
+        if self.events is not None:
+            self.events.put(("concurrency", current, target, reason))
+        return decision
@@ -0,0 +1,332 @@
+"""
+압축 벤치마크
+- pdf_corpus로 만든 합성 코퍼스를 종류 x 압축 품질 x 실행 모드별로 압축하고 측정
+- 측정 항목: 초당 파일 수, 초당 입력 MB, 압축률(출력/입력), 최대 메모리(RSS)
+- 각 측정은 별도 프로세스에서 실행하여 메모리 측정이 서로 섞이지 않도록 함
+- 결과는 JSON으로 출력하며, 저장된 기준(baseline) 결과와 비교하여 성능 저하가 있으면 종료 코드 1
+- 처리량과 압축률은 성공한 파일만으로 계산하고, 모두 실패한 측정은 failed로 표시 (기준에서 되던 측정이면 성능 저하)
+
+사용 예:
+    python pdf_bench.py --save-baseline baseline.json
+    python pdf_bench.py --baseline baseline.json --modes parallel persistent --repeat 3
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import shutil
+import sys
+import tempfile
+import time
+
+import pdf_corpus
+import pdf_engine
+from pdf_cache import ResultCache, get_ghostscript_version
+from pdf_shard import MIN_SHARD_PAGES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 실행 모드 -> CompressionBatch 추가 인수 (max_workers가 없으면 -j 값 사용)
+MODES = {
+    "serial": {"max_workers": 1},
+    "parallel": {},
+    "parallel-fifo": {"schedule": "fifo"},
+    "persistent": {"persistent": True},
+    "cache-warm": {"cache": True},
+    "sharded": {"shard_threshold": MIN_SHARD_PAGES},
+    "target": {"target_ratio": 0.5},
+    "preflight": {"min_savings": 0.1},
+    "page-progress": {"page_progress": True},
+    "engine-python": {"engine": "python"},
+    "engine-python-streaming": {"engine": "python", "memory_limit": 256 * 1024 * 1024},
+    "engine-images": {"engine": "images"},
+}
+
+# 기준 결과와 비교할 항목 -> 값이 클수록 좋은지 여부
+METRICS = {
+    "files_per_sec": True,
+    "mb_per_sec": True,
+    "ratio": False,
+    "peak_rss_mb": False,
+}
+DEFAULT_TOLERANCE = 0.05
+
+
+def _peak_rss_mb(who):
+    """현재까지의 최대 RSS (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _run_case(files, compression, mode, ghostscript_path, workers, results):
+    """측정 하나 실행 (자식 프로세스에서 실행, 결과를 results 큐에 넣음)"""
+    options = dict(MODES[mode])
+    workers = options.pop("max_workers", workers)
+    output_dir = tempfile.mkdtemp(prefix="pdf_bench_")
+    try:
+        cache = None
+        if options.pop("cache", False):
+            cache = ResultCache(os.path.join(output_dir, "cache"))
+        target_ratio = options.pop("target_ratio", None)
+        if target_ratio:
+            sizes = sorted(os.path.getsize(path) for path in files)
+            options["target_size"] = int(sizes[len(sizes) // 2] * target_ratio)
+
+        jobs = [
+            (path, os.path.join(output_dir, f"{index:05d}_{os.path.basename(path)}"))
+            for index, path in enumerate(files)
+        ]
+
+        def run_batch():
+            events = queue.Queue()
+            batch = pdf_engine.CompressionBatch(
+                ghostscript_path, compression, jobs, workers, events, cache=cache, **options
+            )
+            started = time.monotonic()
+            batch.run()
+            seconds = time.monotonic() - started
+            errors = []
+            while not events.empty():
+                event = events.get()
+                if event[0] == "progress" and event[4]:
+                    errors.append(event[4])
+            return seconds, errors
+
+        if cache is not None:
+            # 첫 실행으로 캐시를 채우고 두 번째 실행만 측정
+            run_batch()
+            cache.reset_stats()
+        seconds, errors = run_batch()
+
+        # 실패한 파일은 출력이 없으므로 처리량과 압축률 계산에서 뺌
+        completed = [(path, output) for path, output in jobs if os.path.exists(output)]
+        input_bytes = sum(os.path.getsize(path) for path, _ in completed)
+        output_bytes = sum(os.path.getsize(output) for _, output in completed)
+        results.put({
+            "seconds": seconds,
+            "files": len(files),
+            "completed": len(completed),
+            "failures": len(errors),
+            "errors": errors[:3],
+            "input_bytes": input_bytes,
+            "output_bytes": output_bytes,
+            "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+            "python_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        })
+    except Exception as e:
+        results.put({"error": str(e)})
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def run_case(files, compression, mode, ghostscript_path, workers):
+    """측정 하나를 별도 프로세스에서 실행하고 결과 반환"""
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_run_case, args=(files, compression, mode, ghostscript_path, workers, results)
+    )
+    process.start()
+    while True:
+        try:
+            result = results.get(timeout=1)
+            break
+        except queue.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"측정 프로세스가 비정상 종료되었습니다: {process.exitcode}")
+    process.join()
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result
+
+
+def summarize(category, compression, mode, runs):
+    """
+    반복 측정 결과 요약 (시간은 가장 빠른 값, 메모리는 가장 큰 값)
+    - 처리량과 압축률은 성공한 파일만으로 계산, 하나도 성공하지 못하면 failed로 표시하고 비워 둠
+    """
+    best = min(runs, key=lambda run: run["seconds"])
+    seconds = max(best["seconds"], 1e-9)
+    peaks = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    failed = not best["completed"]
+    return {
+        "category": category,
+        "compression": compression,
+        "mode": mode,
+        "files": best["files"],
+        "completed": best["completed"],
+        "failed": failed,
+        "failures": max(run["failures"] for run in runs),
+        "errors": best["errors"],
+        "seconds": round(seconds, 4),
+        "files_per_sec": None if failed else round(best["completed"] / seconds, 3),
+        "mb_per_sec": None if failed else round(best["input_bytes"] / 1024 / 1024 / seconds, 3),
+        "input_bytes": best["input_bytes"],
+        "output_bytes": best["output_bytes"],
+        "ratio": round(best["output_bytes"] / best["input_bytes"], 4) if best["input_bytes"] else None,
+        "peak_rss_mb": round(max(peaks), 1) if peaks else None,
+        "python_rss_mb": round(max(run["python_rss_mb"] or 0 for run in runs), 1),
+    }
+
+
+def _case_key(result):
+    return result["category"], result["compression"], result["mode"]
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    기준 결과와 비교
+    - 반환값: 항목별 변화율 목록 [{category, compression, mode, metric, baseline, current, change, regression}]
+    """
+    previous = {_case_key(result): result for result in baseline.get("results", [])}
+    changes = []
+    for result in results:
+        old = previous.get(_case_key(result))
+        if old is None:
+            continue
+        if result.get("failed") and not old.get("failed"):
+            # 기준에서는 되던 측정이 이번에는 하나도 성공하지 못함
+            changes.append({
+                "category": result["category"],
+                "compression": result["compression"],
+                "mode": result["mode"],
+                "metric": "failed",
+                "baseline": False,
+                "current": True,
+                "change": None,
+                "regression": True,
+            })
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = old.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            changes.append({
+                "category": result["category"],
+                "compression": result["compression"],
+                "mode": result["mode"],
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+                "regression": worse > tolerance,
+            })
+    return changes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDF 압축 벤치마크")
+    parser.add_argument("--corpus-dir", default="bench_corpus", help="코퍼스 폴더 (없으면 생성, 기본값: bench_corpus)")
+    parser.add_argument("--seed", type=int, default=1, help="코퍼스 난수 seed (기본값: 1)")
+    parser.add_argument("--scale", type=int, default=1, help="코퍼스 쪽수/파일 수 배율 (기본값: 1)")
+    parser.add_argument("--categories", nargs="+", choices=list(pdf_corpus.CATEGORIES),
+                        default=list(pdf_corpus.CATEGORIES), help="측정할 코퍼스 종류 (기본값: 전체)")
+    parser.add_argument("--qualities", nargs="+", default=list(pdf_engine.COMPRESSION_LEVELS.values()),
+                        help="측정할 압축 품질 (기본값: 전체)")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES),
+                        help="측정할 실행 모드 (기본값: 전체)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="동시 작업 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--repeat", type=int, default=1, help="측정 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--gs", dest="ghostscript_path", help="Ghostscript 실행 파일 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE * 100, metavar="PERCENT",
+                        help="이 비율(%%)보다 나빠지면 성능 저하로 표시 (기본값: 5)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="결과를 기준 결과로 저장")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (기본값: 표준 출력)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    try:
+        qualities = [pdf_engine.normalize_compression(quality) for quality in args.qualities]
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    ghostscript_path = args.ghostscript_path or pdf_engine.find_ghostscript()
+    if not ghostscript_path:
+        print("오류: Ghostscript를 찾을 수 없습니다.", file=sys.stderr)
+        return 2
+
+    print("코퍼스 준비 중...", file=sys.stderr)
+    try:
+        corpus = pdf_corpus.generate(args.corpus_dir, args.seed, args.scale, args.categories, ghostscript_path)
+    except RuntimeError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    results = []
+    for category in args.categories:
+        files = corpus["categories"][category]
+        for compression in qualities:
+            for mode in args.modes:
+                try:
+                    runs = [
+                        run_case(files, compression, mode, ghostscript_path, args.jobs)
+                        for _ in range(max(1, args.repeat))
+                    ]
+                except RuntimeError as e:
+                    # 측정 프로세스가 오류로 끝나거나 비정상 종료된 경우 건너뜀
+                    # (PyPDF2 등 선택 의존성이 없는 모드는 여기가 아니라 파일별 실패로 기록됨)
+                    print(f"건너뜀 {category} {compression} {mode}: {e}", file=sys.stderr)
+                    continue
+                result = summarize(category, compression, mode, runs)
+                results.append(result)
+                if result["failed"]:
+                    print(f"실패 {category} {compression} {mode}: {(result['errors'] or ['?'])[0]}",
+                          file=sys.stderr)
+                    continue
+                print(f"{category:7} {compression:10} {mode:14} "
+                      f"{result['files_per_sec']:8.2f} 파일/초 {result['mb_per_sec']:8.2f} MB/초 "
+                      f"압축률 {result['ratio']}", file=sys.stderr)
+
+    report = {
+        "environment": {
+            "ghostscript": get_ghostscript_version(ghostscript_path),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "jobs": args.jobs,
+        },
+        "corpus": {"seed": corpus["seed"], "scale": corpus["scale"]},
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["comparison"] = compare(results, baseline, args.tolerance / 100)
+        regressions = [change for change in report["comparison"] if change["regression"]]
+        for change in regressions:
+            print(f"성능 저하: {change['category']} {change['compression']} {change['mode']} "
+                  f"{change['metric']} {change['baseline']} -> {change['current']}"
+                  + (f" ({change['change'] * 100:+.1f}%)" if change["change"] is not None else ""), file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
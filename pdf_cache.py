@@ -0,0 +1,204 @@
+"""
+압축 결과 캐시 (내용 주소 기반)
+- 키: 입력 파일 내용 해시 + Ghostscript 인수 + Ghostscript 버전
+- 적중 시 저장된 결과를 복사하여 gs 실행 생략
+  (지원하는 파일 시스템(btrfs, XFS 등)에서는 reflink로 블록을 공유하는 복사, 출력을 고쳐도 캐시는 그대로)
+- 용량 상한을 넘으면 가장 오래 사용하지 않은 항목부터 하한(CACHE_LOW_WATERMARK)까지 삭제 (LRU)
+  - 항목 크기와 사용 순서는 메모리 색인으로 관리하여 저장할 때마다 폴더를 다시 훑지 않음
+  - 다른 프로세스가 같은 폴더에 저장한 항목은 열 때와 적중했을 때 색인에 반영
+"""
+import collections
+import functools
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+CHUNK_SIZE = 1024 * 1024
+# Linux FICLONE ioctl (reflink 복사)
+FICLONE = 0x40049409
+# 상한을 넘으면 상한의 이 비율까지 줄임 (상한 근처에서 저장할 때마다 삭제하지 않도록)
+CACHE_LOW_WATERMARK = 0.9
+
+
+def default_cache_dir():
+    """운영체제별 기본 캐시 폴더"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pdf_compressor')
+
+
+@functools.lru_cache(maxsize=None)
+def get_ghostscript_version(ghostscript_path):
+    """Ghostscript 버전 문자열 (실행할 수 없으면 빈 문자열)"""
+    try:
+        result = subprocess.run(
+            [ghostscript_path, "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+    except OSError:
+        return ""
+    return result.stdout.strip()
+
+
+def hash_file(path):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    디스크 기반 압축 결과 캐시
+    - 여러 작업 스레드에서 동시에 사용할 수 있음
+    - hits / misses 카운터 제공
+    """
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 경로 -> 크기 (앞쪽이 가장 오래 사용하지 않은 항목)
+        self._index = collections.OrderedDict(
+            (path, size) for path, size, _ in sorted(self._entries(), key=lambda item: item[2])
+        )
+        self._total_bytes = sum(self._index.values())
+
+    def make_key(self, input_file, arguments, ghostscript_version):
+        """입력 내용, 인수 목록, gs 버전으로 캐시 키 생성"""
+        digest = hashlib.sha256()
+        digest.update(hash_file(input_file).encode())
+        for argument in arguments:
+            digest.update(b'\0')
+            digest.update(argument.encode())
+        digest.update(b'\0')
+        digest.update(ghostscript_version.encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pdf")
+
+    def fetch(self, key, output_file):
+        """캐시 적중 시 결과를 output_file에 배치하고 True 반환"""
+        entry = self._path(key)
+        try:
+            # 사용 시각 갱신 (LRU 기준)
+            os.utime(entry)
+            if os.path.lexists(output_file):
+                os.remove(output_file)
+            self._place(entry, output_file)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                self._forget(entry)
+            return False
+        with self._lock:
+            self.hits += 1
+            if entry in self._index:
+                self._index.move_to_end(entry)
+            else:
+                # 다른 프로세스가 저장한 항목 (그 사이 지워졌으면 색인에 넣지 않음)
+                try:
+                    self._add(entry, os.path.getsize(entry))
+                except FileNotFoundError:
+                    pass
+        return True
+
+    def _place(self, entry, output_file):
+        """
+        캐시 항목을 출력 경로로 복사 (하드링크는 쓰지 않음: 출력을 제자리에서 고치면 캐시까지 바뀜)
+        - reflink를 지원하면 블록을 공유하는 복사, 아니면 일반 복사
+        """
+        if fcntl is not None and sys.platform.startswith("linux"):
+            try:
+                with open(entry, "rb") as src, open(output_file, "xb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return
+            except OSError:
+                # 다른 파일 시스템이거나 reflink를 지원하지 않는 경우 (만들다 만 파일은 아래에서 덮어씀)
+                pass
+        shutil.copyfile(entry, output_file)
+
+    def store(self, key, output_file):
+        """압축 결과를 캐시에 저장하고 필요하면 오래된 항목 삭제"""
+        entry = self._path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+
+        # 임시 파일에 먼저 쓴 뒤 이름을 바꿔 다른 프로세스가 불완전한 파일을 보지 않도록 함
+        temp_path = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copyfile(output_file, temp_path)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, entry)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self._add(entry, size)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _add(self, path, size):
+        """색인에 항목 추가 (같은 키를 다시 저장하면 이전 크기를 빼고 가장 최근으로)"""
+        self._forget(path)
+        self._index[path] = size
+        self._total_bytes += size
+
+    def _forget(self, path):
+        self._total_bytes -= self._index.pop(path, 0)
+
+    def _entries(self):
+        """(경로, 크기, 마지막 사용 시각) 목록"""
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.pdf'):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        """하한(max_bytes * CACHE_LOW_WATERMARK) 이하가 될 때까지 가장 오래 사용하지 않은 항목 삭제"""
+        low = self.max_bytes * CACHE_LOW_WATERMARK
+        while self._index and self._total_bytes > low:
+            path, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        """캐시 통계"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "bytes": self._total_bytes}
+
+    def reset_stats(self):
+        """적중/미스 카운터 초기화"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def describe(self):
+        """상태 표시줄용 요약 문자열"""
+        return f"캐시 적중 {self.hits} / 미스 {self.misses}"
@@ -0,0 +1,496 @@
+"""
+PDF 압축 명령줄 도구 (GUI 없음)
+
+사용 예:
+    python pdf_cli.py "scans/**/*.pdf" -j 8 -q screen -o out/
+    python pdf_cli.py a.pdf b.pdf --json > result.json
+    python pdf_cli.py archive/ --incremental    # 지난 실행 이후 바뀐 파일만
+    python pdf_cli.py big.pdf --progress        # 페이지 단위 진행률과 남은 시간
+    python pdf_cli.py docs/ --engine python     # Ghostscript 없이 무손실 재작성
+    python pdf_cli.py scans/ --engine python --memory-limit 1GB   # 수 GB 문서를 메모리 상한 안에서 처리
+    python pdf_cli.py archive/ --journal run.sqlite3    # 파일별 진행 상태를 저널에 기록
+    python pdf_cli.py --journal run.sqlite3 --resume    # 중단된 배치를 멈춘 곳부터 이어서 실행
+    python pdf_cli.py scans/ --adaptive --max-jobs 16   # 부하/메모리에 따라 동시 작업 수 자동 조절
+    cat in.pdf | python pdf_cli.py - -q screen > out.pdf   # 파이프 모드 (임시 파일 없음)
+    python pdf_cli.py untrusted/ --timeout 120 --cpu-limit 300 --memory-cap 2GB   # 비정상 파일 격리
+    python pdf_cli.py archive/ inbox/ --interactive-below 5MB --metrics-log jobs.jsonl   # 작은 파일 먼저, 기록으로 순서 보정
+"""
+import argparse
+import glob
+import json
+import os
+import queue
+import shutil
+import sqlite3
+import sys
+import time
+
+import pdf_engine
+import pdf_limits
+import pdf_pipe
+from pdf_cache import DEFAULT_CACHE_MAX_BYTES, ResultCache
+from pdf_journal import JobJournal
+from pdf_manifest import FolderManifest, iter_pdf_files
+from pdf_metrics import MetricsLog
+from pdf_progress import format_duration
+from pdf_rewrite import DEFAULT_FLATE_LEVEL
+from pdf_schedule import CostModel
+from pdf_scratch import check_scratch_dir
+from pdf_target import parse_size
+
+# 터미널이 아닐 때 페이지 진행을 출력하는 간격 (초)
+PAGE_LOG_INTERVAL = 10
+# 저널에 기록하고 이어하기에서 되살리는 설정 (args 속성 이름)
+JOURNAL_SETTINGS = ("quality", "engine", "flate_level", "target_size", "min_savings", "shard_threshold",
+                    "memory_limit", "job_timeout", "cpu_limit", "memory_cap", "fallback")
+
+
+def expand_inputs(patterns, incremental_settings=None):
+    """
+    글롭 패턴과 폴더를 PDF 파일 목록으로 확장 (중복 제거, 입력 순서 유지)
+    - incremental_settings가 주어지면 폴더 입력은 매니페스트와 비교하여 바뀐 파일만 포함
+    - 반환값: (파일 목록, 변경 없어 건너뛴 파일 목록, 사용한 매니페스트 목록,
+      {파일: 출력 폴더에서 하위 폴더 구조를 유지할 기준 폴더})
+      (폴더 입력은 그 폴더, 글롭 패턴은 패턴에서 와일드카드 앞 부분, 파일 입력은 파일이 있는 폴더)
+    """
+    files = []
+    unchanged = []
+    manifests = []
+    bases = {}
+    seen = set()
+
+    def add(path, base):
+        if path not in seen:
+            seen.add(path)
+            files.append(path)
+            bases[path] = base
+
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            if incremental_settings is not None:
+                manifest = FolderManifest(pattern)
+                changed, skipped = manifest.scan(incremental_settings)
+                manifests.append(manifest)
+                unchanged.extend(skipped)
+                for path in changed:
+                    add(path, pattern)
+            else:
+                for path, _ in iter_pdf_files(pattern):
+                    add(path, pattern)
+            continue
+
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isdir(path) or not path.lower().endswith('.pdf'):
+                continue
+            if path.endswith('_compressed.pdf'):
+                continue
+            add(path, _pattern_base(pattern) if glob.has_magic(pattern) else os.path.dirname(path))
+    return files, unchanged, manifests, bases
+
+
+def _pattern_base(pattern):
+    """글롭 패턴에서 와일드카드가 처음 나오기 전까지의 폴더 ("docs/**/*.pdf" -> "docs")"""
+    parts = []
+    for part in pattern.replace("\\", "/").split("/")[:-1]:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return "/".join(parts) or "."
+
+
+def plan_outputs(input_files, bases, output_dir=None):
+    """
+    입력 파일별 출력 경로
+    - output_dir이 주어지면 bases(expand_inputs 참고) 기준 하위 폴더 구조를 유지
+    - 반환값: ({입력 파일: 출력 경로}, {입력 파일: 같은 출력 경로를 먼저 차지한 입력 파일})
+      (하위 폴더를 유지해도 겹치는 파일은 두 번째 목록으로, 결과가 덮어써져 사라지지 않도록)
+    """
+    outputs, conflicts, owners = {}, {}, {}
+    for input_file in input_files:
+        output_file = pdf_engine.get_output_path(input_file, output_dir, bases.get(input_file))
+        key = os.path.normcase(os.path.abspath(output_file))
+        if key in owners:
+            conflicts[input_file] = owners[key]
+            continue
+        owners[key] = input_file
+        outputs[input_file] = output_file
+    return outputs, conflicts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="pdf_cli.py",
+        description="Ghostscript를 사용한 PDF 일괄 압축"
+    )
+    parser.add_argument("inputs", nargs="*",
+                        help="PDF 파일, 폴더 또는 글롭 패턴 (예: 'docs/**/*.pdf'), "
+                             "-이면 표준 입력의 PDF를 압축해 표준 출력으로 (파이프 모드)")
+    parser.add_argument("-q", "--quality", default="ebook",
+                        help="압축 품질: screen, ebook, printer, prepress (기본값: ebook)")
+    parser.add_argument("-o", "--output-dir", help="출력 폴더 (기본값: 원본 파일과 같은 폴더)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="동시에 실행할 Ghostscript 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="부하 평균, 사용 가능한 메모리, gs 프로세스별 메모리, I/O 압박에 따라 "
+                             "동시 작업 수를 자동 조절 (-j 값에서 시작)")
+    parser.add_argument("--min-jobs", type=int, default=1, help="자동 조절 시 최소 동시 작업 수 (기본값: 1)")
+    parser.add_argument("--max-jobs", type=int,
+                        help="자동 조절 시 최대 동시 작업 수 (기본값: CPU 코어 수 x 2)")
+    parser.add_argument("--overwrite", action="store_true", help="이미 있는 출력 파일 덮어쓰기")
+    parser.add_argument("--gs", dest="ghostscript_path", help="Ghostscript 실행 파일 경로")
+    parser.add_argument("--engine", choices=pdf_engine.ENGINES, default=pdf_engine.DEFAULT_ENGINE,
+                        help="압축 엔진: ghostscript, python(무손실 재작성, PyPDF2 필요), "
+                             "images(이미지만 줄이기, PyPDF2/Pillow 필요), "
+                             "auto(이미지가 적은 문서는 python) (기본값: ghostscript)")
+    parser.add_argument("--flate-level", type=int, choices=range(1, 10), default=DEFAULT_FLATE_LEVEL,
+                        metavar="1-9", help=f"python 엔진의 Flate 압축 수준 (기본값: {DEFAULT_FLATE_LEVEL})")
+    parser.add_argument("--memory-limit", type=parse_size, metavar="SIZE",
+                        help="python 엔진을 스트리밍 모드로 실행하고 이 메모리 상한(예: 1GB) 안에서 처리, "
+                             "큰 스트림은 임시 파일 사용")
+    parser.add_argument("--cache", action="store_true",
+                        help="결과 캐시 사용 (입력과 설정이 같으면 gs를 다시 실행하지 않음)")
+    parser.add_argument("--cache-dir", help="캐시 폴더 (지정하면 --cache 자동 적용)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="캐시 최대 용량(MB), 초과 시 오래된 항목부터 삭제")
+    parser.add_argument("--incremental", action="store_true",
+                        help="폴더 입력은 매니페스트를 기준으로 새 파일이나 바뀐 파일만 처리")
+    parser.add_argument("--shard-threshold", type=int, metavar="PAGES",
+                        help="이 쪽수보다 긴 문서는 페이지 범위로 나눠 동시에 압축 (PyPDF2 필요)")
+    parser.add_argument("--target-size", type=parse_size, metavar="SIZE",
+                        help="목표 크기 (예: 10MB), 이 크기 이하에서 가장 품질이 높은 결과를 탐색")
+    parser.add_argument("--min-savings", type=float, metavar="PERCENT",
+                        help="사전 분석으로 예상 절감률이 이 값(%%) 미만인 파일은 압축하지 않고 원본 복사 (PyPDF2 필요)")
+    parser.add_argument("--persistent", action="store_true",
+                        help="파일마다 gs를 새로 띄우지 않고 상주 인터프리터 사용 (작은 파일이 많을 때 빠름)")
+    parser.add_argument("--progress", action="store_true",
+                        help="gs 출력을 실시간으로 읽어 페이지 단위 진행률, 초당 페이지 수, 남은 시간 표시")
+    parser.add_argument("--timeout", dest="job_timeout", type=float, metavar="SECONDS",
+                        help="파일 하나의 Ghostscript 실행 시간 상한 (넘으면 종료하고 --fallback 적용)")
+    parser.add_argument("--cpu-limit", type=int, metavar="SECONDS",
+                        help="gs 프로세스 하나의 CPU 시간 상한 (setrlimit, POSIX)")
+    parser.add_argument("--memory-cap", type=parse_size, metavar="SIZE",
+                        help="gs 프로세스 하나의 주소 공간 상한 (setrlimit, POSIX, 예: 2GB)")
+    parser.add_argument("--fallback", choices=pdf_limits.FALLBACKS, default=pdf_limits.DEFAULT_FALLBACK,
+                        help="제한에 걸린 파일 처리: screen(/screen으로 다시 시도, 실패하면 원본 복사), "
+                             "passthrough(원본 복사), none(실패로 처리) (기본값: screen)")
+    parser.add_argument("--metrics-log", metavar="PATH",
+                        help="작업별 측정값(시간, CPU, 메모리, 크기)을 JSONL로 추가 기록")
+    parser.add_argument("--prometheus", metavar="PATH",
+                        help="집계 측정값을 Prometheus 텍스트 형식 파일로 저장")
+    parser.add_argument("--schedule", choices=pdf_engine.SCHEDULES, default=pdf_engine.DEFAULT_SCHEDULE,
+                        help="작업 순서 (cost: 예상 시간이 긴 파일부터, fifo: 입력 순서대로, 기본값: cost)")
+    parser.add_argument("--interactive-below", type=parse_size, metavar="SIZE",
+                        help="이 크기보다 작은 파일은 우선 레인에 넣어 큰 파일보다 먼저 처리 (예: 5MB)")
+    parser.add_argument("--history", metavar="PATH",
+                        help="예상 시간 보정에 쓸 측정값 JSONL (기본값: --metrics-log 파일)")
+    parser.add_argument("--scratch-dir",
+                        help="압축 중 임시 출력 폴더 (tmpfs, 로컬 SSD 등), 검사 후 출력 폴더로 원자적으로 이동 "
+                             "(기본값: 출력 파일과 같은 폴더)")
+    parser.add_argument("--journal", metavar="PATH", nargs="?", const="",
+                        help="파일별 상태(queued/running/done/failed)를 SQLite 저널에 기록 "
+                             "(경로를 생략하면 사용자 상태 폴더의 journal.sqlite3)")
+    parser.add_argument("--resume", action="store_true",
+                        help="저널의 마지막 배치에서 끝나지 않은 파일만 같은 설정으로 이어서 실행")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="이어하기에서 실패한 파일도 다시 시도 (--resume 포함)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    args.resume = args.resume or args.retry_failed
+    if not args.inputs and not args.resume:
+        parser.error("입력 파일을 지정하세요 (중단된 배치를 이어서 하려면 --resume)")
+    return args
+
+
+def format_page_progress(event):
+    """페이지 진행 이벤트 -> 표시 문자열"""
+    _, done_pages, total_pages, rate, eta = event
+    line = f"{done_pages}/{total_pages}쪽, {rate:.1f}쪽/초"
+    if eta is not None:
+        line += f", 남은 시간 {format_duration(eta)}"
+    return line
+
+
+def describe_fallback(details):
+    """자원 제한으로 대체 처리한 파일의 설명 (해당 없으면 None)"""
+    if "fallback" not in details:
+        return None
+    how = "원본 그대로 복사" if details["fallback"] == "passthrough" else f"{details['fallback']} 프리셋으로 다시 압축"
+    return f"{pdf_limits.LIMIT_NAMES[details['limit']]}, {how}"
+
+
+def compress_pipe(args, compression, ghostscript_path):
+    """표준 입력의 PDF를 압축해 표준 출력으로 보냄 (파이프 모드, pdf_pipe 참고)"""
+    if args.engine != "ghostscript" or not ghostscript_path:
+        print("오류: 파이프 모드는 Ghostscript 엔진만 지원합니다.", file=sys.stderr)
+        return 2
+    if sys.stdout.isatty():
+        print("오류: 파이프 모드의 결과는 파일이나 다른 프로그램으로 보내세요 (예: > out.pdf).", file=sys.stderr)
+        return 2
+
+    # 결과가 더 크면 원본을 그대로 보낼 수 있도록 입력도 버퍼에 받음 (spill_bytes를 넘으면 디스크)
+    with pdf_pipe.spool() as source:
+        shutil.copyfileobj(sys.stdin.buffer, source, pdf_pipe.PIPE_CHUNK_BYTES)
+        input_bytes = source.tell()
+        source.seek(0)
+        started = time.monotonic()
+        try:
+            result = pdf_engine.compress_stream(
+                source, compression, ghostscript_path,
+                timeout=args.job_timeout,
+                cpu_limit=args.cpu_limit,
+                address_space_limit=args.memory_cap
+            )
+        except RuntimeError as e:
+            print(f"오류: {str(e).strip()}", file=sys.stderr)
+            return 1
+    with result:
+        shutil.copyfileobj(result, sys.stdout.buffer, pdf_pipe.PIPE_CHUNK_BYTES)
+        output_bytes = result.tell()
+    sys.stdout.buffer.flush()
+    print(f"완료: {input_bytes} -> {output_bytes} 바이트 ({time.monotonic() - started:.1f}초)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    journal = journal_run = None
+    if args.journal is not None or args.resume:
+        try:
+            journal = JobJournal(args.journal or None)
+        except (OSError, sqlite3.Error) as e:
+            print(f"오류: 저널을 열 수 없습니다: {e}", file=sys.stderr)
+            return 2
+    if args.resume:
+        journal_run = journal.latest_run()
+        if journal_run is None:
+            print(f"오류: 이어서 할 배치가 없습니다: {journal.path}", file=sys.stderr)
+            return 2
+        # 처음 실행할 때의 설정을 그대로 사용
+        for key in JOURNAL_SETTINGS:
+            if key in journal_run.settings:
+                setattr(args, key, journal_run.settings[key])
+
+    try:
+        compression = pdf_engine.normalize_compression(args.quality)
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    if args.persistent and args.cpu_limit:
+        print("오류: --persistent는 --cpu-limit과 함께 쓸 수 없습니다 (상주 인터프리터는 작업마다 CPU 시간을 나눌 수 없음).",
+              file=sys.stderr)
+        return 2
+
+    ghostscript_path = args.ghostscript_path or pdf_engine.find_ghostscript()
+    if not ghostscript_path and args.engine == "ghostscript":
+        print("오류: Ghostscript를 찾을 수 없습니다.", file=sys.stderr)
+        return 2
+
+    if args.inputs == ["-"]:
+        return compress_pipe(args, compression, ghostscript_path)
+
+    # 증분 모드 매니페스트 설정: 결과에 영향을 주는 옵션이 하나라도 바뀌면 다시 처리
+    settings = {key: getattr(args, key) for key in JOURNAL_SETTINGS if key != "quality"}
+    settings["compression"] = compression
+    settings["output_dir"] = os.path.abspath(args.output_dir) if args.output_dir else None
+    results = {}
+    if journal_run is not None:
+        # 이어하기: 저널에 남은 작업 그대로 (중간에 꺼져 덜 쓰인 출력은 덮어씀)
+        jobs = journal_run.pending(args.retry_failed)
+        input_files = [input_file for input_file, _ in jobs]
+        unchanged, manifests = [], []
+        for input_file, output_file in jobs:
+            os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+            results[input_file] = {"input": input_file, "output": output_file, "status": "pending", "error": None}
+    else:
+        input_files, unchanged, manifests, bases = expand_inputs(
+            args.inputs, settings if args.incremental else None
+        )
+        outputs, conflicts = plan_outputs(input_files, bases, args.output_dir)
+
+        # 작업 목록 구성 (기존 출력 파일은 --overwrite가 없으면 건너뜀)
+        jobs = []
+        for input_file in input_files:
+            if input_file in conflicts:
+                results[input_file] = {"input": input_file, "output": None, "status": "failed",
+                                       "error": f"출력 경로가 다른 입력과 겹칩니다: {conflicts[input_file]}"}
+                if not args.json:
+                    print(f"실패: {input_file} ({results[input_file]['error']})", file=sys.stderr)
+                continue
+            output_file = outputs[input_file]
+            os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+            results[input_file] = {"input": input_file, "output": output_file, "status": "pending", "error": None}
+            if os.path.exists(output_file) and not args.overwrite:
+                results[input_file]["status"] = "skipped"
+                results[input_file]["error"] = "출력 파일이 이미 존재합니다."
+                continue
+            jobs.append((input_file, output_file))
+        if journal is not None:
+            journal_run = journal.start_run({key: getattr(args, key) for key in JOURNAL_SETTINGS}, jobs)
+
+    if args.scratch_dir:
+        try:
+            check_scratch_dir(args.scratch_dir)
+        except OSError as e:
+            print(f"오류: scratch 폴더를 사용할 수 없습니다: {e}", file=sys.stderr)
+            return 2
+
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = ResultCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+    # 지난 실행의 측정값으로 예상 시간 보정 (로그를 열기 전에 읽음)
+    history = args.history or args.metrics_log
+    cost_model = CostModel.from_jsonl(history) if history else None
+    lanes = {}
+    if args.interactive_below:
+        for input_file, _ in jobs:
+            try:
+                if os.path.getsize(input_file) < args.interactive_below:
+                    lanes[input_file] = "interactive"
+            except OSError:
+                pass
+
+    telemetry = None
+    if args.metrics_log or args.prometheus:
+        telemetry = MetricsLog(args.metrics_log, args.prometheus)
+
+    events = queue.Queue()
+    batch = pdf_engine.CompressionBatch(
+        ghostscript_path, compression, jobs, args.jobs, events, total=len(input_files), cache=cache,
+        shard_threshold=args.shard_threshold,
+        target_size=args.target_size,
+        min_savings=args.min_savings / 100 if args.min_savings is not None else None,
+        persistent=args.persistent,
+        page_progress=args.progress,
+        telemetry=telemetry,
+        engine=args.engine,
+        flate_level=args.flate_level,
+        memory_limit=args.memory_limit,
+        journal=journal_run,
+        scratch_dir=args.scratch_dir,
+        schedule=args.schedule,
+        lanes=lanes,
+        cost_model=cost_model,
+        adaptive=(args.min_jobs, args.max_jobs or 2 * (os.cpu_count() or 1)) if args.adaptive else None,
+        job_timeout=args.job_timeout,
+        cpu_limit=args.cpu_limit,
+        address_space_limit=args.memory_cap,
+        fallback=args.fallback
+    )
+
+    # 페이지 진행은 터미널이면 한 줄을 덮어쓰고, 로그 파일이면 일정 간격으로만 출력
+    interactive = sys.stderr.isatty()
+    clear_line = "\r\033[K" if interactive and args.progress else ""
+    last_page_log = 0.0
+
+    started = time.monotonic()
+    batch.start()
+    try:
+        while True:
+            event = events.get()
+            if event[0] == "progress":
+                _, completed, total, input_file, error = event
+                result = results[input_file]
+                result["status"] = "failed" if error else "ok"
+                result["error"] = error
+                if not args.json:
+                    mark = "실패" if error else "완료"
+                    note = error.strip() if error else describe_fallback(batch.details.get(input_file, {}))
+                    print(f"{clear_line}[{completed}/{total}] {mark}: {input_file}"
+                          + (f" ({note})" if note else ""), file=sys.stderr)
+            elif event[0] == "concurrency" and not args.json:
+                _, before, after, reason = event
+                print(f"{clear_line}동시 작업 수 {before} -> {after}: {reason}", file=sys.stderr)
+            elif event[0] == "pages" and not args.json:
+                if interactive:
+                    print(f"\r{format_page_progress(event)}\033[K", end="", file=sys.stderr, flush=True)
+                elif time.monotonic() - last_page_log >= PAGE_LOG_INTERVAL:
+                    last_page_log = time.monotonic()
+                    print(format_page_progress(event), file=sys.stderr)
+            elif event[0] == "done":
+                if clear_line:
+                    print(clear_line, end="", file=sys.stderr)
+                break
+    except KeyboardInterrupt:
+        batch.cancel()
+        # 작업 스레드가 저널과 측정값 기록을 마칠 때까지 기다린 뒤에 닫음 (done은 모든 작업이 끝난 뒤에 옴)
+        print("취소 중... (끝나지 않은 작업 정리)", file=sys.stderr)
+        while events.get()[0] != "done":
+            pass
+        print("취소됨", file=sys.stderr)
+        return 130
+    finally:
+        if telemetry is not None:
+            telemetry.close()
+        if journal is not None:
+            journal_counts = journal_run.counts()
+            journal.close()
+    elapsed = time.monotonic() - started
+
+    for result in results.values():
+        if result["status"] == "ok":
+            result["input_bytes"] = os.path.getsize(result["input"])
+            result["output_bytes"] = os.path.getsize(result["output"])
+        result.update(batch.details.get(result["input"], {}))
+        if result["input"] in batch.job_metrics:
+            result["metrics"] = batch.job_metrics[result["input"]]
+
+    # 성공한 파일을 매니페스트에 기록
+    if manifests:
+        for result in results.values():
+            if result["status"] != "ok":
+                continue
+            for manifest in manifests:
+                if manifest.contains(result["input"]):
+                    manifest.record(result["input"], settings)
+        for manifest in manifests:
+            manifest.save()
+
+    succeeded = sum(1 for r in results.values() if r["status"] == "ok")
+    failed = sum(1 for r in results.values() if r["status"] == "failed")
+    skipped = sum(1 for r in results.values() if r["status"] == "skipped")
+    limited = sum(1 for r in results.values() if r.get("limit"))
+
+    if args.json:
+        summary = {
+            "ghostscript": ghostscript_path,
+            "compression": compression,
+            "jobs": batch.max_workers,
+            "total": len(input_files),
+            "succeeded": succeeded,
+            "failed": failed,
+            "skipped": skipped,
+            "limited": limited,
+            "unchanged": len(unchanged),
+            "elapsed": round(elapsed, 3),
+            "results": list(results.values())
+        }
+        if cache is not None:
+            summary["cache"] = cache.stats()
+        if args.incremental:
+            summary["unchanged_files"] = unchanged
+        if telemetry is not None:
+            summary["histograms"] = telemetry.summary()
+        if batch.controller is not None:
+            summary["concurrency"] = batch.controller.decisions
+        if journal is not None:
+            summary["journal"] = {"path": journal.path, "run": journal_run.id, "counts": journal_counts}
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(f"완료! {succeeded}/{len(input_files)}개 파일 압축 성공 "
+              f"(실패 {failed}, 건너뜀 {skipped}, {elapsed:.1f}초)"
+              + (f" | 자원 제한 {limited}개" if limited else "")
+              + (f" | 변경 없음 {len(unchanged)}개" if args.incremental else "")
+              + (f" | {cache.describe()}" if cache is not None else "")
+              + (f" | 저널 #{journal_run.id}: 남은 파일 {journal_counts['queued'] + journal_counts['running']}, "
+                 f"실패 {journal_counts['failed']}" if journal is not None else ""))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+벤치마크용 합성 PDF 코퍼스 생성기
+- 같은 seed로 만들면 항상 같은 내용의 파일이 생성됨 (Ghostscript가 넣는 생성 날짜 등은 제외)
+- 종류별로 압축 특성이 다른 파일을 만듦
+  text   : 텍스트만 있는 문서 (Ghostscript로 PostScript 변환)
+  vector : 선, 곡선, 도형이 많은 도면형 문서 (Ghostscript)
+  photo  : 고해상도 컬러 사진 (Pillow)
+  scan   : 흑백 스캔 문서 (Pillow, 1비트)
+  tiny   : 한 쪽짜리 작은 파일 다수 (Ghostscript)
+
+사용 예:
+    python pdf_corpus.py bench_corpus --seed 1 --scale 2
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pdf_engine
+
+CORPUS_VERSION = 1
+CORPUS_INFO = "corpus.json"
+
+# 종류 -> (파일 수, 파일당 쪽수) (scale=1 기준)
+CATEGORIES = {
+    "text": (3, 20),
+    "vector": (3, 10),
+    "photo": (3, 3),
+    "scan": (3, 5),
+    "tiny": (200, 1),
+}
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter (pt)
+PHOTO_DPI = 300
+SCAN_DPI = 300
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute irure"
+).split()
+
+
+def _require_pil():
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        raise RuntimeError(
+            "사진/스캔 코퍼스 생성에는 Pillow 라이브러리가 필요합니다.\n"
+            "'pip install Pillow'를 실행하여 설치해주세요."
+        )
+    return Image, ImageDraw
+
+
+def _distill(ghostscript_path, postscript, output_file):
+    """PostScript 프로그램을 PDF로 변환 (표준 입력으로 전달)"""
+    result = subprocess.run(
+        [ghostscript_path, "-dNOPAUSE", "-dBATCH", "-dQUIET", "-dSAFER",
+         "-sDEVICE=pdfwrite", f"-sOutputFile={output_file}", "-"],
+        input=postscript.encode("ascii"),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Ghostscript 오류: {result.stderr.decode(errors='replace')}")
+
+
+def text_postscript(rng, pages):
+    """텍스트 문서 PostScript"""
+    lines = ["%!PS", "/Helvetica findfont 10 scalefont setfont"]
+    for _ in range(pages):
+        y = PAGE_HEIGHT - 72
+        while y > 72:
+            words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14)))
+            lines.append(f"72 {y} moveto ({words}) show")
+            y -= 13
+        lines.append("showpage")
+    return "\n".join(lines) + "\n"
+
+
+def vector_postscript(rng, pages, shapes=2000):
+    """선과 곡선이 많은 도면형 문서 PostScript"""
+    def point():
+        return f"{rng.uniform(36, PAGE_WIDTH - 36):.2f} {rng.uniform(36, PAGE_HEIGHT - 36):.2f}"
+
+    lines = ["%!PS"]
+    for _ in range(pages):
+        for _ in range(shapes):
+            color = " ".join(f"{rng.random():.3f}" for _ in range(3))
+            lines.append(f"{color} setrgbcolor {rng.uniform(0.1, 2):.2f} setlinewidth")
+            kind = rng.random()
+            if kind < 0.5:
+                lines.append(f"newpath {point()} moveto {point()} lineto stroke")
+            elif kind < 0.8:
+                lines.append(f"newpath {point()} moveto {point()} {point()} {point()} curveto stroke")
+            else:
+                lines.append(f"newpath {point()} moveto {point()} lineto {point()} lineto closepath fill")
+        lines.append("showpage")
+    return "\n".join(lines) + "\n"
+
+
+def photo_pages(rng, pages):
+    """사진과 비슷한 컬러 이미지 (부드러운 잡음을 확대하고 도형을 겹침)"""
+    Image, ImageDraw = _require_pil()
+    width, height = PAGE_WIDTH * PHOTO_DPI // 72, PAGE_HEIGHT * PHOTO_DPI // 72
+    images = []
+    for _ in range(pages):
+        small = (width // 8, height // 8)
+        noise = Image.frombytes("RGB", small, rng.randbytes(small[0] * small[1] * 3))
+        image = noise.resize((width, height), Image.BICUBIC)
+        draw = ImageDraw.Draw(image)
+        for _ in range(40):
+            x, y = rng.randrange(width), rng.randrange(height)
+            r = rng.randrange(50, 400)
+            draw.ellipse((x - r, y - r, x + r, y + r),
+                         fill=(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        images.append(image)
+    return images
+
+
+def scan_pages(rng, pages):
+    """흑백 스캔 문서와 비슷한 1비트 이미지 (글자 줄 모양의 검은 막대와 잡티)"""
+    Image, ImageDraw = _require_pil()
+    width, height = PAGE_WIDTH * SCAN_DPI // 72, PAGE_HEIGHT * SCAN_DPI // 72
+    images = []
+    for _ in range(pages):
+        image = Image.new("1", (width, height), 1)
+        draw = ImageDraw.Draw(image)
+        margin = SCAN_DPI
+        y = margin
+        while y < height - margin:
+            x = margin
+            while x < width - margin:
+                word = rng.randrange(40, 200)
+                draw.rectangle((x, y, min(x + word, width - margin), y + 28), fill=0)
+                x += word + rng.randrange(20, 40)
+            y += 60
+        for _ in range(2000):
+            draw.point((rng.randrange(width), rng.randrange(height)), fill=0)
+        images.append(image)
+    return images
+
+
+def _save_images(images, output_file, dpi):
+    images[0].save(output_file, "PDF", resolution=dpi, save_all=True, append_images=images[1:])
+
+
+def generate_file(ghostscript_path, category, index, pages, seed, output_file):
+    """코퍼스 파일 하나 생성 (종류와 번호마다 고정된 난수 사용)"""
+    rng = random.Random(f"{seed}:{category}:{index}")
+    if category in ("text", "tiny"):
+        _distill(ghostscript_path, text_postscript(rng, pages), output_file)
+    elif category == "vector":
+        _distill(ghostscript_path, vector_postscript(rng, pages), output_file)
+    elif category == "photo":
+        _save_images(photo_pages(rng, pages), output_file, PHOTO_DPI)
+    elif category == "scan":
+        _save_images(scan_pages(rng, pages), output_file, SCAN_DPI)
+    else:
+        raise ValueError(f"알 수 없는 코퍼스 종류: {category}")
+
+
+def load_info(corpus_dir):
+    """코퍼스 정보 (없으면 None)"""
+    try:
+        with open(os.path.join(corpus_dir, CORPUS_INFO), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def generate(corpus_dir, seed=1, scale=1, categories=None, ghostscript_path=None, workers=None):
+    """
+    코퍼스 생성 (같은 설정으로 이미 만들어져 있으면 다시 만들지 않음)
+    - 반환값: 코퍼스 정보 {"seed", "scale", "categories": {종류: [파일 경로, ...]}}
+    """
+    categories = list(categories or CATEGORIES)
+    ghostscript_path = ghostscript_path or pdf_engine.find_ghostscript()
+    if not ghostscript_path:
+        raise RuntimeError("Ghostscript를 찾을 수 없습니다.")
+
+    info = load_info(corpus_dir)
+    if (info and info.get("version") == CORPUS_VERSION and info.get("seed") == seed
+            and info.get("scale") == scale and all(c in info["categories"] for c in categories)
+            and all(os.path.exists(p) for c in categories for p in info["categories"][c])):
+        return info
+
+    tasks = []
+    files = {}
+    for category in categories:
+        count, pages = CATEGORIES[category]
+        # tiny는 파일 수를, 나머지는 쪽수를 늘림
+        if category == "tiny":
+            count *= scale
+        else:
+            pages *= scale
+        folder = os.path.join(corpus_dir, category)
+        os.makedirs(folder, exist_ok=True)
+        files[category] = []
+        for index in range(count):
+            output_file = os.path.join(folder, f"{category}_{index:04d}.pdf")
+            files[category].append(output_file)
+            tasks.append((category, index, pages, output_file))
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        futures = [
+            executor.submit(generate_file, ghostscript_path, category, index, pages, seed, output_file)
+            for category, index, pages, output_file in tasks
+        ]
+        for future in futures:
+            future.result()
+
+    info = {"version": CORPUS_VERSION, "seed": seed, "scale": scale, "categories": files}
+    with open(os.path.join(corpus_dir, CORPUS_INFO), "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    return info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 PDF 코퍼스 생성")
+    parser.add_argument("corpus_dir", help="코퍼스를 만들 폴더")
+    parser.add_argument("--seed", type=int, default=1, help="난수 seed (기본값: 1)")
+    parser.add_argument("--scale", type=int, default=1, help="쪽수/파일 수 배율 (기본값: 1)")
+    parser.add_argument("--categories", nargs="+", choices=list(CATEGORIES), help="생성할 종류 (기본값: 전체)")
+    parser.add_argument("--gs", dest="ghostscript_path", help="Ghostscript 실행 파일 경로")
+    args = parser.parse_args(argv)
+
+    try:
+        info = generate(args.corpus_dir, args.seed, args.scale, args.categories, args.ghostscript_path)
+    except RuntimeError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    for category, paths in info["categories"].items():
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"{category}: {len(paths)}개 파일, {size / 1024 / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
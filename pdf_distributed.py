@@ -0,0 +1,777 @@
+"""
+여러 컴퓨터에 나눠 압축하는 분산 배치 (코디네이터 / 작업자, TCP, 표준 라이브러리만 사용)
+- 코디네이터: 작업 목록을 가지고 있고 (pdf_cli.py와 같은 입력 확장), 작업자에게 입력 PDF를 보내고
+  돌려받은 결과를 검사해 출력 폴더에 원자적으로 씀 (pdf_scratch)
+- 작업자: 코디네이터에 연결해 작업을 받아 로컬에서 CompressionBatch.measure_job으로 압축하고 결과를 돌려보냄
+  (엔진, 캐시, 자원 제한과 대체 처리 설정을 그대로 사용, 압축 설정은 코디네이터가 정함)
+- 작업 분배 (work-stealing):
+  - 작업은 pdf_schedule로 예상 시간이 긴 순서로 정렬한 공용 대기열에 있음
+  - 작업자 연결마다 자기 대기열이 있어, 비어 있으면 공용 대기열에서 몇 개(prefetch 이하)를 한꺼번에 가져옴
+  - 작업자는 자기 대기열의 앞(가장 긴 작업)부터 처리
+  - 자기 대기열과 공용 대기열이 모두 비면 가장 많이 쌓인 다른 작업자 대기열의 뒤(가장 짧은 작업)에서 가져옴
+- 전송 형식: 4바이트 길이 + JSON 헤더, 파일 내용이 있으면 이어서 size 바이트와 SHA-256 다이제스트 32바이트
+  (받는 쪽에서 다이제스트가 맞지 않으면 그 작업을 다시 대기열에 넣음)
+- 작업자 장애 감지: 압축하는 동안 작업자가 HEARTBEAT_INTERVAL마다 heartbeat를 보내고, 코디네이터는
+  heartbeat_timeout 동안 아무 메시지도 받지 못하거나 연결이 끊어지면 그 작업자를 제외하고
+  실행 중이던 작업과 대기열의 작업을 공용 대기열 앞으로 되돌림 (max_attempts번 중단된 작업은 실패 처리)
+- 작업자는 연결 전에 Ghostscript를 실행할 수 있는지 확인하고, 압축 중 실행 환경 오류(OSError)가 나면
+  그 작업을 다시 나누도록 알린 뒤 연결을 끊음 (설정이 잘못된 작업자 하나가 배치 전체를 실패시키지 않도록)
+
+작업자의 -j만큼 코디네이터에 연결하고, 연결 하나가 작업 하나씩 처리합니다.
+인증은 --token(공유 비밀 값)뿐이고 전송은 암호화하지 않으므로 신뢰할 수 있는 네트워크에서만 사용하세요.
+
+사용 예:
+    python pdf_distributed.py coordinator archive/ -o out/ -q ebook --listen 0.0.0.0:9700
+    python pdf_distributed.py worker coordinator-host:9700 -j 8
+    python pdf_distributed.py coordinator archive/ -o out/ --listen 127.0.0.1:0 --spawn 3  (로컬에서 시험)
+"""
+import argparse
+import collections
+import hashlib
+import hmac
+import itertools
+import json
+import math
+import os
+import queue
+import shutil
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import pdf_engine
+import pdf_limits
+from pdf_cache import ResultCache, get_ghostscript_version
+from pdf_cli import expand_inputs, plan_outputs
+from pdf_rewrite import DEFAULT_FLATE_LEVEL
+from pdf_schedule import CostModel, plan
+from pdf_scratch import check_scratch_dir, publish_output, scratch_path, validate_output
+from pdf_target import parse_size
+
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9700
+# 헤더 길이 (4바이트 빅엔디언)
+FRAME_HEADER = struct.Struct(">I")
+MAX_HEADER_BYTES = 1024 * 1024
+# 파일을 보내고 받는 조각 크기 (바이트)
+CHUNK_BYTES = 256 * 1024
+# 작업자가 압축 중에 heartbeat를 보내는 간격 (초)
+HEARTBEAT_INTERVAL = 5.0
+# 이 시간 동안 작업자에게서 아무 메시지도 없으면 중단된 것으로 봄 (초)
+HEARTBEAT_TIMEOUT = 30.0
+# 남은 작업이 모두 다른 작업자에서 실행 중일 때 다시 요청하기까지 기다리는 시간 (초)
+WAIT_SECONDS = 1.0
+# 작업자 대기열로 한꺼번에 가져오는 최대 작업 수
+DEFAULT_PREFETCH = 4
+# 한꺼번에 가져오는 수 = 공용 대기열 / (작업자 수 x 이 값) (끝으로 갈수록 조금씩 가져감)
+CLAIM_DIVISOR = 2
+# 작업자가 중단되어 다시 대기열에 넣는 최대 횟수
+MAX_ATTEMPTS = 3
+# 작업자가 코디네이터에 연결을 다시 시도하는 시간과 간격 (초)
+CONNECT_TIMEOUT = 30.0
+CONNECT_RETRY_INTERVAL = 0.5
+
+
+def parse_address(value, default_host=DEFAULT_HOST):
+    """"호스트:포트" 또는 "포트" -> (호스트, 포트)"""
+    host, _, port = value.rpartition(":")
+    try:
+        return host.strip("[]") or default_host, int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"주소 형식이 잘못되었습니다: {value} (예: 127.0.0.1:{DEFAULT_PORT})")
+
+
+def _recv_exact(sock, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(min(size - len(buffer), CHUNK_BYTES))
+        if not chunk:
+            raise ConnectionError("연결이 끊어졌습니다.")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def send_message(sock, message, payload=None):
+    """
+    메시지 하나 보내기
+    - payload(바이너리 파일 객체)가 주어지면 헤더 뒤에 message["size"] 바이트와 SHA-256 다이제스트를 이어서 보냄
+    """
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(FRAME_HEADER.pack(len(data)) + data)
+    if payload is None:
+        return
+    digest = hashlib.sha256()
+    remaining = message["size"]
+    while remaining:
+        chunk = payload.read(min(CHUNK_BYTES, remaining))
+        if not chunk:
+            raise RuntimeError("보내는 중에 파일이 줄었습니다.")
+        digest.update(chunk)
+        sock.sendall(chunk)
+        remaining -= len(chunk)
+    sock.sendall(digest.digest())
+
+
+def recv_message(sock):
+    """메시지 헤더 하나 받기 (dict, 형식이 잘못되면 ValueError)"""
+    (length,) = FRAME_HEADER.unpack(_recv_exact(sock, FRAME_HEADER.size))
+    if length > MAX_HEADER_BYTES:
+        raise ValueError(f"헤더가 너무 깁니다: {length}바이트")
+    message = json.loads(_recv_exact(sock, length))
+    if not isinstance(message, dict):
+        raise ValueError("메시지 형식이 잘못되었습니다.")
+    return message
+
+
+def recv_payload(sock, size, sink):
+    """
+    헤더 뒤의 파일 내용 size 바이트를 sink에 쓰고 다이제스트 확인
+    - 끝까지 받은 뒤에 확인하므로 맞지 않아도(ValueError) 연결은 계속 쓸 수 있음
+    """
+    digest = hashlib.sha256()
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(CHUNK_BYTES, remaining))
+        if not chunk:
+            raise ConnectionError("파일을 받는 중에 연결이 끊어졌습니다.")
+        digest.update(chunk)
+        sink.write(chunk)
+        remaining -= len(chunk)
+    if _recv_exact(sock, digest.digest_size) != digest.digest():
+        raise ValueError("체크섬이 맞지 않습니다 (전송 중 손상).")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.server.coordinator.handle(self.request, self.client_address)
+
+
+class Coordinator:
+    """
+    분산 배치 코디네이터 (start()로 연결을 받기 시작하고 wait()로 모든 작업이 끝날 때까지 대기)
+    - jobs: [(입력 파일, 출력 파일), ...] (이 순서대로 나눠 줌, 보통 pdf_schedule.plan으로 정렬)
+    - settings: 작업자에게 보낼 압축 설정 {"compression", "engine", "flate_level", "memory_limit",
+      "job_timeout", "cpu_limit", "address_space_limit", "fallback"}
+    - token: 주어지면 같은 값을 보낸 작업자만 받음
+    - 결과는 results[작업 번호]에 {"input", "output", "worker", "error", "details", "metrics"}로 기록
+
+    큐에 들어가는 이벤트:
+    - ("worker", 작업자 이름, "joined" 또는 "left", 이유 또는 None)
+    - ("progress", 완료 수, 전체 수, 입력 파일, 오류 메시지 또는 None, 작업자 이름)
+    - ("stolen", 입력 파일, 가져간 대기열의 작업자, 가져온 작업자)
+    - ("requeued", 입력 파일, 작업자 이름, 이유)
+    - ("done", 성공 수, 전체 수)
+    """
+    def __init__(self, jobs, settings, events, token=None, scratch_dir=None, prefetch=DEFAULT_PREFETCH,
+                 heartbeat_timeout=HEARTBEAT_TIMEOUT, max_attempts=MAX_ATTEMPTS):
+        self.jobs = list(jobs)
+        self.settings = settings
+        self.events = events
+        self.token = token
+        self.scratch_dir = scratch_dir
+        self.prefetch = max(1, prefetch)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.results = {}
+        # 작업자별 처리 수 {작업자 이름: 완료 수}
+        self.worker_counts = collections.Counter()
+        self.steals = 0
+        self.requeued = 0
+        self._pool = collections.deque(range(len(self.jobs)))
+        # 작업자 이름 -> 자기 대기열 (작업 번호)
+        self._queues = {}
+        # 작업 번호 -> 실행 중인 작업자 이름
+        self._running = {}
+        self._attempts = collections.Counter()
+        self._condition = threading.Condition()
+        self._serial = itertools.count(1)
+        self._server = None
+        self._server_thread = None
+
+    @property
+    def finished(self):
+        with self._condition:
+            return len(self.results) >= len(self.jobs)
+
+    @property
+    def connected(self):
+        """연결된 작업자 수"""
+        with self._condition:
+            return len(self._queues)
+
+    def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """연결 받기 시작 (실제로 받는 (호스트, 포트) 반환, port=0이면 빈 포트 사용)"""
+        self._server = _Server((host, port), _Handler)
+        self._server.coordinator = self
+        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+        if not self.jobs:
+            self.events.put(("done", 0, 0))
+        return self._server.server_address[:2]
+
+    def wait(self, timeout=None):
+        """모든 작업이 끝날 때까지 대기 (끝났으면 True)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self.results) >= len(self.jobs), timeout)
+
+    def close(self, grace=HEARTBEAT_INTERVAL):
+        """
+        연결 받기 중지
+        - 모든 작업이 끝났으면 연결된 작업자가 "done"을 받고 나갈 때까지 grace초 동안 기다림
+        """
+        with self._condition:
+            if len(self.results) >= len(self.jobs):
+                self._condition.wait_for(lambda: not self._queues, grace)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def handle(self, sock, address):
+        """작업자 연결 하나 처리 (연결마다 별도 스레드에서 실행)"""
+        sock.settimeout(self.heartbeat_timeout)
+        worker, reason = None, None
+        try:
+            hello = recv_message(sock)
+            if hello.get("type") != "hello" or hello.get("version") != PROTOCOL_VERSION:
+                raise ValueError("작업자 프로토콜이 맞지 않습니다.")
+            if self.token is not None and not hmac.compare_digest(str(hello.get("token") or ""), self.token):
+                send_message(sock, {"type": "error", "error": "토큰이 맞지 않습니다."})
+                return
+            worker = self._join(f"{hello.get('name') or address[0]}#{next(self._serial)}")
+            send_message(sock, {"type": "welcome", "worker": worker, "settings": self.settings})
+            while True:
+                message = recv_message(sock)
+                kind = message.get("type")
+                if kind == "heartbeat":
+                    continue
+                if kind == "next":
+                    if not self._assign(sock, worker):
+                        break
+                elif kind == "result":
+                    self._receive_result(sock, worker, message)
+                elif kind == "failed":
+                    if message.get("transient"):
+                        self._requeue(message["id"], worker, message.get("error"))
+                    else:
+                        self._finish(message["id"], worker, message.get("error") or "알 수 없는 오류")
+                else:
+                    raise ValueError(f"알 수 없는 메시지: {kind}")
+        except socket.timeout:
+            reason = f"{self.heartbeat_timeout:g}초 동안 응답 없음"
+        except (OSError, ValueError, KeyError, RuntimeError) as e:
+            reason = str(e) or type(e).__name__
+        finally:
+            if worker is not None:
+                self._leave(worker, reason)
+
+    def _join(self, worker):
+        with self._condition:
+            self._queues[worker] = collections.deque()
+        self.events.put(("worker", worker, "joined", None))
+        return worker
+
+    def _leave(self, worker, reason):
+        """작업자 제외 (실행 중이던 작업과 대기열의 작업을 공용 대기열 앞으로 되돌림)"""
+        failed, requeued = [], []
+        with self._condition:
+            waiting = list(self._queues.pop(worker, ()))
+            for job in [job for job, owner in self._running.items() if owner == worker]:
+                del self._running[job]
+                if self._attempts[job] >= self.max_attempts:
+                    failed.append(job)
+                else:
+                    requeued.append(job)
+            self._pool.extendleft(reversed(requeued + waiting))
+            self.requeued += len(requeued)
+            self._condition.notify_all()
+        for job in requeued:
+            self.events.put(("requeued", self.jobs[job][0], worker, reason))
+        for job in failed:
+            self._record(job, worker, f"작업자가 {self.max_attempts}번 중단되었습니다 (마지막: {reason})")
+        self.events.put(("worker", worker, "left", reason))
+
+    def _next_job(self, worker):
+        """작업자에게 줄 다음 작업 번호 (줄 작업이 없으면 None)"""
+        with self._condition:
+            own = self._queues[worker]
+            if not own and self._pool:
+                share = math.ceil(len(self._pool) / (CLAIM_DIVISOR * len(self._queues)))
+                for _ in range(max(1, min(self.prefetch, share))):
+                    own.append(self._pool.popleft())
+            if own:
+                job = own.popleft()
+            else:
+                victim = max((name for name, waiting in self._queues.items() if waiting),
+                             key=lambda name: len(self._queues[name]), default=None)
+                if victim is None:
+                    return None
+                job = self._queues[victim].pop()
+                self.steals += 1
+                self.events.put(("stolen", self.jobs[job][0], victim, worker))
+            self._running[job] = worker
+            self._attempts[job] += 1
+            return job
+
+    def _assign(self, sock, worker):
+        """다음 작업을 보냄 (모든 작업이 끝나 "done"을 보냈으면 False)"""
+        while True:
+            job = self._next_job(worker)
+            if job is None:
+                if self.finished:
+                    send_message(sock, {"type": "done"})
+                    return False
+                send_message(sock, {"type": "wait", "seconds": WAIT_SECONDS})
+                return True
+            input_file = self.jobs[job][0]
+            try:
+                f = open(input_file, "rb")
+            except OSError as e:
+                self._finish(job, worker, f"입력 파일을 읽을 수 없습니다: {e}")
+                continue
+            with f:
+                size = os.fstat(f.fileno()).st_size
+                send_message(sock, {"type": "job", "id": job, "name": os.path.basename(input_file), "size": size}, f)
+            return True
+
+    def _receive_result(self, sock, worker, message):
+        """작업자가 보낸 결과를 받아 검사하고 출력 경로에 씀"""
+        job = message["id"]
+        output_file = self.jobs[job][1]
+        temp_file = scratch_path(output_file, self.scratch_dir)
+        try:
+            with open(temp_file, "wb") as f:
+                try:
+                    recv_payload(sock, message["size"], f)
+                except ValueError as e:
+                    self._requeue(job, worker, str(e))
+                    return
+            try:
+                validate_output(temp_file)
+                publish_output(temp_file, output_file)
+            except (RuntimeError, OSError) as e:
+                self._finish(job, worker, str(e))
+                return
+            self._finish(job, worker, None, message.get("details"), message.get("metrics"))
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    def _requeue(self, job, worker, reason):
+        """작업 하나를 공용 대기열 앞으로 되돌림 (전송 오류 등, 너무 여러 번이면 실패 처리)"""
+        with self._condition:
+            if self._running.get(job) != worker:
+                return
+            del self._running[job]
+            if self._attempts[job] < self.max_attempts:
+                self._pool.appendleft(job)
+                self.requeued += 1
+                self._condition.notify_all()
+                self.events.put(("requeued", self.jobs[job][0], worker, reason))
+                return
+        self._record(job, worker, f"{self.max_attempts}번 시도했지만 실패했습니다 (마지막: {reason})")
+
+    def _finish(self, job, worker, error, details=None, metrics=None):
+        with self._condition:
+            if self._running.get(job) != worker:
+                return
+            del self._running[job]
+        self._record(job, worker, error, details, metrics)
+
+    def _record(self, job, worker, error, details=None, metrics=None):
+        input_file, output_file = self.jobs[job]
+        with self._condition:
+            self.results[job] = {
+                "input": input_file,
+                "output": output_file,
+                "worker": worker,
+                "error": error,
+                "details": details or {},
+                "metrics": metrics,
+            }
+            if error is None:
+                self.worker_counts[worker] += 1
+            completed = len(self.results)
+            succeeded = sum(1 for result in self.results.values() if result["error"] is None)
+            self._condition.notify_all()
+        self.events.put(("progress", completed, len(self.jobs), input_file, error, worker))
+        if completed == len(self.jobs):
+            self.events.put(("done", succeeded, len(self.jobs)))
+
+
+def _connect(address, timeout):
+    """코디네이터에 연결 (아직 시작하지 않았으면 timeout초 동안 다시 시도)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return socket.create_connection(address)
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(CONNECT_RETRY_INTERVAL)
+
+
+class Worker:
+    """
+    분산 배치 작업자 (run()은 코디네이터가 모든 작업이 끝났다고 알릴 때까지 실행)
+    - slots: 코디네이터에 여는 연결 수 (연결마다 작업 하나씩 동시에 압축)
+    - ghostscript_path, cache, scratch_dir: 이 컴퓨터의 설정 (압축 설정은 코디네이터에게서 받음)
+    - 받은 입력과 압축 결과는 scratch_dir(없으면 시스템 임시 폴더)의 작업 폴더에 두고 끝나면 지움
+    """
+    def __init__(self, address, slots=1, ghostscript_path=None, name=None, token=None, cache=None,
+                 scratch_dir=None, connect_timeout=CONNECT_TIMEOUT):
+        self.address = address
+        self.slots = max(1, slots)
+        self.ghostscript_path = ghostscript_path
+        self.name = name or socket.gethostname()
+        self.token = token
+        self.cache = cache
+        self.scratch_dir = scratch_dir
+        self.connect_timeout = connect_timeout
+        self.completed = 0
+        self.failed = 0
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def run(self):
+        """모든 연결이 끝날 때까지 실행 (연결 오류가 있었으면 False)"""
+        # 작업을 받은 뒤에 실패하지 않도록 연결하기 전에 실행 환경 확인
+        if self.ghostscript_path and not get_ghostscript_version(self.ghostscript_path):
+            self.errors.append(f"Ghostscript를 실행할 수 없습니다: {self.ghostscript_path}")
+            print(f"오류: {self.errors[-1]}", file=sys.stderr)
+            return False
+        threads = [threading.Thread(target=self._run_slot, daemon=True) for _ in range(self.slots)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return not self.errors
+
+    def _run_slot(self):
+        try:
+            with _connect(self.address, self.connect_timeout) as sock:
+                sock.settimeout(HEARTBEAT_TIMEOUT)
+                self._serve(sock)
+        except (OSError, ValueError, KeyError, RuntimeError) as e:
+            with self._lock:
+                self.errors.append(str(e) or type(e).__name__)
+            print(f"오류: 코디네이터 연결: {e}", file=sys.stderr)
+
+    def _serve(self, sock):
+        send_message(sock, {"type": "hello", "version": PROTOCOL_VERSION, "name": self.name, "token": self.token})
+        welcome = recv_message(sock)
+        if welcome.get("type") != "welcome":
+            raise RuntimeError(welcome.get("error") or "코디네이터가 연결을 거절했습니다.")
+        settings = welcome["settings"]
+        if settings["engine"] == "ghostscript" and not self.ghostscript_path:
+            raise RuntimeError("Ghostscript를 찾을 수 없습니다.")
+        # measure_job만 쓰므로 배치 이벤트는 쌓이지 않음 (읽지 않는 큐)
+        batch = pdf_engine.CompressionBatch(
+            self.ghostscript_path, settings["compression"], [], 1, queue.Queue(), cache=self.cache,
+            engine=settings["engine"],
+            flate_level=settings["flate_level"],
+            memory_limit=settings["memory_limit"],
+            job_timeout=settings["job_timeout"],
+            cpu_limit=settings["cpu_limit"],
+            address_space_limit=settings["address_space_limit"],
+            fallback=settings["fallback"]
+        )
+        folder = tempfile.mkdtemp(prefix="pdf_worker_", dir=self.scratch_dir)
+        send_lock = threading.Lock()
+        batch.open()
+        try:
+            while True:
+                with send_lock:
+                    send_message(sock, {"type": "next"})
+                message = recv_message(sock)
+                kind = message.get("type")
+                if kind == "done":
+                    return
+                if kind == "wait":
+                    time.sleep(message.get("seconds", WAIT_SECONDS))
+                elif kind == "job":
+                    self._run_job(sock, send_lock, batch, folder, welcome["worker"], message)
+                else:
+                    raise ValueError(f"알 수 없는 메시지: {kind}")
+        finally:
+            batch.close()
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def _run_job(self, sock, send_lock, batch, folder, worker, message):
+        """작업 하나 받아 압축하고 결과를 돌려보냄 (압축하는 동안 heartbeat 전송)"""
+        job = message["id"]
+        input_file = os.path.join(folder, f"{job}.pdf")
+        output_file = os.path.join(folder, f"{job}.out.pdf")
+        try:
+            with open(input_file, "wb") as f:
+                try:
+                    recv_payload(sock, message["size"], f)
+                except ValueError as e:
+                    with send_lock:
+                        send_message(sock, {"type": "failed", "id": job, "error": str(e), "transient": True})
+                    return
+
+            stop = threading.Event()
+
+            def heartbeat():
+                while not stop.wait(HEARTBEAT_INTERVAL):
+                    try:
+                        with send_lock:
+                            send_message(sock, {"type": "heartbeat"})
+                    except OSError:
+                        return
+
+            beating = threading.Thread(target=heartbeat, daemon=True)
+            beating.start()
+            error = None
+            environment_error = False
+            try:
+                if not batch.measure_job(input_file, output_file):
+                    error = "취소됨"
+            except OSError as e:
+                # 실행 파일, 임시 폴더, 디스크 등 이 작업자의 문제 (다른 작업자에서는 될 수 있음)
+                error, environment_error = str(e) or type(e).__name__, True
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            finally:
+                stop.set()
+                beating.join()
+            details, metrics = batch.forget(input_file)
+
+            with self._lock:
+                if error:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+            mark = "실패" if error else "완료"
+            print(f"[{worker}] {mark}: {message.get('name')}" + (f" ({error.strip()})" if error else ""),
+                  file=sys.stderr)
+            if environment_error:
+                # 작업은 다른 작업자에게 다시 나누도록 하고 이 연결은 끝냄
+                with send_lock:
+                    send_message(sock, {"type": "failed", "id": job, "error": error, "transient": True})
+                raise RuntimeError(f"작업 환경 오류로 종료합니다: {error}")
+            if error:
+                with send_lock:
+                    send_message(sock, {"type": "failed", "id": job, "error": error})
+                return
+            with open(output_file, "rb") as f, send_lock:
+                size = os.fstat(f.fileno()).st_size
+                send_message(sock, {"type": "result", "id": job, "size": size,
+                                    "details": details, "metrics": metrics}, f)
+        finally:
+            for path in (input_file, output_file):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def spawn_workers(count, address, slots, args):
+    """이 컴퓨터에서 작업자 프로세스 실행 (로컬 시험용, Popen 목록 반환)"""
+    command = [sys.executable, os.path.abspath(__file__), "worker", f"{address[0]}:{address[1]}",
+               "-j", str(slots)]
+    if args.ghostscript_path:
+        command += ["--gs", args.ghostscript_path]
+    if args.token:
+        command += ["--token", args.token]
+    if args.scratch_dir:
+        command += ["--scratch-dir", args.scratch_dir]
+    return [subprocess.Popen(command + ["--name", f"local{index}"]) for index in range(1, count + 1)]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pdf_distributed.py", description="여러 컴퓨터에 나눠 PDF 일괄 압축")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = commands.add_parser("coordinator", help="작업 목록을 나눠 주고 결과를 모음")
+    coordinator.add_argument("inputs", nargs="+", help="PDF 파일, 폴더 또는 글롭 패턴 (예: 'docs/**/*.pdf')")
+    coordinator.add_argument("-o", "--output-dir", help="출력 폴더 (기본값: 원본 파일과 같은 폴더)")
+    coordinator.add_argument("-q", "--quality", default="ebook",
+                             help="압축 품질: screen, ebook, printer, prepress (기본값: ebook)")
+    coordinator.add_argument("--listen", type=parse_address, default=(DEFAULT_HOST, DEFAULT_PORT),
+                             metavar="HOST:PORT",
+                             help=f"작업자 연결을 받을 주소 (포트 0이면 빈 포트, 기본값: {DEFAULT_HOST}:{DEFAULT_PORT})")
+    coordinator.add_argument("--token", help="작업자가 보내야 하는 공유 비밀 값")
+    coordinator.add_argument("--overwrite", action="store_true", help="이미 있는 출력 파일 덮어쓰기")
+    coordinator.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH,
+                             help=f"작업자 대기열로 한꺼번에 가져오는 최대 작업 수 (기본값: {DEFAULT_PREFETCH})")
+    coordinator.add_argument("--heartbeat-timeout", type=float, default=HEARTBEAT_TIMEOUT, metavar="SECONDS",
+                             help=f"이 시간 동안 응답이 없는 작업자는 제외하고 작업을 다시 나눔 "
+                                  f"(기본값: {HEARTBEAT_TIMEOUT:g}초)")
+    coordinator.add_argument("--spawn", type=int, default=0, metavar="N",
+                             help="이 컴퓨터에서 작업자 프로세스 N개를 함께 실행 (시험용)")
+    coordinator.add_argument("--spawn-jobs", type=int, default=1, metavar="J",
+                             help="--spawn으로 실행한 작업자 하나의 동시 작업 수 (기본값: 1)")
+    coordinator.add_argument("--gs", dest="ghostscript_path", help="--spawn 작업자의 Ghostscript 실행 파일 경로")
+    coordinator.add_argument("--scratch-dir", help="받은 결과를 검사하는 임시 폴더 (기본값: 출력 폴더)")
+    coordinator.add_argument("--history", metavar="PATH",
+                             help="작업 순서를 정할 때 예상 시간 보정에 쓸 측정값 JSONL 로그")
+    coordinator.add_argument("--engine", choices=pdf_engine.ENGINES, default=pdf_engine.DEFAULT_ENGINE,
+                             help="압축 엔진 (pdf_cli.py와 같음, 기본값: ghostscript)")
+    coordinator.add_argument("--flate-level", type=int, choices=range(1, 10), default=DEFAULT_FLATE_LEVEL,
+                             metavar="1-9", help=f"python 엔진의 Flate 압축 수준 (기본값: {DEFAULT_FLATE_LEVEL})")
+    coordinator.add_argument("--memory-limit", type=parse_size, metavar="SIZE",
+                             help="python 엔진을 스트리밍 모드로 실행하고 이 메모리 상한 안에서 처리")
+    coordinator.add_argument("--timeout", dest="job_timeout", type=float, metavar="SECONDS",
+                             help="파일 하나의 Ghostscript 실행 시간 상한")
+    coordinator.add_argument("--cpu-limit", type=int, metavar="SECONDS", help="gs 프로세스 하나의 CPU 시간 상한")
+    coordinator.add_argument("--memory-cap", type=parse_size, metavar="SIZE",
+                             help="gs 프로세스 하나의 주소 공간 상한")
+    coordinator.add_argument("--fallback", choices=pdf_limits.FALLBACKS, default=pdf_limits.DEFAULT_FALLBACK,
+                             help="제한에 걸린 파일 처리 (pdf_cli.py와 같음, 기본값: screen)")
+
+    worker = commands.add_parser("worker", help="코디네이터에서 작업을 받아 압축")
+    worker.add_argument("address", type=parse_address, metavar="HOST:PORT", help="코디네이터 주소")
+    worker.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="동시에 압축할 작업 수 (기본값: CPU 코어 수)")
+    worker.add_argument("--name", help="코디네이터에 표시할 이름 (기본값: 호스트 이름)")
+    worker.add_argument("--token", help="코디네이터의 --token과 같은 값")
+    worker.add_argument("--gs", dest="ghostscript_path", help="Ghostscript 실행 파일 경로")
+    worker.add_argument("--cache-dir", help="이 컴퓨터의 결과 캐시 폴더")
+    worker.add_argument("--scratch-dir", help="받은 입력과 결과를 둘 임시 폴더 (기본값: 시스템 임시 폴더)")
+    worker.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT, metavar="SECONDS",
+                        help=f"코디네이터에 연결을 다시 시도하는 시간 (기본값: {CONNECT_TIMEOUT:g}초)")
+    return parser.parse_args(argv)
+
+
+def run_coordinator(args):
+    try:
+        compression = pdf_engine.normalize_compression(args.quality)
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    if args.scratch_dir:
+        try:
+            check_scratch_dir(args.scratch_dir)
+        except OSError as e:
+            print(f"오류: scratch 폴더를 사용할 수 없습니다: {e}", file=sys.stderr)
+            return 2
+
+    input_files, _, _, bases = expand_inputs(args.inputs)
+    outputs, conflicts = plan_outputs(input_files, bases, args.output_dir)
+    for input_file, other in conflicts.items():
+        print(f"오류: 출력 경로가 겹칩니다: {input_file}, {other}", file=sys.stderr)
+    if conflicts:
+        return 2
+    jobs, skipped = [], 0
+    for input_file in input_files:
+        output_file = outputs[input_file]
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        if os.path.exists(output_file) and not args.overwrite:
+            skipped += 1
+            continue
+        jobs.append((input_file, output_file))
+    cost_model = CostModel.from_jsonl(args.history) if args.history else None
+    jobs, _ = plan(jobs, compression, cost_model, default_engine=args.engine)
+
+    settings = {
+        "compression": compression,
+        "engine": args.engine,
+        "flate_level": args.flate_level,
+        "memory_limit": args.memory_limit,
+        "job_timeout": args.job_timeout,
+        "cpu_limit": args.cpu_limit,
+        "address_space_limit": args.memory_cap,
+        "fallback": args.fallback,
+    }
+    events = queue.Queue()
+    coordinator = Coordinator(jobs, settings, events, token=args.token, scratch_dir=args.scratch_dir,
+                              prefetch=args.prefetch, heartbeat_timeout=args.heartbeat_timeout)
+    try:
+        address = coordinator.start(*args.listen)
+    except OSError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    print(f"코디네이터 시작: {address[0]}:{address[1]} (작업 {len(jobs)}개, 건너뜀 {skipped}개)", file=sys.stderr)
+    processes = spawn_workers(args.spawn, address, args.spawn_jobs, args) if args.spawn else []
+
+    started = time.monotonic()
+    try:
+        while True:
+            try:
+                event = events.get(timeout=WAIT_SECONDS)
+            except queue.Empty:
+                # --spawn으로 띄운 작업자가 모두 끝났고 연결된 작업자도 없으면 더 기다리지 않음
+                exited = all(process.poll() is not None for process in processes)
+                if processes and exited and not coordinator.connected:
+                    print("오류: 실행한 작업자가 모두 종료되어 남은 작업을 처리할 수 없습니다.", file=sys.stderr)
+                    break
+                continue
+            if event[0] == "progress":
+                _, completed, total, input_file, error, worker = event
+                mark = "실패" if error else "완료"
+                print(f"[{completed}/{total}] {mark}: {input_file} ({error.strip() if error else worker})",
+                      file=sys.stderr)
+            elif event[0] == "worker":
+                _, worker, change, reason = event
+                if change == "joined":
+                    print(f"작업자 연결: {worker}", file=sys.stderr)
+                else:
+                    print(f"작업자 종료: {worker}" + (f" ({reason})" if reason else ""), file=sys.stderr)
+            elif event[0] == "stolen":
+                _, input_file, victim, worker = event
+                print(f"작업 가져감: {input_file} ({victim} -> {worker})", file=sys.stderr)
+            elif event[0] == "requeued":
+                _, input_file, worker, reason = event
+                print(f"다시 대기열에: {input_file} ({worker}: {reason})", file=sys.stderr)
+            elif event[0] == "done":
+                break
+    except KeyboardInterrupt:
+        print("취소됨", file=sys.stderr)
+        return 130
+    finally:
+        coordinator.close()
+        for process in processes:
+            try:
+                process.wait(timeout=HEARTBEAT_INTERVAL)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+    elapsed = time.monotonic() - started
+
+    succeeded = sum(1 for result in coordinator.results.values() if result["error"] is None)
+    print(f"완료! {succeeded}/{len(jobs)}개 파일 압축 성공 ({elapsed:.1f}초, "
+          f"가져간 작업 {coordinator.steals}개, 다시 나눈 작업 {coordinator.requeued}개)", file=sys.stderr)
+    for worker, count in sorted(coordinator.worker_counts.items()):
+        print(f"  {worker}: {count}개", file=sys.stderr)
+    return 0 if succeeded == len(jobs) else 1
+
+
+def run_worker(args):
+    ghostscript_path = args.ghostscript_path or pdf_engine.find_ghostscript()
+    if args.scratch_dir:
+        try:
+            check_scratch_dir(args.scratch_dir)
+        except OSError as e:
+            print(f"오류: scratch 폴더를 사용할 수 없습니다: {e}", file=sys.stderr)
+            return 2
+    cache = ResultCache(args.cache_dir) if args.cache_dir else None
+    worker = Worker(args.address, args.jobs, ghostscript_path, name=args.name, token=args.token, cache=cache,
+                    scratch_dir=args.scratch_dir, connect_timeout=args.connect_timeout)
+    try:
+        ok = worker.run()
+    except KeyboardInterrupt:
+        return 130
+    print(f"작업자 종료: 완료 {worker.completed}개, 실패 {worker.failed}개", file=sys.stderr)
+    return 0 if ok else 1
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "coordinator":
+        return run_coordinator(args)
+    return run_worker(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,917 @@
+"""
+PDF 압축 엔진 (GUI 없음)
+- Ghostscript 감지 및 명령어 구성
+- 단일 파일 압축 (compress_pdf), 메모리에 있는 PDF 압축 (compress_stream, 파이프 모드)
+- 작업 스레드 풀 기반 배치 실행 (CompressionBatch)
+- 엔진: Ghostscript(다시 렌더링), Python(pdf_rewrite, 무손실 재작성),
+  이미지(pdf_images, 이미지만 줄이고 나머지는 그대로 재작성)
+
+tkinter / PIL을 임포트하지 않으므로 cron, 컨테이너 등 디스플레이가 없는
+환경에서도 바로 사용할 수 있습니다. (CLI: pdf_cli.py)
+"""
+import os
+import sys
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pdf_adaptive
+import pdf_images
+import pdf_journal
+import pdf_limits
+import pdf_pipe
+import pdf_preflight
+import pdf_rewrite
+import pdf_schedule
+import pdf_scratch
+from pdf_metrics import MeasuredPopen, maxrss_bytes
+import pdf_progress
+from pdf_interpreter import InterpreterPool
+import pdf_shard
+import pdf_target
+from pdf_cache import get_ghostscript_version
+
+# 화면 표시 이름 -> Ghostscript -dPDFSETTINGS 값
+COMPRESSION_LEVELS = {
+    "최고 품질 (최소 압축)": "/prepress",
+    "고품질 (인쇄용)": "/printer",
+    "중간 품질 (전자책)": "/ebook",
+    "저품질 (웹용)": "/screen"
+}
+DEFAULT_COMPRESSION = "/ebook"
+
+# 압축 엔진 (auto: 사전 분석으로 이미지 비중이 낮은 문서는 python, 나머지는 ghostscript 또는 images)
+ENGINES = ("ghostscript", "python", "images", "auto")
+# Ghostscript 없이 PyPDF2로 다시 쓰는 엔진
+REWRITE_ENGINES = ("python", "images")
+DEFAULT_ENGINE = "ghostscript"
+# auto 엔진에서 python 엔진을 고르는 이미지 비중 상한
+AUTO_IMAGE_SHARE = 0.2
+# 작업 순서 (cost: 레인별로 예상 시간이 긴 작업부터, fifo: 주어진 순서대로)
+SCHEDULES = ("cost", "fifo")
+DEFAULT_SCHEDULE = "cost"
+
+
+def find_ghostscript():
+    """시스템에서 Ghostscript 실행 파일 찾기"""
+    if sys.platform.startswith('win'):
+        for cmd in ('gswin64c', 'gswin32c', 'gs'):
+            path = shutil.which(cmd)
+            if path:
+                return path
+    else:
+        path = shutil.which('gs')
+        if path:
+            return path
+    return None
+
+
+def normalize_compression(value):
+    """'ebook', '/ebook', 화면 표시 이름 등을 -dPDFSETTINGS 값으로 변환"""
+    if value in COMPRESSION_LEVELS:
+        return COMPRESSION_LEVELS[value]
+    setting = value if value.startswith("/") else f"/{value}"
+    if setting not in COMPRESSION_LEVELS.values():
+        raise ValueError(f"알 수 없는 압축 품질: {value}")
+    return setting
+
+
+def get_output_path(input_file, output_dir=None, base_dir=None):
+    """
+    입력 파일에 대한 기본 출력 경로 (<이름>_compressed.pdf)
+    - output_dir과 base_dir이 주어지면 base_dir 기준 하위 폴더 구조를 output_dir 아래에 그대로 유지
+    """
+    if output_dir:
+        name = f"{os.path.splitext(os.path.basename(input_file))[0]}_compressed.pdf"
+        if base_dir is None:
+            return os.path.join(output_dir, name)
+        subdir = os.path.dirname(os.path.relpath(input_file, base_dir))
+        return os.path.join(output_dir, subdir, name)
+    dirname, filename = os.path.split(input_file)
+    return os.path.join(dirname, f"{os.path.splitext(filename)[0]}_compressed.pdf")
+
+
+def build_command(ghostscript_path, input_file, output_file, compression=DEFAULT_COMPRESSION,
+                  first_page=None, last_page=None, extra_args=None, postscript=None):
+    """
+    Ghostscript 명령어 구성
+    - first_page/last_page: 해당 페이지 범위만 출력
+    - extra_args: 프리셋 값을 덮어쓸 추가 인수
+    - postscript: 입력 파일 앞에 실행할 PostScript (예: setdistillerparams)
+    """
+    command = [
+        ghostscript_path,
+        "-sDEVICE=pdfwrite",
+        "-dCompatibilityLevel=1.4",
+        f"-dPDFSETTINGS={compression}",
+        "-dNOPAUSE",
+        "-dQUIET",
+        "-dBATCH",
+    ]
+    if first_page is not None:
+        command.append(f"-dFirstPage={first_page}")
+    if last_page is not None:
+        command.append(f"-dLastPage={last_page}")
+    if extra_args:
+        command += extra_args
+    command.append(f"-sOutputFile={output_file}")
+    if postscript:
+        command += ["-c", postscript, "-f"]
+    command.append(input_file)
+    return command
+
+
+def keep_smaller(input_file, output_file):
+    """압축 결과가 원본보다 크거나 같으면 원본으로 교체 (교체했으면 True)"""
+    if os.path.getsize(output_file) < os.path.getsize(input_file):
+        return False
+    shutil.copyfile(input_file, output_file)
+    return True
+
+
+def _cpu_used(process):
+    """MeasuredPopen으로 실행한 gs의 CPU 시간 (초, 수집하지 못했으면 None)"""
+    if process.rusage is None:
+        return None
+    return process.rusage.ru_utime + process.rusage.ru_stime
+
+
+def compress_pdf(input_file, output_file, compression=DEFAULT_COMPRESSION, ghostscript_path=None,
+                 scratch_dir=None, timeout=None, cpu_limit=None, address_space_limit=None):
+    """
+    단일 PDF 파일 압축
+    - 결과는 scratch_dir(없으면 출력 폴더)의 임시 파일에 쓰고 검사한 뒤 최종 경로로 교체
+    - timeout(초), cpu_limit(초), address_space_limit(바이트)로 gs 실행 제한 (pdf_limits 참고)
+    - 실패 시 RuntimeError 발생
+    """
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_file}")
+
+    ghostscript_path = ghostscript_path or find_ghostscript()
+    if not ghostscript_path:
+        raise RuntimeError("Ghostscript를 찾을 수 없습니다.")
+
+    scratch_file = pdf_scratch.scratch_path(output_file, scratch_dir)
+    try:
+        # CPU hard 상한의 SIGKILL을 구분하도록 rusage를 함께 수집
+        process = MeasuredPopen(
+            build_command(ghostscript_path, input_file, scratch_file, compression),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            preexec_fn=pdf_limits.limit_preexec(cpu_limit, address_space_limit)
+        )
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise RuntimeError(f"자원 제한 초과: {pdf_limits.LIMIT_NAMES['timeout']}")
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+
+        if process.returncode != 0:
+            limit = pdf_limits.classify_failure(
+                process.returncode, stderr + stdout, False, cpu_limit, address_space_limit, _cpu_used(process)
+            )
+            if limit is not None:
+                raise RuntimeError(f"자원 제한 초과: {pdf_limits.LIMIT_NAMES[limit]}")
+            raise RuntimeError(f"Ghostscript 오류: {stderr}")
+
+        if not os.path.exists(scratch_file):
+            raise RuntimeError("출력 파일이 생성되지 않았습니다.")
+
+        keep_smaller(input_file, scratch_file)
+        pdf_scratch.validate_output(scratch_file)
+        pdf_scratch.publish_output(scratch_file, output_file)
+    finally:
+        if os.path.exists(scratch_file):
+            os.remove(scratch_file)
+    return True
+
+
+def compress_stream(source, compression=DEFAULT_COMPRESSION, ghostscript_path=None,
+                    spill_bytes=pdf_pipe.SPILL_BYTES, timeout=None, cpu_limit=None, address_space_limit=None):
+    """
+    메모리에 있는 PDF 압축 (파이프 모드, 입출력 임시 파일 없음, pdf_pipe 참고)
+    - source: PDF 바이트 또는 바이너리 파일 객체 (현재 위치부터)
+    - 반환값: 결과가 든 SpooledTemporaryFile (처음 위치, spill_bytes를 넘으면 디스크로 넘어감)
+    - 결과가 원본보다 크거나 같으면 원본 그대로 (source가 되감을 수 없는 파일 객체면 결과 그대로)
+    - 제한 인수는 compress_pdf와 같음, 실패 시 RuntimeError 발생
+    """
+    ghostscript_path = ghostscript_path or find_ghostscript()
+    if not ghostscript_path:
+        raise RuntimeError("Ghostscript를 찾을 수 없습니다.")
+
+    size = pdf_pipe.source_size(source)
+    # 결과가 더 크면 원본으로 되돌릴 수 있도록 시작 위치 기억
+    start = 0 if isinstance(source, (bytes, bytearray, memoryview)) or size is None else source.tell()
+    sink = pdf_pipe.spool(spill_bytes)
+    process = MeasuredPopen(
+        build_command(ghostscript_path, "-", "-", compression, extra_args=pdf_pipe.PIPE_ARGS),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        preexec_fn=pdf_limits.limit_preexec(cpu_limit, address_space_limit)
+    )
+    timed_out = threading.Event()
+    timer = None
+    if timeout:
+        def expire():
+            timed_out.set()
+            try:
+                process.kill()
+            except OSError:
+                pass
+        timer = threading.Timer(timeout, expire)
+        timer.daemon = True
+        timer.start()
+    try:
+        errors = pdf_pipe.communicate(process, source, sink)
+    except BaseException:
+        process.kill()
+        process.wait()
+        sink.close()
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+    try:
+        if process.returncode != 0:
+            limit = pdf_limits.classify_failure(
+                process.returncode, errors, timed_out.is_set(), cpu_limit, address_space_limit, _cpu_used(process)
+            )
+            if limit is not None:
+                raise RuntimeError(f"자원 제한 초과: {pdf_limits.LIMIT_NAMES[limit]}")
+            raise RuntimeError(f"Ghostscript 오류: {errors}")
+        pdf_pipe.keep_smaller(source, sink, size, start)
+        sink.seek(0, 2)
+        pdf_scratch.validate_stream(sink, sink.tell())
+    except BaseException:
+        sink.close()
+        raise
+    return sink
+
+
+class CompressionBatch:
+    """
+    백그라운드 배치 실행기
+    - 작업 스레드 풀에서 Ghostscript 프로세스를 동시에 실행
+    - 진행 상황을 이벤트 큐로 전달 (UI 위젯은 직접 건드리지 않음)
+    - 취소 시 실행 중인 gs 자식 프로세스를 즉시 종료
+    - cache(pdf_cache.ResultCache)가 주어지면 입력이 바뀌지 않은 파일은 gs 실행 생략
+    - shard_threshold(쪽수)가 주어지면 그보다 긴 문서는 페이지 범위로 나눠 동시에 압축
+    - target_size(바이트)가 주어지면 그 크기 이하에서 가장 품질이 높은 결과를 탐색
+    - min_savings(0~1)가 주어지면 사전 분석으로 예상 절감률이 그보다 낮은 파일은 원본을 그대로 복사
+    - 결과가 원본보다 크면 원본으로 교체
+    - persistent=True이면 파일마다 gs를 새로 띄우지 않고 상주 인터프리터 풀에 작업을 보냄
+    - 동시에 실행되는 gs 프로세스 수는 분할 조각을 포함해 max_workers로 제한
+    - adaptive=(최소, 최대)가 주어지면 max_workers에서 시작해 부하 평균, 사용 가능한 메모리,
+      gs 프로세스별 메모리, I/O 압박에 따라 그 범위 안에서 동시 실행 수를 조절
+      (작업 스레드는 최대값만큼 만들고, 결정 기록은 controller.decisions, pdf_adaptive 참고)
+    - 파일별 부가 정보(목표 크기 탐색 결과 등)는 details[입력 파일]에 기록
+    - 작업마다 경과 시간, gs CPU 시간, 최대 메모리, 입출력 크기 등을 job_metrics[입력 파일]에 기록하고
+      telemetry(pdf_metrics.MetricsLog)가 주어지면 JSONL 로그 / Prometheus 집계에도 기록
+      (상주 인터프리터로 처리한 작업은 프로세스를 공유하므로 CPU 시간/메모리가 None)
+    - engine으로 엔진을 고르고, engines({입력 파일: 엔진})로 파일별로 다르게 지정할 수 있음
+      (python/images 엔진은 분할, 목표 크기, 사전 분석, 상주 인터프리터 설정을 사용하지 않음)
+    - python 엔진의 작업 전체와 images 엔진의 이미지 처리는 배치 전체가 함께 쓰는 프로세스 풀에서 실행
+    - memory_limit(바이트)가 주어지면 python 엔진은 스트리밍 모드로 객체를 하나씩 읽고 씀 (pdf_rewrite 참고)
+    - journal(pdf_journal.JournalRun)이 주어지면 파일마다 시작/완료/실패를 저널에 바로 기록
+      (취소된 파일은 queued로 되돌려 이어하기에서 다시 실행)
+    - 출력은 scratch_dir(없으면 출력 폴더)의 임시 파일에 쓰고 검사한 뒤 최종 경로로 원자적으로 교체
+      (중단되거나 실패해도 잘린 출력 파일이 남지 않음, pdf_scratch 참고)
+    - schedule="cost"이면 파일 크기, 페이지 수, cost_model(pdf_schedule.CostModel)의 측정 기록으로
+      예상 시간을 계산해 긴 작업부터 시작하고, lanes({입력 파일: 레인})의 interactive 레인은 항상 먼저 시작
+      (예상값은 details에 기록하고 끝난 작업의 측정값으로 cost_model을 계속 보정)
+    - job_timeout(초)이 주어지면 작업의 첫 gs 프로세스가 시작된 뒤 그 시간이 지나면 gs를 종료하고,
+      cpu_limit(초)/address_space_limit(바이트)는 gs 프로세스마다 setrlimit으로 적용
+      제한에 걸린 작업은 fallback("screen", "passthrough", "none")에 따라 /screen으로 한 번 더 시도하거나
+      원본을 그대로 복사하고, details에 "limit"(시간/CPU/메모리)과 "fallback"을 기록 (pdf_limits 참고)
+    - page_progress=True이면 gs 출력의 "Page N" 줄을 실시간으로 읽어 페이지 단위 진행 상황 전달
+      (상주 인터프리터와 목표 크기 탐색은 파일 단위로만 집계)
+
+    큐에 들어가는 이벤트:
+    - ("progress", 완료 수, 전체 수, 입력 파일, 오류 메시지 또는 None)
+    - ("pages", 완료 페이지, 전체 페이지, 초당 페이지, 남은 시간(초) 또는 None)  (page_progress일 때)
+    - ("concurrency", 이전 동시 실행 수, 새 동시 실행 수, 이유)  (adaptive일 때)
+    - ("done", 성공 수, 전체 수, 취소 여부)
+    """
+    def __init__(self, ghostscript_path, compression, jobs, max_workers, events, total=None, cache=None,
+                 shard_threshold=None, target_size=None, min_savings=None, persistent=False,
+                 page_progress=False, telemetry=None, engine=DEFAULT_ENGINE, engines=None,
+                 flate_level=pdf_rewrite.DEFAULT_FLATE_LEVEL, memory_limit=None, journal=None, scratch_dir=None,
+                 schedule=DEFAULT_SCHEDULE, lanes=None, cost_model=None, adaptive=None,
+                 job_timeout=None, cpu_limit=None, address_space_limit=None, fallback=pdf_limits.DEFAULT_FALLBACK):
+        self.ghostscript_path = ghostscript_path
+        self.compression = compression
+        self.jobs = list(jobs)
+        self.max_workers = max(1, max_workers)
+        self.events = events
+        self.total = total if total is not None else len(self.jobs)
+        self.completed = self.total - len(self.jobs)
+        self.cache = cache
+        self.shard_threshold = shard_threshold
+        self.target_size = target_size
+        self.min_savings = min_savings
+        self.persistent = persistent
+        self.page_progress = page_progress
+        self.tracker = None
+        self.telemetry = telemetry
+        self.engine = engine
+        self.engines = engines or {}
+        self.flate_level = flate_level
+        self.memory_limit = memory_limit
+        self.journal = journal
+        self.scratch_dir = scratch_dir
+        self.schedule = schedule
+        self.lanes = lanes or {}
+        self.cost_model = cost_model if cost_model is not None else pdf_schedule.CostModel()
+        self.adaptive = adaptive
+        # 작업 스레드 수 (자동 조절 시 늘어날 수 있는 최대값)
+        self.worker_threads = max(self.max_workers, adaptive[1]) if adaptive else self.max_workers
+        self.controller = None
+        if persistent and cpu_limit:
+            # 상주 인터프리터는 여러 작업이 한 프로세스의 CPU 시간을 나눠 씀
+            raise ValueError("상주 인터프리터는 CPU 시간 상한과 함께 쓸 수 없습니다.")
+        self.job_timeout = job_timeout
+        self.cpu_limit = cpu_limit
+        self.address_space_limit = address_space_limit
+        self.fallback = fallback
+        self._preexec = pdf_limits.limit_preexec(cpu_limit, address_space_limit)
+        # 작업별 제한 시간 시계 {입력 파일: [쓴 시간, 실행 중인 gs 수, 시계를 시작한 시각]}
+        # (동시 실행 자리를 기다리는 시간은 빼고 그 작업의 gs가 하나라도 실행 중인 시간만 셈)
+        self._job_clocks = {}
+        self._pool = None
+        self._process_pool = None
+        self.details = {}
+        self.job_metrics = {}
+        self._usage = {}
+
+        self._cancel_event = threading.Event()
+        self._slots = pdf_adaptive.ConcurrencyLimit(self.max_workers)
+        self._lock = threading.Lock()
+        self._processes = set()
+        self._thread = None
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def start(self):
+        """배치를 백그라운드 스레드에서 시작"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """대기 중인 작업을 취소하고 실행 중인 gs 프로세스 종료"""
+        self._cancel_event.set()
+        if self._pool is not None:
+            self._pool.kill_all()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    def run(self):
+        """배치 실행 (호출한 스레드에서 모든 작업이 끝날 때까지 대기)"""
+        success_count = 0
+        if self.page_progress:
+            # 배치 전체의 ETA를 위해 파일 크기로 어림해 두고 작업이 시작될 때 보정 (파일을 미리 읽지 않음)
+            self.tracker = pdf_progress.PageTracker({
+                input_file: pdf_progress.estimate_page_count(input_file)
+                for input_file, _ in self.jobs
+            })
+        self.open()
+        try:
+            success_count = self._run_jobs()
+        finally:
+            self.close()
+        self.events.put(("done", success_count, self.total, self.cancelled))
+        return success_count
+
+    def open(self):
+        """상주 인터프리터 등 배치 자원 준비 (run() 없이 measure_job을 직접 호출할 때 사용)"""
+        if self.persistent and self._pool is None:
+            self._pool = InterpreterPool(self.ghostscript_path, self.compression, self.worker_threads,
+                                         job_timeout=self.job_timeout,
+                                         preexec_fn=pdf_limits.limit_preexec(None, self.address_space_limit))
+        if self.adaptive and self.controller is None:
+            self.controller = pdf_adaptive.ConcurrencyController(
+                self._slots, self.adaptive[0], self.adaptive[1], self._child_pids, self.events
+            )
+            # 시작 값(max_workers)이 조절 범위 밖이면 첫 측정에서 바로 범위 안으로 맞춤 (결정 기록에 남음)
+            self.controller.step()
+            self.controller.start()
+
+    def close(self):
+        """open()에서 준비한 자원과 python/images 엔진용 프로세스 풀 정리"""
+        if self.controller is not None:
+            self.controller.stop()
+        if self._pool is not None:
+            self._pool.close()
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+
+    def _run_jobs(self):
+        success_count = 0
+        jobs = self.jobs
+        if self.schedule == "cost":
+            jobs, estimates = pdf_schedule.plan(
+                self.jobs, self.compression, self.cost_model, self.engines, self.engine, self.lanes
+            )
+            with self._lock:
+                for input_file, estimate in estimates.items():
+                    self.details.setdefault(input_file, {}).update(estimate)
+            if self.tracker is not None:
+                # 순서를 정하며 읽은 페이지 수로 어림값 보정
+                for input_file, estimate in estimates.items():
+                    if estimate["pages"]:
+                        self.tracker.set_count(input_file, estimate["pages"])
+        # 실행기의 대기열은 넣은 순서대로 꺼내므로 정렬한 순서가 곧 시작 순서
+        with ThreadPoolExecutor(max_workers=self.worker_threads) as executor:
+            futures = {
+                executor.submit(self.measure_job, input_file, output_file): input_file
+                for input_file, output_file in jobs
+            }
+            # 작업이 끝나는 순서대로 결과 수집
+            for future in as_completed(futures):
+                input_file = futures[future]
+                error = None
+                try:
+                    if future.result():
+                        success_count += 1
+                except Exception as e:
+                    error = str(e)
+                self.completed += 1
+                if not self.cancelled:
+                    self.events.put(("progress", self.completed, self.total, input_file, error))
+                    if self.tracker is not None:
+                        self.tracker.file_finished(input_file)
+                        self.events.put(("pages",) + self.tracker.snapshot())
+        return success_count
+
+    def _child_pids(self):
+        """실행 중인 gs 자식 프로세스 pid 목록 (동시 실행 수 조절기에서 호출)"""
+        with self._lock:
+            return [process.pid for process in self._processes]
+
+    def measure_job(self, input_file, output_file):
+        """compress_pdf를 실행하며 작업별 측정값 기록 (작업 스레드에서 실행)"""
+        if self.journal is not None:
+            self.journal.mark(input_file, pdf_journal.RUNNING)
+        started = time.monotonic()
+        status, error = "cancelled", None
+        try:
+            result = self.compress_pdf(input_file, output_file)
+            if result:
+                status = "ok"
+            return result
+        except Exception as e:
+            status, error = "failed", str(e)
+            raise
+        finally:
+            self._finish_metrics(input_file, output_file, time.monotonic() - started, status, error)
+            if self.journal is not None:
+                journal_status = {"ok": pdf_journal.DONE, "failed": pdf_journal.FAILED}.get(status, pdf_journal.QUEUED)
+                self.journal.mark(input_file, journal_status, error)
+
+    def _finish_metrics(self, input_file, output_file, wall_seconds, status, error):
+        with self._lock:
+            usage = self._usage.pop(input_file, {})
+            details = dict(self.details.get(input_file, {}))
+        cpu_user = usage.get("cpu_user_seconds")
+        cpu_system = usage.get("cpu_system_seconds")
+        input_bytes = os.path.getsize(input_file) if os.path.exists(input_file) else None
+        output_bytes = os.path.getsize(output_file) if status == "ok" and os.path.exists(output_file) else None
+        record = {
+            "timestamp": round(time.time(), 3),
+            "input": input_file,
+            "output": output_file,
+            "preset": self.compression,
+            "status": status,
+            "error": error,
+            "wall_seconds": round(wall_seconds, 4),
+            "cpu_user_seconds": cpu_user,
+            "cpu_system_seconds": cpu_system,
+            "cpu_seconds": round(cpu_user + cpu_system, 4) if cpu_user is not None else None,
+            "peak_rss_bytes": usage.get("peak_rss_bytes"),
+            "gs_runs": usage.get("gs_runs", 0),
+            "exit_code": usage.get("exit_code"),
+            "input_bytes": input_bytes,
+            "output_bytes": output_bytes,
+            "ratio": round(output_bytes / input_bytes, 4) if output_bytes is not None and input_bytes else None,
+        }
+        for key in ("engine", "passthrough", "cached", "lane", "pages", "estimated_seconds", "limit", "fallback"):
+            if key in details:
+                record[key] = details[key]
+        with self._lock:
+            self.job_metrics[input_file] = record
+            self.cost_model.observe(record)
+        if self.telemetry is not None:
+            self.telemetry.record(record)
+
+    def _record_usage(self, input_file, process):
+        """gs 프로세스 하나의 자원 사용량을 작업 측정값에 합산 (분할/목표 크기 모드는 여러 번 호출)"""
+        rusage = process.rusage
+        with self._lock:
+            usage = self._usage.setdefault(input_file, {})
+            usage["gs_runs"] = usage.get("gs_runs", 0) + 1
+            if process.returncode is not None and (process.returncode != 0 or "exit_code" not in usage):
+                usage["exit_code"] = process.returncode
+            if rusage is None:
+                return
+            usage["cpu_user_seconds"] = round(usage.get("cpu_user_seconds", 0) + rusage.ru_utime, 4)
+            usage["cpu_system_seconds"] = round(usage.get("cpu_system_seconds", 0) + rusage.ru_stime, 4)
+            usage["peak_rss_bytes"] = max(usage.get("peak_rss_bytes", 0), maxrss_bytes(rusage))
+
+    def compress_pdf(self, input_file, output_file):
+        """단일 PDF 파일 압축 (작업 스레드에서 실행, 임시 파일에 만든 뒤 검사하고 최종 경로로 교체)"""
+        if self.cancelled:
+            return False
+        if self.tracker is not None and not self.tracker.is_known(input_file):
+            page_count = pdf_progress.probe_page_count(input_file)
+            if page_count:
+                self.tracker.set_count(input_file, page_count)
+        with self._lock:
+            details = self.details.get(input_file, {})
+            details.pop("limit", None)
+            details.pop("fallback", None)
+        scratch_file = pdf_scratch.scratch_path(output_file, self.scratch_dir)
+        try:
+            try:
+                completed = self._compress(input_file, scratch_file)
+            except RuntimeError:
+                if self.cancelled or "limit" not in self.details.get(input_file, {}):
+                    raise
+                completed = self._fallback(input_file, scratch_file)
+            if not completed or self.cancelled:
+                return False
+            pdf_scratch.validate_output(scratch_file)
+            pdf_scratch.publish_output(scratch_file, output_file)
+            return True
+        finally:
+            if os.path.lexists(scratch_file):
+                os.remove(scratch_file)
+            with self._lock:
+                self._job_clocks.pop(input_file, None)
+
+    def _fallback(self, input_file, output_file):
+        """자원 제한에 걸린 작업을 대체 방법으로 한 번 더 처리 (/screen 다시 시도 -> 원본 복사)"""
+        limit = self.details[input_file]["limit"]
+        if self.fallback == "none":
+            raise RuntimeError(f"자원 제한 초과: {pdf_limits.LIMIT_NAMES[limit]}")
+        if os.path.lexists(output_file):
+            os.remove(output_file)
+
+        if self.fallback == "screen" and self.compression != pdf_limits.FALLBACK_PRESET:
+            # 다시 시도하는 gs도 같은 제한을 새로 적용
+            with self._lock:
+                self._job_clocks.pop(input_file, None)
+            command = build_command(self.ghostscript_path, input_file, output_file, pdf_limits.FALLBACK_PRESET)
+            try:
+                if not self.run_ghostscript(command, input_file, track_pages=False):
+                    return False
+                keep_smaller(input_file, output_file)
+                self.set_detail(input_file, "fallback", pdf_limits.FALLBACK_PRESET)
+                return True
+            except RuntimeError:
+                if self.cancelled:
+                    return False
+                if os.path.lexists(output_file):
+                    os.remove(output_file)
+
+        shutil.copyfile(input_file, output_file)
+        self.set_detail(input_file, "fallback", "passthrough")
+        self.set_detail(input_file, "passthrough", "limit")
+        return True
+
+    def _compress(self, input_file, output_file):
+        """압축 결과를 output_file(compress_pdf가 정한 임시 파일)에 만듦"""
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_file}")
+
+        engine = self.engine_for(input_file)
+        if engine == "ghostscript" and not self.ghostscript_path:
+            raise RuntimeError("Ghostscript를 찾을 수 없습니다.")
+        rewrite_engine = engine in REWRITE_ENGINES
+        self.set_detail(input_file, "engine", engine)
+        target_size = None if rewrite_engine else self.target_size
+
+        command = build_command(self.ghostscript_path, input_file, output_file, self.compression)
+
+        # 분할 압축 대상인지 확인 (목표 크기 모드에서는 사용하지 않음)
+        page_count = None
+        if self.shard_threshold and not target_size and not rewrite_engine:
+            page_count = pdf_shard.count_pages(input_file)
+            if page_count <= self.shard_threshold:
+                page_count = None
+
+        # 캐시 확인 (키에는 실행 파일/입출력 경로를 제외한 인수 목록 사용)
+        cache_key = None
+        if self.cache is not None:
+            if engine == "python":
+                arguments = ["engine=python", f"flate={self.flate_level}"]
+                if self.memory_limit:
+                    # 스트리밍 모드는 중복 제거 범위가 달라 결과가 다름
+                    arguments.append("streaming")
+                version = pdf_rewrite.engine_version()
+            elif engine == "images":
+                arguments = ["engine=images", self.compression, f"flate={self.flate_level}"]
+                version = pdf_images.engine_version()
+            else:
+                arguments = command[1:-2] + (["sharded"] if page_count else [])
+                if target_size:
+                    arguments.append(f"target={target_size}")
+                version = get_ghostscript_version(self.ghostscript_path)
+            cache_key = self.cache.make_key(input_file, arguments, version)
+            if self.cache.fetch(cache_key, output_file):
+                self.set_detail(input_file, "cached", True)
+                return True
+            # 기존 출력이 이전 버전에서 만든 캐시 항목의 하드링크일 수 있으므로 gs가 덮어쓰기 전에 삭제
+            if os.path.lexists(output_file):
+                os.remove(output_file)
+
+        # 사전 분석: 예상 절감률이 낮으면 gs 실행 없이 원본을 그대로 복사
+        # (PyPDF2가 없거나 분석하지 못한 파일은 그대로 gs로 압축)
+        analysis = None
+        if self.min_savings is not None and not target_size and not rewrite_engine:
+            try:
+                analysis = pdf_preflight.analyze(input_file)
+            except Exception as e:
+                self.set_detail(input_file, "preflight_error", str(e) or type(e).__name__)
+        if analysis is not None:
+            savings = pdf_preflight.estimate_savings(analysis, self.compression)
+            self.set_detail(input_file, "estimated_savings", round(savings, 3))
+            if savings < self.min_savings:
+                shutil.copyfile(input_file, output_file)
+                self.set_detail(input_file, "passthrough", "preflight")
+                return True
+
+        if rewrite_engine:
+            completed = self.rewrite(input_file, output_file, engine)
+        elif target_size:
+            completed = self.compress_to_target(input_file, output_file)
+        elif page_count:
+            if self.tracker is not None:
+                self.tracker.set_count(input_file, page_count)
+            completed = pdf_shard.compress_sharded(
+                input_file,
+                output_file,
+                page_count,
+                lambda first, last, shard_file: build_command(
+                    self.ghostscript_path, input_file, shard_file, self.compression, first, last
+                ),
+                lambda shard_command: self.run_ghostscript(shard_command, input_file),
+                self.max_workers
+            )
+        elif self._pool is not None:
+            with self._slots:
+                try:
+                    completed = not self.cancelled and self._pool.compress(input_file, output_file)
+                except TimeoutError:
+                    self.set_detail(input_file, "limit", "timeout")
+                    raise RuntimeError(f"자원 제한 초과: {pdf_limits.LIMIT_NAMES['timeout']}")
+                except RuntimeError as e:
+                    if pdf_limits.classify_failure(None, str(e), False, None, self.address_space_limit) is None:
+                        raise
+                    self.set_detail(input_file, "limit", "memory")
+                    raise RuntimeError(f"자원 제한 초과: {pdf_limits.LIMIT_NAMES['memory']}")
+        else:
+            completed = self.run_ghostscript(command, input_file, exact_count=True)
+
+        if not completed or self.cancelled:
+            # 중단된 출력 파일 정리
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            return False
+
+        # 원본과 동일한 파일이 생성되었는지 확인
+        if not os.path.exists(output_file):
+            raise RuntimeError("출력 파일이 생성되지 않았습니다.")
+
+        # 결과가 원본보다 크면 원본으로 교체
+        if keep_smaller(input_file, output_file):
+            self.set_detail(input_file, "passthrough", "larger")
+
+        if cache_key is not None:
+            self.cache.store(cache_key, output_file)
+
+        return True
+
+    def process_pool(self):
+        """python/images 엔진용 프로세스 풀 (처음 사용할 때 생성)"""
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = pdf_images.create_pool(self.max_workers)
+            return self._process_pool
+
+    def engine_for(self, input_file):
+        """파일에 사용할 엔진 ("ghostscript", "python", "images")"""
+        engine = self.engines.get(input_file, self.engine)
+        if engine != "auto":
+            return engine
+        # 이미지가 많은 문서는 Ghostscript, 없으면 images 엔진
+        image_engine = "ghostscript" if self.ghostscript_path else "images"
+        try:
+            analysis = pdf_preflight.analyze(input_file)
+        except Exception:
+            return image_engine
+        image_share = analysis["image_bytes"] / max(1, analysis["file_bytes"])
+        return "python" if image_share < AUTO_IMAGE_SHARE else image_engine
+
+    def rewrite(self, input_file, output_file, engine):
+        """
+        python/images 엔진으로 압축 (작업 스레드에서 실행, 동시 실행 수 제한 적용)
+        - python 엔진은 작업 전체를 프로세스 풀에서 실행 (PyPDF2 파싱이 GIL에 묶이지 않도록)
+        - images 엔진은 문서 파싱은 작업 스레드, 이미지 처리는 프로세스 풀에서 실행
+        - CPU 시간은 python 엔진은 풀 프로세스, images 엔진은 작업 스레드 기준
+          (images 엔진의 이미지 처리 프로세스 시간은 포함하지 않음)
+        """
+        with self._slots:
+            if self.cancelled:
+                return False
+            if engine == "images":
+                started = time.thread_time()
+                stats = pdf_images.downsample_pdf(
+                    input_file, output_file, self.compression, self.process_pool(), level=self.flate_level
+                )
+                cpu_seconds = round(time.thread_time() - started, 4)
+            else:
+                stats, cpu_seconds = self.process_pool().submit(
+                    pdf_rewrite.rewrite_pdf_timed, input_file, output_file, self.flate_level, self.memory_limit
+                ).result()
+                cpu_seconds = round(cpu_seconds, 4)
+        with self._lock:
+            usage = self._usage.setdefault(input_file, {})
+            usage["cpu_user_seconds"] = round(usage.get("cpu_user_seconds", 0) + cpu_seconds, 4)
+            usage.setdefault("cpu_system_seconds", 0)
+            if "peak_rss_bytes" in stats:
+                # 스트리밍 모드에서 잰 풀 프로세스의 RSS (그 프로세스에서는 이 작업만 실행)
+                usage["peak_rss_bytes"] = max(usage.get("peak_rss_bytes", 0), stats["peak_rss_bytes"])
+        self.set_detail(input_file, "rewrite", stats)
+        return True
+
+    def compress_to_target(self, input_file, output_file):
+        """목표 크기 이하에서 가장 품질이 높은 후보 탐색 (후보는 동시에 시험)"""
+        def probe(index, probe_output):
+            extra_args, postscript = pdf_target.candidate_arguments(index)
+            return self.run_ghostscript(build_command(
+                self.ghostscript_path, input_file, probe_output, self.compression,
+                extra_args=extra_args, postscript=postscript
+            ), input_file, track_pages=False)
+
+        result = pdf_target.compress_to_target(
+            input_file, output_file, self.target_size, self.compression, probe, self.max_workers
+        )
+        if result is None:
+            return False
+        self.set_detail(input_file, "target", result)
+        return True
+
+    def forget(self, input_file):
+        """
+        파일별 기록(details, job_metrics)을 꺼내고 지움 (오래 실행되는 서비스에서 기록이 쌓이지 않도록)
+        - 반환값: (details, job_metrics 기록 또는 None)
+        """
+        with self._lock:
+            return self.details.pop(input_file, {}), self.job_metrics.pop(input_file, None)
+
+    def set_detail(self, input_file, key, value):
+        """파일별 부가 정보 기록 (여러 작업 스레드에서 호출)"""
+        with self._lock:
+            self.details.setdefault(input_file, {})[key] = value
+
+    def _start_clock(self, input_file):
+        """작업의 gs 하나 시작 -> 남은 제한 시간 (초)"""
+        now = time.monotonic()
+        with self._lock:
+            clock = self._job_clocks.setdefault(input_file, [0.0, 0, now])
+            if clock[1] == 0:
+                clock[2] = now
+            clock[1] += 1
+            return self.job_timeout - clock[0] - (now - clock[2])
+
+    def _stop_clock(self, input_file):
+        """작업의 gs 하나 끝남 (실행 중인 gs가 없으면 시계를 멈춤)"""
+        now = time.monotonic()
+        with self._lock:
+            clock = self._job_clocks.get(input_file)
+            if clock is None:
+                return
+            clock[1] -= 1
+            if clock[1] == 0:
+                clock[0] += now - clock[2]
+
+    def run_ghostscript(self, command, input_file=None, track_pages=True, exact_count=False):
+        """
+        gs 프로세스 하나 실행 (작업 스레드에서 호출)
+        - 동시 실행 수 제한을 지키고, 취소할 수 있도록 프로세스를 등록
+        - input_file이 주어지면 자원 사용량을 해당 작업의 측정값에 합산
+        - 페이지 진행을 추적할 때는 -dQUIET 없이 실행하고 출력을 줄 단위로 읽음
+          (exact_count: gs가 알려준 페이지 범위로 쪽수 보정)
+        - input_file의 작업 제한 시간(job_timeout)이 지나면 gs를 종료하고, gs마다 CPU/주소 공간 상한 적용
+          (제한 시간은 자리를 기다린 시간을 빼고 그 작업의 gs가 실행 중인 시간만 셈)
+          (제한에 걸려 실패하면 details[input_file]["limit"]에 종류를 기록)
+        - 취소되면 False, 실패하면 RuntimeError
+        """
+        streaming = self.tracker is not None and input_file is not None and track_pages
+        if streaming:
+            command = [argument for argument in command if argument != "-dQUIET"]
+
+        timed_out = threading.Event()
+        with self._slots:
+            if self.cancelled:
+                return False
+            timed = bool(self.job_timeout and input_file is not None)
+            remaining = self._start_clock(input_file) if timed else None
+            try:
+                if timed and remaining <= 0:
+                    self.set_detail(input_file, "limit", "timeout")
+                    raise RuntimeError(f"자원 제한 초과: {pdf_limits.LIMIT_NAMES['timeout']}")
+                process = MeasuredPopen(
+                    command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT if streaming else subprocess.PIPE,
+                    text=True,
+                    preexec_fn=self._preexec
+                )
+                with self._lock:
+                    self._processes.add(process)
+                timer = None
+                # 스트리밍할 때는 stderr를 stdout으로 합쳐 읽으므로 output에 모두 들어 있음
+                stdout = ""
+                if timed:
+                    def expire():
+                        timed_out.set()
+                        try:
+                            process.kill()
+                        except OSError:
+                            pass
+                    timer = threading.Timer(remaining, expire)
+                    timer.daemon = True
+                    timer.start()
+                try:
+                    # 등록 직전에 취소된 경우 대비
+                    if self.cancelled:
+                        process.kill()
+                    if streaming:
+                        output = self._stream_pages(process, input_file, exact_count)
+                    else:
+                        stdout, output = process.communicate()
+                finally:
+                    if timer is not None:
+                        timer.cancel()
+                    with self._lock:
+                        self._processes.discard(process)
+            finally:
+                if timed:
+                    self._stop_clock(input_file)
+
+        if input_file is not None:
+            self._record_usage(input_file, process)
+
+        if self.cancelled:
+            return False
+
+        if process.returncode != 0:
+            limit = pdf_limits.classify_failure(
+                process.returncode, output + stdout, timed_out.is_set(), self.cpu_limit, self.address_space_limit,
+                _cpu_used(process)
+            )
+            if limit is not None and input_file is not None:
+                self.set_detail(input_file, "limit", limit)
+                raise RuntimeError(f"자원 제한 초과: {pdf_limits.LIMIT_NAMES[limit]}")
+            raise RuntimeError(f"Ghostscript 오류: {output}")
+
+        return True
+
+    def _stream_pages(self, process, input_file, exact_count):
+        """gs 출력을 읽으며 페이지 진행 집계 (페이지 줄을 제외한 출력을 반환)"""
+        messages = []
+        for line in process.stdout:
+            line = line.rstrip("\n")
+            parsed = pdf_progress.parse_output_line(line)
+            if parsed is None:
+                messages.append(line)
+                continue
+            kind, value = parsed
+            if kind == "range":
+                if exact_count:
+                    self.tracker.set_count(input_file, value)
+                continue
+            self.tracker.page_started(input_file)
+            if self.tracker.should_report() and not self.cancelled:
+                self.events.put(("pages",) + self.tracker.snapshot())
+        process.wait()
+        return "\n".join(messages)
@@ -0,0 +1,267 @@
+"""
+상주 Ghostscript 인터프리터
+- 작은 파일이 수천 개일 때는 gs 시작(폰트, 리소스 초기화) 비용이 압축 시간보다 큼
+- gs를 표준 입력(-)으로 PostScript를 받는 모드로 띄워 두고 작업을 하나씩 보냄
+- 작업마다 /OutputFile을 바꿔 출력 파일을 닫고, 완료/실패 표시 줄로 결과를 확인
+- 작업은 save/restore와 stopped로 감싸 한 파일의 오류나 바꾼 상태(정의, 그래픽 상태 등)가
+  다음 작업에 영향을 주지 않도록 함
+- 프로세스가 죽으면 해당 작업은 실패로 처리하고 다음 작업에서 자동으로 다시 시작
+- 작업이 job_timeout(초) 안에 끝나지 않으면 프로세스를 종료하고 TimeoutError (다음 작업에서 다시 시작)
+- 보안을 위해 -dSAFER로 실행하고, 파일 접근은 인터프리터 전용 임시 폴더로 제한
+"""
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+# 메모리 누수에 대비해 이만큼 처리하면 인터프리터를 새로 시작
+MAX_JOBS_PER_PROCESS = 500
+# 작업 제한 시간을 주지 않았을 때 멈춘 것으로 보는 시간 (초, 상주 모드는 작은 파일용)
+DEFAULT_JOB_TIMEOUT = 600.0
+
+# save ... restore: 작업이 바꾼 VM 상태를 되돌림
+# stopped 뒤 스택: save mark (작업이 남긴 값...) 결과 -> 결과만 남기고 정리한 뒤 restore
+JOB_TEMPLATE = """save mark {{ << /OutputFile ({output}) >> setpagedevice ({input}) run }} stopped
+<< /OutputFile ({sink}) >> setpagedevice
+counttomark 1 roll counttomark 1 sub {{ pop }} repeat exch pop exch restore
+{{ (%%PDFJOB {job} FAIL) }} {{ (%%PDFJOB {job} DONE) }} ifelse = flush
+clear cleardictstack
+"""
+
+
+def ps_string(text):
+    """PostScript 문자열 리터럴 안에 넣을 수 있도록 이스케이프"""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _expose(source, target):
+    """입력 파일을 임시 폴더에 연결 (하드링크 -> 심볼릭 링크 -> 복사 순으로 시도)"""
+    try:
+        os.link(source, target)
+        return
+    except OSError:
+        pass
+    try:
+        os.symlink(os.path.abspath(source), target)
+        return
+    except (OSError, NotImplementedError):
+        pass
+    shutil.copyfile(source, target)
+
+
+class PersistentGhostscript:
+    """
+    상주 gs 프로세스 하나
+    - compress(): 한 번에 하나의 작업만 처리 (InterpreterPool이 동시 사용을 막음)
+    - 출력은 읽기 스레드가 줄 단위로 큐에 넣고, compress()는 제한 시간 안에서만 기다림
+    """
+    def __init__(self, ghostscript_path, compression, max_jobs=MAX_JOBS_PER_PROCESS, job_timeout=None,
+                 preexec_fn=None):
+        self.ghostscript_path = ghostscript_path
+        self.compression = compression
+        self.max_jobs = max_jobs
+        self.job_timeout = job_timeout or DEFAULT_JOB_TIMEOUT
+        self.preexec_fn = preexec_fn
+        self.process = None
+        self._lines = None
+        self.jobs_done = 0
+        self.job_id = 0
+        self.scratch = tempfile.mkdtemp(prefix="pdf_gs_")
+        self.sink = os.path.join(self.scratch, "sink.pdf")
+
+    def command(self):
+        return [
+            self.ghostscript_path,
+            "-q",
+            "-dNOPAUSE",
+            "-dSAFER",
+            f"--permit-file-all={self.scratch}{os.sep}",
+            "-sDEVICE=pdfwrite",
+            "-dCompatibilityLevel=1.4",
+            f"-dPDFSETTINGS={self.compression}",
+            f"-sOutputFile={self.sink}",
+            "-"
+        ]
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        self.process = subprocess.Popen(
+            self.command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            preexec_fn=self.preexec_fn
+        )
+        self.jobs_done = 0
+        # 프로세스마다 새 큐 (이전 프로세스의 읽기 스레드는 EOF에서 끝남)
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_output, args=(self.process, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _read_output(process, lines):
+        try:
+            for line in process.stdout:
+                lines.put(line.rstrip("\n"))
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def kill(self):
+        """프로세스 강제 종료 (취소 또는 오류 시)"""
+        if self.process is not None:
+            try:
+                self.process.kill()
+            except OSError:
+                pass
+            self.process.wait()
+            self.process = None
+
+    def close(self):
+        """프로세스를 정상 종료하고 임시 폴더 삭제"""
+        if self.alive:
+            try:
+                self.process.stdin.write("quit\n")
+                self.process.stdin.close()
+                self.process.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+    def _wait_for(self, job):
+        """
+        완료 표시 줄까지 출력 읽기 -> (상태, 메시지)
+        - 프로세스가 죽으면 상태는 None, 제한 시간이 지나면 "TIMEOUT"
+        """
+        messages = []
+        done, fail = f"%%PDFJOB {job} DONE", f"%%PDFJOB {job} FAIL"
+        deadline = time.monotonic() + self.job_timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return "TIMEOUT", "\n".join(messages)
+            if line is None:
+                break
+            if line == done:
+                return "DONE", "\n".join(messages)
+            if line == fail:
+                return "FAIL", "\n".join(messages)
+            messages.append(line)
+        return None, "\n".join(messages)
+
+    def compress(self, input_file, output_file):
+        """작업 하나 처리 (실패 시 RuntimeError, 제한 시간 초과 시 TimeoutError)"""
+        if not self.alive or self.jobs_done >= self.max_jobs:
+            self.kill()
+            self.start()
+
+        self.job_id += 1
+        scratch_input = os.path.join(self.scratch, f"in_{self.job_id}.pdf")
+        scratch_output = os.path.join(self.scratch, f"out_{self.job_id}.pdf")
+        _expose(input_file, scratch_input)
+        try:
+            program = JOB_TEMPLATE.format(
+                output=ps_string(scratch_output),
+                input=ps_string(scratch_input),
+                sink=ps_string(self.sink),
+                job=self.job_id
+            )
+            try:
+                self.process.stdin.write(program)
+                self.process.stdin.flush()
+                status, messages = self._wait_for(self.job_id)
+            except (OSError, ValueError):
+                status, messages = None, ""
+        finally:
+            os.remove(scratch_input)
+
+        self.jobs_done += 1
+        if status != "DONE":
+            if os.path.exists(scratch_output):
+                os.remove(scratch_output)
+            if status is None:
+                # 프로세스가 죽었으면 다음 작업에서 새로 시작
+                self.kill()
+                raise RuntimeError(f"Ghostscript 인터프리터가 비정상 종료되었습니다: {messages}")
+            if status == "TIMEOUT":
+                # 멈춘 인터프리터는 종료하고 다음 작업에서 새로 시작
+                self.kill()
+                raise TimeoutError(f"{self.job_timeout:g}초 안에 끝나지 않았습니다.")
+            raise RuntimeError(f"Ghostscript 오류: {messages}")
+
+        if not os.path.exists(scratch_output):
+            raise RuntimeError("출력 파일이 생성되지 않았습니다.")
+        shutil.move(scratch_output, output_file)
+        return True
+
+
+class InterpreterPool:
+    """
+    상주 gs 인터프리터 풀
+    - 필요할 때 하나씩 띄우며 최대 size개까지 유지
+    - 여러 작업 스레드가 compress()를 동시에 호출할 수 있음
+    - job_timeout: 작업 하나의 제한 시간 (초, 없으면 DEFAULT_JOB_TIMEOUT)
+    - preexec_fn: 인터프리터 프로세스에 적용할 자원 제한 (pdf_limits.limit_preexec)
+    """
+    def __init__(self, ghostscript_path, compression, size, job_timeout=None, preexec_fn=None):
+        self.ghostscript_path = ghostscript_path
+        self.compression = compression
+        self.size = max(1, size)
+        self.job_timeout = job_timeout
+        self.preexec_fn = preexec_fn
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                interpreter = PersistentGhostscript(self.ghostscript_path, self.compression,
+                                                    job_timeout=self.job_timeout, preexec_fn=self.preexec_fn)
+                self._all.append(interpreter)
+                return interpreter
+        return self._idle.get()
+
+    def compress(self, input_file, output_file):
+        if self._closed:
+            return False
+        interpreter = self._acquire()
+        try:
+            return interpreter.compress(input_file, output_file)
+        finally:
+            self._idle.put(interpreter)
+
+    def kill_all(self):
+        """취소 시 실행 중인 모든 인터프리터 종료"""
+        self._closed = True
+        with self._lock:
+            interpreters = list(self._all)
+        for interpreter in interpreters:
+            process = interpreter.process
+            if process is None:
+                continue
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    def close(self):
+        with self._lock:
+            interpreters = list(self._all)
+            self._all = []
+        for interpreter in interpreters:
+            interpreter.close()
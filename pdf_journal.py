@@ -0,0 +1,136 @@
+"""
+작업 저널 (SQLite)
+- 배치마다 압축 설정과 파일별 상태(queued, running, done, failed)를 기록
+- 상태가 바뀔 때마다 바로 커밋하므로 프로그램이나 컴퓨터가 중간에 꺼져도 어디까지 했는지 남음
+  (WAL 모드 + synchronous=FULL, 커밋이 끝난 기록은 전원이 꺼져도 유지됨)
+- 이어하기: 마지막 배치에서 끝나지 않은 파일(queued, 꺼질 때 running이던 파일)만 다시 실행하고,
+  원하면 실패한 파일도 다시 시도
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+JOURNAL_NAME = "journal.sqlite3"
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    settings TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    seq INTEGER NOT NULL,
+    input TEXT NOT NULL,
+    output TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL,
+    PRIMARY KEY (run_id, input)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (run_id, status);
+"""
+
+
+def default_journal_path():
+    """운영체제별 기본 저널 파일 경로"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, 'pdf_compressor', JOURNAL_NAME)
+
+
+class JobJournal:
+    """
+    SQLite 작업 저널 (여러 작업 스레드에서 함께 사용할 수 있음)
+    - start_run(): 새 배치 기록
+    - latest_run(): 가장 최근 배치 (이어하기용)
+    """
+    def __init__(self, path=None):
+        self.path = path or default_journal_path()
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def _execute(self, sql, parameters=()):
+        with self._lock, self._conn:
+            return self._conn.execute(sql, parameters).fetchall()
+
+    def start_run(self, settings, jobs):
+        """
+        새 배치 기록
+        - settings: 압축 설정 딕셔너리 (JSON으로 저장, 이어하기에서 그대로 사용)
+        - jobs: [(입력 파일, 출력 파일), ...] (다른 폴더에서 이어할 수 있도록 절대 경로로 저장)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (created, settings) VALUES (?, ?)",
+                (now, json.dumps(settings, ensure_ascii=False))
+            )
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO jobs (run_id, seq, input, output, status, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                ((run_id, seq, os.path.abspath(input_file), os.path.abspath(output_file), QUEUED, now)
+                 for seq, (input_file, output_file) in enumerate(jobs))
+            )
+        return JournalRun(self, run_id, settings, now)
+
+    def latest_run(self):
+        """가장 최근 배치 (없으면 None)"""
+        rows = self._execute("SELECT id, settings, created FROM runs ORDER BY id DESC LIMIT 1")
+        if not rows:
+            return None
+        run_id, settings, created = rows[0]
+        return JournalRun(self, run_id, json.loads(settings), created)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JournalRun:
+    """저널에 기록된 배치 하나"""
+    def __init__(self, journal, run_id, settings, created):
+        self.journal = journal
+        self.id = run_id
+        self.settings = settings
+        self.created = created
+
+    def mark(self, input_file, status, error=None):
+        """파일 상태 기록 (running이면 시도 횟수 증가)"""
+        self.journal._execute(
+            "UPDATE jobs SET status = ?, error = ?, attempts = attempts + ?, updated = ? "
+            "WHERE run_id = ? AND input = ?",
+            (status, error, 1 if status == RUNNING else 0, time.time(), self.id, os.path.abspath(input_file))
+        )
+
+    def pending(self, retry_failed=False):
+        """다시 실행할 작업 [(입력 파일, 출력 파일)] (원래 순서)"""
+        statuses = (QUEUED, RUNNING, FAILED) if retry_failed else (QUEUED, RUNNING)
+        placeholders = ", ".join("?" * len(statuses))
+        rows = self.journal._execute(
+            f"SELECT input, output FROM jobs WHERE run_id = ? AND status IN ({placeholders}) ORDER BY seq",
+            (self.id,) + statuses
+        )
+        return [(input_file, output_file) for input_file, output_file in rows]
+
+    def counts(self):
+        """상태별 파일 수"""
+        rows = self.journal._execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status", (self.id,)
+        )
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        counts.update(dict(rows))
+        return counts
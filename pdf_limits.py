@@ -0,0 +1,75 @@
+"""
+작업별 자원 제한
+- 작업마다 경과 시간 제한: 작업이 시작된 뒤 제한 시간이 지나면 그 작업의 gs 프로세스를 종료
+  (분할 조각, 목표 크기 후보 등 gs를 여러 번 실행하는 작업도 합쳐서 제한)
+- gs 프로세스마다 setrlimit으로 CPU 시간(RLIMIT_CPU)과 주소 공간(RLIMIT_AS) 상한
+  (손상되었거나 악의적인 PDF가 끝없이 돌거나 수십 GB를 쓰지 못하도록)
+- 제한에 걸린 작업은 대체 방법으로 한 번 더 처리 (CompressionBatch의 fallback 참고)
+  - "screen": 가장 가벼운 /screen 프리셋으로 다시 시도하고, 그것도 실패하면 원본 그대로 복사
+  - "passthrough": 원본 그대로 복사
+
+setrlimit은 POSIX에서만 적용되며 (Windows는 경과 시간 제한만), python/images 엔진은 프로세스를
+따로 띄우지 않으므로 제한하지 않습니다. 상주 인터프리터는 작업마다 경과 시간 제한을 적용하고
+(넘으면 인터프리터를 종료), 주소 공간 상한은 인터프리터 프로세스에 적용하며, 여러 작업이 한 프로세스의
+CPU 시간을 나눠 쓰므로 CPU 시간 상한과는 함께 쓸 수 없습니다.
+"""
+import signal
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 제한에 걸렸을 때의 대체 방법
+FALLBACKS = ("screen", "passthrough", "none")
+DEFAULT_FALLBACK = "screen"
+FALLBACK_PRESET = "/screen"
+# CPU 시간 상한을 넘은 뒤 강제 종료(SIGKILL)까지의 여유 (초)
+CPU_HARD_MARGIN = 5
+# 메모리 부족으로 실패했을 때 gs가 출력하는 문구
+MEMORY_ERROR_MARKERS = ("VMerror", "out of memory", "Out of memory", "Cannot allocate memory")
+
+# 제한 종류 -> 표시 이름
+LIMIT_NAMES = {
+    "timeout": "시간 초과",
+    "cpu": "CPU 시간 초과",
+    "memory": "메모리 상한 초과",
+}
+
+
+def limit_preexec(cpu_seconds=None, address_space=None):
+    """
+    자식 프로세스에서 exec 직전에 실행할 함수 (setrlimit 적용, 제한이 없거나 지원하지 않으면 None)
+    - fork 뒤에 실행되므로 setrlimit 외에는 아무것도 하지 않음
+    """
+    if resource is None or not (cpu_seconds or address_space):
+        return None
+    limits = []
+    if cpu_seconds:
+        limits.append((resource.RLIMIT_CPU, (int(cpu_seconds), int(cpu_seconds) + CPU_HARD_MARGIN)))
+    if address_space:
+        limits.append((resource.RLIMIT_AS, (int(address_space), int(address_space))))
+
+    def apply():
+        for kind, values in limits:
+            resource.setrlimit(kind, values)
+    return apply
+
+
+def classify_failure(returncode, output, timed_out, cpu_seconds=None, address_space=None, cpu_used=None):
+    """
+    gs가 실패한 이유가 자원 제한이면 "timeout"/"cpu"/"memory", 아니면 None
+    - SIGXCPU는 CPU 시간 상한(soft)에서만 오므로 바로 "cpu"
+    - SIGKILL은 OOM killer 등 다른 원인일 수 있으므로 실제 사용한 CPU 시간(cpu_used, 초)이
+      상한에 닿았을 때만 "cpu" (hard 상한)
+    """
+    if timed_out:
+        return "timeout"
+    if cpu_seconds and returncode == -getattr(signal, "SIGXCPU", 0):
+        return "cpu"
+    if (cpu_seconds and cpu_used is not None and cpu_used >= cpu_seconds
+            and returncode == -getattr(signal, "SIGKILL", 0)):
+        return "cpu"
+    if address_space and output and any(marker in output for marker in MEMORY_ERROR_MARKERS):
+        return "memory"
+    return None
@@ -0,0 +1,127 @@
+"""
+증분 폴더 모드용 매니페스트
+- 폴더마다 마지막으로 압축에 성공한 파일의 경로, 크기, 수정 시각, 설정을 기록
+- 다음 실행에서는 새 파일이나 바뀐 파일만 작업 목록에 넣음
+"""
+import json
+import os
+import threading
+
+MANIFEST_NAME = ".pdf_compressor_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def iter_pdf_files(folder):
+    """
+    폴더 아래의 PDF 파일을 (경로, stat) 형태로 하나씩 반환 (os.scandir 기반)
+    - 압축 결과물(_compressed.pdf)은 제외
+    """
+    stack = [folder]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif (entry.is_file() and entry.name.lower().endswith('.pdf')
+                              and not entry.name.endswith('_compressed.pdf')):
+                            yield entry.path, entry.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            # 권한이 없거나 사라진 폴더는 건너뜀
+            continue
+
+
+class FolderManifest:
+    """
+    폴더 단위 매니페스트 (<폴더>/.pdf_compressor_manifest.json)
+    - scan(): 새 파일/바뀐 파일과 변경 없는 파일을 구분
+    - record(): 압축에 성공한 파일 기록 (여러 스레드에서 호출 가능)
+    - save(): 임시 파일에 쓴 뒤 교체하여 원자적으로 저장
+    """
+    def __init__(self, folder):
+        self.folder = os.path.abspath(folder)
+        self.path = os.path.join(self.folder, MANIFEST_NAME)
+        self.entries = {}
+        self._scanned = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """저장된 매니페스트 읽기 (없거나 손상된 경우 빈 상태로 시작)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            self.entries = {}
+            return
+        self.entries = data.get("files", {})
+
+    def save(self):
+        """매니페스트를 원자적으로 저장"""
+        with self._lock:
+            data = {"version": MANIFEST_VERSION, "files": dict(self.entries)}
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+
+    def _key(self, path):
+        return os.path.relpath(os.path.abspath(path), self.folder)
+
+    def is_current(self, path, stat, settings):
+        """마지막 성공 이후 파일과 설정이 그대로인지 확인"""
+        entry = self.entries.get(self._key(path))
+        return (
+            entry is not None
+            and entry.get("size") == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("settings") == settings
+        )
+
+    def iter_scan(self, settings):
+        """
+        폴더를 훑으며 (경로, 처리 필요 여부)를 하나씩 반환
+        - settings: 압축 설정 딕셔너리 (예: {"compression": "/ebook"})
+        """
+        for path, stat in iter_pdf_files(self.folder):
+            if self.is_current(path, stat, settings):
+                yield path, False
+            else:
+                # 압축 도중 파일이 바뀌어도 다음 실행에서 다시 처리되도록 훑은 시점의 값을 기록
+                self._scanned[self._key(path)] = (stat.st_size, stat.st_mtime_ns)
+                yield path, True
+
+    def scan(self, settings):
+        """폴더를 훑어 (처리할 파일 목록, 건너뛴 파일 목록) 반환"""
+        changed = []
+        unchanged = []
+        for path, needs_work in self.iter_scan(settings):
+            (changed if needs_work else unchanged).append(path)
+        return changed, unchanged
+
+    def record(self, path, settings, stat=None):
+        """압축에 성공한 파일 기록 (stat: 압축을 시작할 때의 파일 정보)"""
+        key = self._key(path)
+        scanned = self._scanned.pop(key, None)
+        if stat is not None:
+            scanned = (stat.st_size, stat.st_mtime_ns)
+        elif scanned is None:
+            stat = os.stat(path)
+            scanned = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            self.entries[key] = {"size": scanned[0], "mtime_ns": scanned[1], "settings": settings}
+
+    def contains(self, path):
+        """이 매니페스트의 폴더 아래에 있는 파일인지 확인"""
+        try:
+            return not self._key(path).startswith(os.pardir)
+        except ValueError:
+            # Windows에서 드라이브가 다른 경우
+            return False
@@ -0,0 +1,229 @@
+"""
+작업별 측정값 (telemetry)
+- gs 자식 프로세스마다 os.wait4로 CPU 시간과 최대 메모리(RSS)를 정확히 수집
+  (여러 작업이 동시에 실행되므로 RUSAGE_CHILDREN 차이값은 다른 작업과 섞임)
+- 작업이 끝날 때마다 JSONL 로그에 한 줄씩 기록
+- 프리셋별 히스토그램을 집계하여 Prometheus 텍스트 형식 파일로 저장
+  (node_exporter textfile collector 등에서 그대로 읽을 수 있음)
+"""
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 히스토그램 구간 상한
+WALL_SECONDS_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+CPU_SECONDS_BUCKETS = WALL_SECONDS_BUCKETS
+RSS_BYTES_BUCKETS = tuple(mb * 1024 * 1024 for mb in (16, 32, 64, 128, 256, 512, 1024, 2048, 4096))
+INPUT_BYTES_BUCKETS = tuple(mb * 1024 * 1024 for mb in (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1024))
+RATIO_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+# Prometheus 파일을 다시 쓰는 최소 간격 (초)
+PROMETHEUS_INTERVAL = 5
+
+
+class MeasuredPopen(subprocess.Popen):
+    """
+    종료 시 자원 사용량(rusage)을 함께 수집하는 Popen
+    - wait()/communicate()로 종료를 기다리면 rusage 속성에 결과가 남음
+      (시간 제한 없이 기다릴 때 os.wait4(pid, 0)으로 직접 거둠)
+    - os.wait4가 없는 환경(Windows)이나 다른 스레드의 poll()이 먼저 거둔 경우 rusage가 None
+    """
+    rusage = None
+
+    def wait(self, timeout=None):
+        if timeout is None and self.returncode is None and hasattr(os, "wait4"):
+            try:
+                _, status, self.rusage = os.wait4(self.pid, 0)
+            except ChildProcessError:
+                # 이미 거둔 프로세스 -> 기본 wait()가 returncode를 정함
+                pass
+            else:
+                if os.WIFSIGNALED(status):
+                    self.returncode = -os.WTERMSIG(status)
+                else:
+                    self.returncode = os.WEXITSTATUS(status)
+        return super().wait(timeout)
+
+
+def maxrss_bytes(rusage):
+    """ru_maxrss를 바이트로 변환 (Linux는 KB, macOS는 바이트 단위)"""
+    return rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def current_rss_bytes():
+    """현재 프로세스의 RSS (바이트, /proc이 없는 환경에서는 지금까지의 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return 0
+    return maxrss_bytes(resource.getrusage(resource.RUSAGE_SELF))
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """레이블별 누적 히스토그램"""
+    def __init__(self, name, help_text, buckets, label_names=("preset",)):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.label_names = label_names
+        self.series = {}
+
+    def observe(self, labels, value):
+        counts, total = self.series.get(labels, ([0] * len(self.buckets), 0.0))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        self.series[labels] = (counts, total + value)
+
+    def summary(self):
+        """{레이블 문자열: {"buckets": {상한: 누적 개수}, "sum", "count"}}"""
+        result = {}
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                buckets[_format_value(bound)] = cumulative
+            result[",".join(map(str, labels))] = {"buckets": buckets, "sum": total, "count": cumulative}
+        return result
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """레이블별 누적 카운터"""
+    def __init__(self, name, help_text, label_names=("preset",)):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series = {}
+
+    def inc(self, labels, value=1):
+        self.series[labels] = self.series.get(labels, 0) + value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.series.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsLog:
+    """
+    작업별 측정값 기록기 (여러 작업 스레드에서 record() 호출)
+    - jsonl_path: 작업마다 한 줄씩 추가하는 JSONL 로그
+    - prometheus_path: 집계값을 Prometheus 텍스트 형식으로 저장 (임시 파일에 쓴 뒤 교체)
+    """
+    def __init__(self, jsonl_path=None, prometheus_path=None):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self._lock = threading.Lock()
+        self._log = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+        self._last_write = 0.0
+
+        self.jobs = Counter("pdf_jobs_total", "완료된 작업 수", ("preset", "status"))
+        self.input_bytes = Counter("pdf_input_bytes_total", "처리한 입력 바이트 수")
+        self.output_bytes = Counter("pdf_output_bytes_total", "생성한 출력 바이트 수")
+        self.cpu_seconds = Counter("pdf_gs_cpu_seconds_total", "Ghostscript 자식 프로세스 CPU 시간")
+        self.histograms = [
+            Histogram("pdf_job_wall_seconds", "작업별 경과 시간", WALL_SECONDS_BUCKETS),
+            Histogram("pdf_job_cpu_seconds", "작업별 Ghostscript CPU 시간", CPU_SECONDS_BUCKETS),
+            Histogram("pdf_job_peak_rss_bytes", "작업별 Ghostscript 최대 메모리", RSS_BYTES_BUCKETS),
+            Histogram("pdf_job_input_bytes", "작업별 입력 크기", INPUT_BYTES_BUCKETS),
+            Histogram("pdf_job_ratio", "작업별 압축률 (출력/입력)", RATIO_BUCKETS),
+        ]
+
+    def record(self, job):
+        """작업 하나의 측정값 기록"""
+        preset = (job.get("preset"),)
+        values = (
+            job.get("wall_seconds"),
+            job.get("cpu_seconds"),
+            job.get("peak_rss_bytes"),
+            job.get("input_bytes"),
+            job.get("ratio"),
+        )
+        with self._lock:
+            if self._log is not None:
+                self._log.write(json.dumps(job, ensure_ascii=False) + "\n")
+                self._log.flush()
+            self.jobs.inc((job.get("preset"), job.get("status")))
+            if job.get("status") == "ok":
+                self.input_bytes.inc(preset, job.get("input_bytes") or 0)
+                self.output_bytes.inc(preset, job.get("output_bytes") or 0)
+            if job.get("cpu_seconds") is not None:
+                self.cpu_seconds.inc(preset, job["cpu_seconds"])
+            for histogram, value in zip(self.histograms, values):
+                if value is not None:
+                    histogram.observe(preset, value)
+
+            now = time.monotonic()
+            if self.prometheus_path and now - self._last_write >= PROMETHEUS_INTERVAL:
+                self._last_write = now
+                self._write_prometheus()
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        for metric in [self.jobs, self.input_bytes, self.output_bytes, self.cpu_seconds] + self.histograms:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """히스토그램 집계 (JSON 출력용)"""
+        with self._lock:
+            return {histogram.name: histogram.summary() for histogram in self.histograms}
+
+    def _write_prometheus(self):
+        temp_path = f"{self.prometheus_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temp_path, self.prometheus_path)
+
+    def close(self):
+        """마지막 집계 저장 및 로그 닫기"""
+        with self._lock:
+            if self.prometheus_path:
+                self._write_prometheus()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
@@ -0,0 +1,103 @@
+"""
+파이프 모드 (입출력 임시 파일 없이 압축)
+- 입력 PDF 바이트를 gs 표준 입력(-)으로 보내고, -sOutputFile=-로 표준 출력에 쓴 결과를 버퍼로 읽음
+- 결과가 spill_bytes를 넘으면 자동으로 임시 파일로 넘김 (SpooledTemporaryFile)
+- gs의 PostScript 출력(-sstdout)은 표준 오류로 돌려 결과 PDF에 섞이지 않도록 함
+- 입력을 보내는 일과 오류를 읽는 일은 스레드로 처리하여 파이프 버퍼가 차서 서로 기다리는 일이 없음
+
+PDF는 임의 접근이 필요하므로 gs가 표준 입력을 내부적으로 모아서 처리할 수 있습니다.
+이 모드가 없애는 것은 호출하는 쪽의 입력/출력 파일 왕복입니다.
+"""
+import shutil
+import tempfile
+import threading
+
+# 결과를 메모리에 두는 최대 크기 (넘으면 임시 파일로 넘어감, 바이트)
+SPILL_BYTES = 64 * 1024 * 1024
+# 파이프로 주고받는 조각 크기 (바이트)
+PIPE_CHUNK_BYTES = 1024 * 1024
+# gs 명령에 추가하는 인수 (PostScript 출력을 표준 오류로)
+PIPE_ARGS = ["-sstdout=%stderr"]
+
+
+def spool(spill_bytes=SPILL_BYTES):
+    """결과를 받을 버퍼 (spill_bytes를 넘으면 디스크)"""
+    return tempfile.SpooledTemporaryFile(max_size=spill_bytes)
+
+
+def source_size(source):
+    """입력 크기 (bytes이거나 되감을 수 있는 파일 객체, 알 수 없으면 None)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    try:
+        position = source.tell()
+        end = source.seek(0, 2)
+        source.seek(position)
+        return end - position
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def communicate(process, source, sink, chunk_bytes=PIPE_CHUNK_BYTES):
+    """
+    source를 프로세스 표준 입력으로 보내면서 표준 출력을 sink에 씀 (프로세스가 끝날 때까지 대기)
+    - process: stdin/stdout/stderr가 모두 PIPE인 바이너리 모드 Popen
+    - source: bytes 또는 바이너리 파일 객체 (현재 위치부터 끝까지)
+    - 반환값: 표준 오류 문자열
+    """
+    errors = []
+
+    def feed():
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                view = memoryview(source)
+                for offset in range(0, len(view), chunk_bytes):
+                    process.stdin.write(view[offset:offset + chunk_bytes])
+            else:
+                shutil.copyfileobj(source, process.stdin, chunk_bytes)
+        except OSError:
+            # gs가 입력을 다 읽기 전에 끝남 (결과는 반환 코드로 판단)
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def drain_errors():
+        errors.append(process.stderr.read())
+
+    threads = [threading.Thread(target=feed, daemon=True), threading.Thread(target=drain_errors, daemon=True)]
+    for thread in threads:
+        thread.start()
+    while True:
+        data = process.stdout.read(chunk_bytes)
+        if not data:
+            break
+        sink.write(data)
+    for thread in threads:
+        thread.join()
+    process.wait()
+    return (errors[0] if errors else b"").decode("utf-8", "replace")
+
+
+def keep_smaller(source, sink, size, start=0):
+    """
+    결과(sink)가 원본(size 바이트)보다 크거나 같으면 원본으로 바꿈 (바꿨으면 True)
+    - source가 파일 객체면 start 위치로 되감아 다시 읽음 (되감을 수 없으면 바꾸지 않음)
+    """
+    sink.seek(0, 2)
+    if size is None or sink.tell() < size:
+        return False
+    if not isinstance(source, (bytes, bytearray, memoryview)):
+        try:
+            source.seek(start)
+        except (AttributeError, OSError, ValueError):
+            return False
+    sink.seek(0)
+    sink.truncate()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        sink.write(source)
+    else:
+        shutil.copyfileobj(source, sink, PIPE_CHUNK_BYTES)
+    return True
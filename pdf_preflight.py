@@ -0,0 +1,172 @@
+"""
+사전 분석 (pre-flight)
+- PyPDF2로 이미지 XObject의 크기, 픽셀 수, 필터와 콘텐츠 스트림 압축 여부를 빠르게 집계
+- 집계 결과로 Ghostscript 압축 후 예상 절감률을 추정
+- 예상 절감률이 기준보다 낮은 파일(텍스트 위주, 이미 최적화된 파일)은 gs 실행을 생략할 수 있음
+
+추정치는 대략적인 값이며, 실제 결과가 원본보다 크면 엔진이 원본으로 되돌립니다.
+"""
+import os
+
+# 프리셋별 이미지 다운샘플링 해상도 (Ghostscript 기본값)
+PRESET_DPI = {
+    "/prepress": 300,
+    "/printer": 300,
+    "/ebook": 150,
+    "/screen": 72,
+}
+
+# 이미 JPEG인 이미지를 프리셋 품질로 다시 압축했을 때의 크기 비율
+JPEG_RECOMPRESS_RATIO = {
+    "/prepress": 1.0,
+    "/printer": 0.9,
+    "/ebook": 0.8,
+    "/screen": 0.6,
+}
+
+# 무손실 이미지를 JPEG로 바꿨을 때 원시 픽셀 데이터 대비 크기 비율
+JPEG_RAW_RATIO = 0.1
+# 압축되지 않은 콘텐츠 스트림을 Flate로 압축했을 때의 크기 비율
+FLATE_RATIO = 0.3
+# Ghostscript가 다운샘플링하는 기준 (목표 해상도의 1.5배 초과)
+DOWNSAMPLE_THRESHOLD = 1.5
+
+LOSSY_FILTERS = {"/DCTDecode", "/JPXDecode"}
+BILEVEL_FILTERS = {"/CCITTFaxDecode", "/JBIG2Decode"}
+MAX_FORM_DEPTH = 5
+
+
+def _require_pypdf2():
+    try:
+        import PyPDF2
+    except ImportError:
+        raise RuntimeError(
+            "사전 분석에는 PyPDF2 라이브러리가 필요합니다.\n"
+            "'pip install PyPDF2'를 실행하여 설치해주세요."
+        )
+    return PyPDF2
+
+
+def _filters(stream):
+    value = stream.get("/Filter")
+    if value is None:
+        return []
+    value = value.get_object() if hasattr(value, "get_object") else value
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def _stream_length(stream):
+    data = getattr(stream, "_data", None)
+    if data is not None:
+        return len(data)
+    length = stream.get("/Length", 0)
+    return int(length.get_object() if hasattr(length, "get_object") else length)
+
+
+def _components(image):
+    color_space = image.get("/ColorSpace")
+    if color_space is None:
+        return 1
+    color_space = color_space.get_object() if hasattr(color_space, "get_object") else color_space
+    name = str(color_space[0] if isinstance(color_space, list) else color_space)
+    return {"/DeviceRGB": 3, "/CalRGB": 3, "/Lab": 3, "/DeviceCMYK": 4, "/ICCBased": 3}.get(name, 1)
+
+
+def analyze(input_file):
+    """
+    PDF 구조 집계
+    - images: 이미지별 {bytes, width, height, components, bits, filters, dpi}
+    - content_bytes / uncompressed_content_bytes: 페이지 콘텐츠 스트림 크기
+    """
+    PyPDF2 = _require_pypdf2()
+    reader = PyPDF2.PdfReader(input_file)
+    result = {
+        "file_bytes": os.path.getsize(input_file),
+        "pages": len(reader.pages),
+        "images": [],
+        "content_bytes": 0,
+        "uncompressed_content_bytes": 0,
+    }
+    seen = set()
+
+    def visit_resources(resources, page_width_in, depth):
+        if resources is None or depth > MAX_FORM_DEPTH:
+            return
+        resources = resources.get_object()
+        xobjects = resources.get("/XObject")
+        if xobjects is None:
+            return
+        for ref in xobjects.get_object().values():
+            key = getattr(ref, "idnum", None)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            xobject = ref.get_object()
+            subtype = xobject.get("/Subtype")
+            if subtype == "/Image":
+                width = int(xobject.get("/Width", 0))
+                result["images"].append({
+                    "bytes": _stream_length(xobject),
+                    "width": width,
+                    "height": int(xobject.get("/Height", 0)),
+                    "components": _components(xobject),
+                    "bits": int(xobject.get("/BitsPerComponent", 8)),
+                    "filters": _filters(xobject),
+                    # 이미지가 페이지 너비를 채운다고 가정한 대략적인 해상도
+                    "dpi": width / page_width_in if page_width_in else 0,
+                })
+            elif subtype == "/Form":
+                visit_content(xobject)
+                visit_resources(xobject.get("/Resources"), page_width_in, depth + 1)
+
+    def visit_content(stream):
+        length = _stream_length(stream)
+        result["content_bytes"] += length
+        if not _filters(stream):
+            result["uncompressed_content_bytes"] += length
+
+    for page in reader.pages:
+        box = page.mediabox
+        page_width_in = float(box.width) / 72 if box.width else 0
+        contents = page.get("/Contents")
+        if contents is not None:
+            contents = contents.get_object()
+            for stream in (contents if isinstance(contents, list) else [contents]):
+                visit_content(stream.get_object())
+        visit_resources(page.get("/Resources"), page_width_in, 0)
+
+    result["image_bytes"] = sum(image["bytes"] for image in result["images"])
+    result["image_pixels"] = sum(image["width"] * image["height"] for image in result["images"])
+    return result
+
+
+def estimate_image_bytes(image, compression):
+    """프리셋 적용 후 이미지 크기 추정"""
+    target_dpi = PRESET_DPI.get(compression, 150)
+    scale = 1.0
+    if image["dpi"] > target_dpi * DOWNSAMPLE_THRESHOLD:
+        scale = (target_dpi / image["dpi"]) ** 2
+
+    filters = set(image["filters"])
+    if filters & BILEVEL_FILTERS or image["bits"] == 1:
+        # 흑백 이미지는 거의 그대로 유지됨
+        return image["bytes"] * max(scale, 0.5)
+    if filters & LOSSY_FILTERS:
+        return image["bytes"] * scale * JPEG_RECOMPRESS_RATIO.get(compression, 0.8)
+    # 무손실 이미지는 JPEG로 다시 압축됨
+    raw = image["width"] * image["height"] * image["components"] * image["bits"] / 8
+    return min(image["bytes"], raw * scale * JPEG_RAW_RATIO)
+
+
+def estimate_savings(analysis, compression):
+    """예상 절감률 (0.0 ~ 1.0)"""
+    file_bytes = analysis["file_bytes"]
+    if not file_bytes:
+        return 0.0
+    estimated_images = sum(estimate_image_bytes(image, compression) for image in analysis["images"])
+    saved = (analysis["image_bytes"] - estimated_images
+             + analysis["uncompressed_content_bytes"] * (1 - FLATE_RATIO))
+    return max(0.0, min(1.0, saved / file_bytes))
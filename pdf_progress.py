@@ -0,0 +1,143 @@
+"""
+페이지 단위 진행 상황
+- -dQUIET 없이 실행한 gs가 출력하는 "Page N" 줄로 페이지 처리 진행을 추적
+- 배치 시작 시에는 파일 크기로 페이지 수를 어림하고 (파일을 열지 않음), 파일마다 작업이 시작될 때
+  파일 앞/뒤 일부에서 읽은 값과 gs가 알려준 페이지 범위로 보정하여 전체 페이지 수, 초당 페이지 수, 남은 시간 계산
+"""
+import os
+import re
+import threading
+import time
+
+PAGE_LINE = re.compile(r"^Page (\d+)\s*$")
+RANGE_LINE = re.compile(r"^Processing pages (\d+) through (\d+)\.")
+COUNT_PATTERN = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b")
+
+# 페이지 수를 읽을 때 파일 앞/뒤에서 읽는 양
+PROBE_BYTES = 1024 * 1024
+# 진행 이벤트를 보내는 최소 간격 (초)
+REPORT_INTERVAL = 0.25
+# 페이지 수를 어림할 때 가정하는 페이지당 크기 (바이트)
+ESTIMATE_BYTES_PER_PAGE = 100 * 1024
+
+
+def quick_page_count(path):
+    """
+    페이지 수를 빠르게 읽기
+    - PyPDF2가 있으면 사용하고, 없으면 파일 앞/뒤 일부에서 /Pages 객체의 /Count 검색
+    - 알 수 없으면 None
+    """
+    try:
+        import PyPDF2
+        return len(PyPDF2.PdfReader(path).pages)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    return probe_page_count(path)
+
+
+def probe_page_count(path):
+    """
+    파일 앞/뒤 일부에서 /Pages 객체의 /Count를 찾아 페이지 수 추정 (파일 전체를 읽지 않음)
+    - 페이지 트리가 객체 스트림 안에 있으면 찾지 못함 (None)
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            head = f.read(PROBE_BYTES)
+            tail = b""
+            if size > PROBE_BYTES:
+                f.seek(max(PROBE_BYTES, size - PROBE_BYTES))
+                tail = f.read()
+    except OSError:
+        return None
+
+    counts = [int(a or b) for a, b in COUNT_PATTERN.findall(head + tail)]
+    # 페이지 트리의 루트가 가장 큰 /Count를 가짐
+    return max(counts) if counts else None
+
+
+def estimate_page_count(path):
+    """파일 크기로 어림한 페이지 수 (파일을 열지 않음, 읽을 수 없으면 None)"""
+    try:
+        return max(1, round(os.path.getsize(path) / ESTIMATE_BYTES_PER_PAGE))
+    except OSError:
+        return None
+
+
+def parse_output_line(line):
+    """gs 출력 한 줄 해석 -> ("page", N) / ("range", 페이지 수) / None"""
+    match = PAGE_LINE.match(line)
+    if match:
+        return "page", int(match.group(1))
+    match = RANGE_LINE.match(line)
+    if match:
+        return "range", int(match.group(2)) - int(match.group(1)) + 1
+    return None
+
+
+def format_duration(seconds):
+    """남은 시간 표시 (예: 1시간 5분, 3분 20초, 12초)"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}시간 {seconds % 3600 // 60}분"
+    if seconds >= 60:
+        return f"{seconds // 60}분 {seconds % 60}초"
+    return f"{seconds}초"
+
+
+class PageTracker:
+    """
+    배치 전체의 페이지 진행 집계 (여러 작업 스레드에서 호출)
+    - page_started(): gs가 페이지 하나를 시작할 때마다 호출 (그 앞 페이지는 끝난 것으로 봄)
+    - file_finished(): 파일이 끝나면 남은 페이지를 모두 완료로 처리
+    - page_counts는 어림값이어도 되고, set_count()로 보정한 파일은 is_known()이 True
+    """
+    def __init__(self, page_counts):
+        self.counts = {path: max(1, count or 1) for path, count in page_counts.items()}
+        self.known = set()
+        self.started = {}
+        self.done = {}
+        self.start_time = time.monotonic()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def set_count(self, path, count):
+        """읽은 페이지 수나 gs가 알려준 실제 페이지 수로 보정"""
+        with self._lock:
+            self.counts[path] = max(1, count)
+            self.known.add(path)
+
+    def is_known(self, path):
+        with self._lock:
+            return path in self.known
+
+    def page_started(self, path):
+        with self._lock:
+            started = self.started.get(path, 0) + 1
+            self.started[path] = started
+            self.done[path] = min(started - 1, self.counts.get(path, 1))
+
+    def file_finished(self, path):
+        with self._lock:
+            self.done[path] = self.counts.get(path, 1)
+
+    def should_report(self):
+        """진행 이벤트를 보낼 때가 되었는지 확인 (너무 자주 보내지 않도록)"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_report < REPORT_INTERVAL:
+                return False
+            self._last_report = now
+            return True
+
+    def snapshot(self):
+        """(완료 페이지, 전체 페이지, 초당 페이지, 남은 시간(초) 또는 None)"""
+        with self._lock:
+            done = sum(self.done.values())
+            total = sum(self.counts.values())
+        elapsed = time.monotonic() - self.start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        return done, total, rate, eta
@@ -0,0 +1,637 @@
+"""
+Python 압축 엔진 (Ghostscript 없음, PyPDF2)
+- 문서 루트(/Root, /Info)에서 참조되는 객체만 다시 씀 (쓰이지 않는 객체 제거)
+- 내용이 같은 객체와 스트림을 해시로 찾아 하나로 합침 (페이지 객체는 제외)
+- 압축되지 않았거나 약하게 압축된 스트림을 지정한 수준의 Flate로 다시 압축 (더 작아질 때만)
+- 스트림이 아닌 객체는 객체 스트림에 모아 압축하고 교차 참조 테이블도 스트림으로 저장 (PDF 1.5)
+
+이미지를 다시 샘플링하지 않는 무손실 방식이므로 품질 변화가 없고, gs로 문서 전체를
+다시 렌더링하지 않아 텍스트 위주 문서에서 훨씬 빠릅니다.
+
+스트리밍 모드 (memory_limit 지정, 수 GB 스캔 문서용):
+- 객체를 모두 메모리에 올리지 않고 두 번 읽음 (1단계: 참조 목록과 스트림 해시만 기록, 2단계: 하나씩 읽어서 바로 씀)
+- 다 쓴 객체는 PyPDF2 읽기 캐시에서 바로 지우고, 메모리가 상한에 가까워지면 캐시 전체를 비움
+- 큰 스트림의 재압축 결과와 교차 참조 항목은 임시 파일에 씀
+- 중복 제거는 스트림만 대상으로 한 번만 수행 (객체 전체를 보관해야 하는 반복 비교는 하지 않음)
+- 스트림 하나의 원본 데이터는 PyPDF2가 한 번에 읽으므로 상한은 가장 큰 스트림보다 커야 함
+"""
+import gc
+import hashlib
+import io
+import tempfile
+import time
+import zlib
+
+from pdf_metrics import current_rss_bytes
+
+# 출력 형식이 바뀌면 올려서 이전 캐시 항목을 무효화
+REWRITE_VERSION = 1
+DEFAULT_FLATE_LEVEL = 9
+# 객체 스트림 하나에 넣는 객체 수
+OBJECTS_PER_STREAM = 200
+# 중복 제거 반복 횟수 (하위 객체가 합쳐지면 상위 객체도 같아질 수 있음)
+MAX_DEDUP_PASSES = 4
+
+# 스트리밍 모드
+# 스트림 하나의 재압축 결과를 메모리에 두는 최대 크기 = 메모리 상한 / SPILL_SHARE (넘으면 임시 파일)
+SPILL_SHARE = 16
+# RSS가 메모리 상한의 이 비율을 넘으면 PyPDF2 읽기 캐시를 비움
+CACHE_SHARE = 0.5
+# 메모리 사용량을 확인하는 객체 간격
+CHECK_INTERVAL = 256
+# 스트림을 나눠서 압축/해제하는 단위 (바이트)
+CHUNK_BYTES = 1024 * 1024
+
+
+def _require_pypdf2():
+    try:
+        import PyPDF2
+    except ImportError:
+        raise RuntimeError(
+            "Python 압축 엔진에는 PyPDF2 라이브러리가 필요합니다.\n"
+            "'pip install PyPDF2'를 실행하여 설치해주세요."
+        )
+    return PyPDF2
+
+
+def engine_version():
+    """캐시 키에 넣을 엔진 버전 문자열"""
+    PyPDF2 = _require_pypdf2()
+    return f"pdf_rewrite/{REWRITE_VERSION} PyPDF2/{PyPDF2.__version__}"
+
+
+def _key(ref):
+    return ref.idnum, ref.generation
+
+
+def _is_page(obj, generic):
+    return isinstance(obj, generic.DictionaryObject) and obj.get("/Type") in ("/Page", "/Pages")
+
+
+def _references(obj, generic):
+    """직접 객체 안에 들어 있는 간접 참조 목록 (스트림의 /Length는 다시 계산하므로 제외)"""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, generic.IndirectObject):
+            yield item
+        elif isinstance(item, generic.DictionaryObject):
+            is_stream = isinstance(item, generic.StreamObject)
+            stack.extend(value for name, value in item.items() if not (is_stream and name == "/Length"))
+        elif isinstance(item, generic.ArrayObject):
+            stack.extend(item)
+
+
+def _remap(obj, target, generic):
+    """간접 참조를 target(참조)의 결과로 바꾼 사본 (스트림은 사전 부분만, /Length 제외)"""
+    if isinstance(obj, generic.IndirectObject):
+        return target(obj)
+    if isinstance(obj, generic.DictionaryObject):
+        is_stream = isinstance(obj, generic.StreamObject)
+        copy = generic.DictionaryObject()
+        for name, value in obj.items():
+            if is_stream and name == "/Length":
+                continue
+            copy[name] = _remap(value, target, generic)
+        return copy
+    if isinstance(obj, generic.ArrayObject):
+        return generic.ArrayObject(_remap(item, target, generic) for item in obj)
+    return obj
+
+
+def _serialize(obj):
+    buffer = io.BytesIO()
+    obj.write_to_stream(buffer, None)
+    return buffer.getvalue()
+
+
+def recompress(dictionary, data, level, generic):
+    """
+    스트림 다시 압축 -> (사전, 데이터, 다시 압축했는지 여부)
+    - 필터 없음: Flate 압축
+    - Flate 하나만 쓰고 예측자(/DecodeParms)가 없는 경우: 풀어서 다시 압축
+    - 그 외(JPEG, CCITT 등)는 그대로 둠
+    """
+    filters = dictionary.get("/Filter")
+    if filters is None:
+        raw = data
+    elif filters == "/FlateDecode" and "/DecodeParms" not in dictionary:
+        try:
+            raw = zlib.decompress(data)
+        except zlib.error:
+            return dictionary, data, False
+    else:
+        return dictionary, data, False
+
+    compressed = zlib.compress(raw, level)
+    if len(compressed) >= len(data):
+        return dictionary, data, False
+    dictionary[generic.NameObject("/Filter")] = generic.NameObject("/FlateDecode")
+    return dictionary, compressed, True
+
+
+def _inflate(data):
+    """Flate 데이터를 CHUNK_BYTES 이하 조각으로 나눠서 풀기"""
+    decompressor = zlib.decompressobj()
+    view = memoryview(data)
+    for start in range(0, len(view), CHUNK_BYTES):
+        block = view[start:start + CHUNK_BYTES]
+        while block:
+            yield decompressor.decompress(block, CHUNK_BYTES)
+            block = decompressor.unconsumed_tail
+    yield decompressor.flush()
+
+
+def recompress_spooled(dictionary, data, level, generic, spill_bytes):
+    """
+    recompress()와 같지만 조각 단위로 압축하고 결과가 spill_bytes보다 크면 임시 파일에 씀
+    - 반환값: (사전, 새 데이터가 든 파일 또는 바꾸지 않았으면 None)
+    """
+    filters = dictionary.get("/Filter")
+    if filters is None:
+        view = memoryview(data)
+        blocks = (view[start:start + CHUNK_BYTES] for start in range(0, len(view), CHUNK_BYTES))
+    elif filters == "/FlateDecode" and "/DecodeParms" not in dictionary:
+        blocks = _inflate(data)
+    else:
+        return dictionary, None
+
+    spool = tempfile.SpooledTemporaryFile(max_size=spill_bytes)
+    compressor = zlib.compressobj(level)
+    try:
+        for block in blocks:
+            spool.write(compressor.compress(block))
+            if spool.tell() >= len(data):
+                break
+        else:
+            spool.write(compressor.flush())
+    except zlib.error:
+        spool.close()
+        return dictionary, None
+    if spool.tell() >= len(data):
+        spool.close()
+        return dictionary, None
+    dictionary[generic.NameObject("/Filter")] = generic.NameObject("/FlateDecode")
+    return dictionary, spool
+
+
+class _Objects:
+    """문서에서 참조되는 간접 객체 모음 (키: (번호, 세대))"""
+    def __init__(self, reader, generic):
+        self.generic = generic
+        self.trailer = reader.trailer
+        self.objects = {}
+        self.alias = {}
+        self.roots = _roots(self.trailer, generic)
+        stack = list(self.roots)
+        while stack:
+            ref = stack.pop()
+            key = _key(ref)
+            if key in self.objects:
+                continue
+            obj = ref.get_object()
+            self.objects[key] = obj
+            stack.extend(_references(obj, generic))
+
+    def resolve(self, ref):
+        key = _key(ref)
+        return self.alias.get(key, key)
+
+    def canonical(self, ref):
+        return self.generic.IndirectObject(*self.resolve(ref), None)
+
+    def deduplicate(self):
+        """내용이 같은 객체를 하나로 합치고 합친 개수 반환"""
+        merged = 0
+        for _ in range(MAX_DEDUP_PASSES):
+            seen = {}
+            merged_in_pass = 0
+            for key, obj in self.objects.items():
+                if key in self.alias or obj is None or _is_page(obj, self.generic):
+                    continue
+                digest = hashlib.sha256(_serialize(_remap(obj, self.canonical, self.generic)))
+                if isinstance(obj, self.generic.StreamObject):
+                    digest.update(b"stream")
+                    digest.update(obj._data or b"")
+                first = seen.setdefault(digest.digest(), key)
+                if first != key:
+                    self.alias[key] = first
+                    merged_in_pass += 1
+            merged += merged_in_pass
+            if not merged_in_pass:
+                break
+        return merged
+
+    def live(self):
+        """중복 제거 후 루트에서 도달할 수 있는 객체 키 (참조 순서)"""
+        def children(key):
+            obj = self.objects.get(key)
+            return None if obj is None else [_key(ref) for ref in _references(obj, self.generic)]
+
+        return _reachable([_key(ref) for ref in self.roots], children, lambda key: self.alias.get(key, key))
+
+
+def _reachable(roots, children, resolve):
+    """
+    루트에서 도달할 수 있는 객체 키 (참조 순서)
+    - children(키): 참조하는 객체 키 목록, 없는 객체면 None
+    - resolve(키): 중복 제거 후 남는 키
+    """
+    order = []
+    seen = set()
+    stack = [resolve(key) for key in reversed(roots)]
+    while stack:
+        key = stack.pop()
+        if key in seen:
+            continue
+        keys = children(key)
+        if keys is None:
+            continue
+        seen.add(key)
+        order.append(key)
+        stack.extend(reversed([resolve(child) for child in keys]))
+    return order
+
+
+class _MemoryGuard:
+    """스트리밍 모드의 메모리 관리: 최대 RSS 기록, 상한에 가까워지면 PyPDF2 읽기 캐시 비우기"""
+    def __init__(self, reader, limit):
+        self.reader = reader
+        self.limit = limit
+        self.peak = current_rss_bytes()
+        self.evictions = 0
+        self._count = 0
+
+    def release(self, key, size=0):
+        """다 쓴 객체를 읽기 캐시에서 지우고, 일정 간격이나 큰 스트림 뒤에 메모리 확인"""
+        self.reader.resolved_objects.pop((key[1], key[0]), None)
+        self._count += 1
+        if self._count < CHECK_INTERVAL and size < CHUNK_BYTES:
+            return
+        self._count = 0
+        if self.sample() > self.limit * CACHE_SHARE and self.reader.resolved_objects:
+            self.reader.resolved_objects.clear()
+            gc.collect()
+            self.evictions += 1
+
+    def sample(self):
+        """현재 RSS를 재고 최대값 갱신"""
+        rss = current_rss_bytes()
+        self.peak = max(self.peak, rss)
+        return rss
+
+
+class _PdfOutput:
+    """객체를 순서대로 쓰고 위치를 기록하는 출력기"""
+    def __init__(self, stream, version, generic, offsets=True):
+        self.stream = stream
+        self.generic = generic
+        # 스트리밍 모드에서는 위치를 임시 파일에 바로 기록하므로 보관하지 않음
+        self.offsets = {} if offsets else None
+        self.stream.write(f"%PDF-{version}\n".encode("ascii") + b"%\xe2\xe3\xcf\xd3\n")
+
+    def tell(self):
+        return self.stream.tell()
+
+    def write_object(self, number, dictionary, data=None):
+        if self.offsets is not None:
+            self.offsets[number] = self.tell()
+        self.stream.write(f"{number} 0 obj\n".encode("ascii"))
+        if data is None:
+            self.stream.write(_serialize(dictionary))
+        else:
+            dictionary[self.generic.NameObject("/Length")] = self.generic.NumberObject(len(data))
+            self.stream.write(_serialize(dictionary))
+            self.stream.write(b"\nstream\n")
+            self.stream.write(data)
+            self.stream.write(b"\nendstream")
+        self.stream.write(b"\nendobj\n")
+
+    def write_stream_file(self, number, dictionary, source):
+        """임시 파일에 있는 데이터로 스트림 객체 쓰기 (source는 처음부터 끝까지 복사)"""
+        length = source.seek(0, io.SEEK_END)
+        source.seek(0)
+        if self.offsets is not None:
+            self.offsets[number] = self.tell()
+        dictionary[self.generic.NameObject("/Length")] = self.generic.NumberObject(length)
+        self.stream.write(f"{number} 0 obj\n".encode("ascii"))
+        self.stream.write(_serialize(dictionary))
+        self.stream.write(b"\nstream\n")
+        for block in iter(lambda: source.read(CHUNK_BYTES), b""):
+            self.stream.write(block)
+        self.stream.write(b"\nendstream\nendobj\n")
+
+
+def _roots(trailer, generic):
+    return [trailer.raw_get(name) for name in ("/Root", "/Info")
+            if isinstance(trailer.get(name), generic.IndirectObject)]
+
+
+def _trailer_entries(trailer, target, generic):
+    entries = generic.DictionaryObject()
+    for name in ("/Root", "/Info"):
+        if isinstance(trailer.get(name), generic.IndirectObject):
+            entries[generic.NameObject(name)] = target(trailer.raw_get(name))
+    if isinstance(trailer.get("/ID"), generic.ArrayObject):
+        entries[generic.NameObject("/ID")] = trailer["/ID"]
+    return entries
+
+
+def _write_xref_table(output, size, trailer, generic):
+    start = output.tell()
+    lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+    lines += [f"{output.offsets[number]:010d} 00000 n \n" for number in range(1, size)]
+    output.stream.write("".join(lines).encode("ascii"))
+    trailer[generic.NameObject("/Size")] = generic.NumberObject(size)
+    output.stream.write(b"trailer\n" + _serialize(trailer))
+    output.stream.write(f"\nstartxref\n{start}\n%%EOF\n".encode("ascii"))
+
+
+def _write_object_streams(output, numbered, next_number, level, generic):
+    """
+    스트림이 아닌 객체를 객체 스트림으로 묶어 쓰기
+    - next_number: 객체 스트림에 붙일 첫 번호
+    - 반환값: ({객체 번호: (객체 스트림 번호, 순서)}, 다음 번호)
+    """
+    compressed = {}
+    items = sorted(numbered.items())
+    for start in range(0, len(items), OBJECTS_PER_STREAM):
+        chunk = items[start:start + OBJECTS_PER_STREAM]
+        for index, (number, _) in enumerate(chunk):
+            compressed[number] = (next_number, index)
+        output.write_object(next_number, *_pack_object_stream(chunk, level, generic))
+        next_number += 1
+    return compressed, next_number
+
+
+def _pack_object_stream(chunk, level, generic):
+    """[(객체 번호, 객체), ...] -> 객체 스트림 (사전, 압축된 데이터)"""
+    header, body = [], io.BytesIO()
+    for number, dictionary in chunk:
+        header.append(f"{number} {body.tell()}")
+        body.write(_serialize(dictionary))
+        body.write(b"\n")
+    header_bytes = (" ".join(header) + "\n").encode("ascii")
+    stream = generic.DictionaryObject({
+        generic.NameObject("/Type"): generic.NameObject("/ObjStm"),
+        generic.NameObject("/N"): generic.NumberObject(len(chunk)),
+        generic.NameObject("/First"): generic.NumberObject(len(header_bytes)),
+        generic.NameObject("/Filter"): generic.NameObject("/FlateDecode"),
+    })
+    return stream, zlib.compress(header_bytes + body.getvalue(), level)
+
+
+def _xref_row(kind, value, index, offset_width):
+    return bytes([kind]) + value.to_bytes(offset_width, "big") + index.to_bytes(2, "big")
+
+
+def _xref_trailer(trailer, size, offset_width, generic):
+    trailer.update({
+        generic.NameObject("/Type"): generic.NameObject("/XRef"),
+        generic.NameObject("/Size"): generic.NumberObject(size),
+        generic.NameObject("/W"): generic.ArrayObject(
+            [generic.NumberObject(1), generic.NumberObject(offset_width), generic.NumberObject(2)]
+        ),
+        generic.NameObject("/Filter"): generic.NameObject("/FlateDecode"),
+    })
+    return trailer
+
+
+def _write_xref_stream(output, number, compressed, trailer, level, generic):
+    """교차 참조 스트림 쓰기 (객체 스트림 안의 객체는 종류 2 항목)"""
+    start = output.tell()
+    size = number + 1
+    output.offsets[number] = start
+    offset_width = max(4, (max(output.offsets.values()).bit_length() + 7) // 8)
+    rows = [_xref_row(0, 0, 0xFFFF, offset_width)]
+    for obj in range(1, size):
+        if obj in compressed:
+            rows.append(_xref_row(2, *compressed[obj], offset_width))
+        else:
+            rows.append(_xref_row(1, output.offsets[obj], 0, offset_width))
+    _xref_trailer(trailer, size, offset_width, generic)
+    output.write_object(number, trailer, zlib.compress(b"".join(rows), level))
+    output.stream.write(f"startxref\n{start}\n%%EOF\n".encode("ascii"))
+
+
+def _scan(reader, roots, generic, guard):
+    """
+    스트리밍 1단계: 객체를 하나씩 읽어 참조 목록과 스트림 해시만 기록
+    - 반환값: ({키: 참조하는 키 목록 또는 없는 객체면 None}, {스트림 키: 해시})
+    """
+    children, digests = {}, {}
+    stack = list(roots)
+    while stack:
+        ref = stack.pop()
+        key = _key(ref)
+        if key in children:
+            continue
+        obj = reader.get_object(ref)
+        if obj is None:
+            children[key] = None
+            continue
+        refs = list(_references(obj, generic))
+        children[key] = [_key(child) for child in refs]
+        size = 0
+        if isinstance(obj, generic.StreamObject) and not _is_page(obj, generic):
+            data = obj._data or b""
+            size = len(data)
+            digest = hashlib.sha256(_serialize(_remap(obj, lambda child: child, generic)))
+            digest.update(b"stream")
+            digest.update(data)
+            digests[key] = digest.digest()
+        stack.extend(refs)
+        guard.release(key, size)
+    return children, digests
+
+
+def _rewrite_streaming(reader, generic, output_file, level, memory_limit):
+    """스트리밍 모드로 다시 쓰기 (rewrite_pdf 참고)"""
+    guard = _MemoryGuard(reader, memory_limit)
+    spill_bytes = max(CHUNK_BYTES, memory_limit // SPILL_SHARE)
+    roots = _roots(reader.trailer, generic)
+
+    children, digests = _scan(reader, roots, generic, guard)
+    alias, seen = {}, {}
+    for key, digest in digests.items():
+        first = seen.setdefault(digest, key)
+        if first != key:
+            alias[key] = first
+    del seen, digests
+
+    live = _reachable([_key(ref) for ref in roots], children.get, lambda key: alias.get(key, key))
+    objects_in = len(children)
+    del children
+    numbers = {key: number for number, key in enumerate(live, start=1)}
+
+    def target(ref):
+        number = numbers.get(alias.get(_key(ref), _key(ref)))
+        return generic.IndirectObject(number, 0, None) if number else generic.NullObject()
+
+    # 출력 위치 폭은 미리 정해야 하므로 입력 크기의 두 배까지 담을 수 있게 잡음
+    reader.stream.seek(0, io.SEEK_END)
+    offset_width = max(4, ((reader.stream.tell() * 2).bit_length() + 7) // 8)
+    recompressed = spilled = 0
+    with open(output_file, "wb") as f, tempfile.TemporaryFile() as rows:
+        output = _PdfOutput(f, "1.5", generic, offsets=False)
+
+        def row(kind, value, index=0):
+            try:
+                rows.write(_xref_row(kind, value, index, offset_width))
+            except OverflowError:
+                raise RuntimeError("출력 파일이 예상보다 커서 교차 참조 스트림에 기록할 수 없습니다.")
+
+        rows.write(_xref_row(0, 0, 0xFFFF, offset_width))
+        next_number = len(live) + 1
+        stream_offsets = []
+        chunk, chunk_number = [], None
+
+        def flush():
+            stream_offsets.append(output.tell())
+            output.write_object(chunk_number, *_pack_object_stream(chunk, level, generic))
+
+        for key in live:
+            obj = reader.get_object(generic.IndirectObject(key[0], key[1], reader))
+            copy = _remap(obj, target, generic)
+            size = 0
+            if isinstance(obj, generic.StreamObject):
+                data = obj._data or b""
+                size = len(data)
+                row(1, output.tell())
+                copy, spool = recompress_spooled(copy, data, level, generic, spill_bytes)
+                if spool is None:
+                    output.write_object(numbers[key], copy, data)
+                else:
+                    with spool:
+                        recompressed += 1
+                        spilled += spool.tell() > spill_bytes
+                        output.write_stream_file(numbers[key], copy, spool)
+            else:
+                if chunk_number is None:
+                    chunk_number = next_number
+                    next_number += 1
+                row(2, chunk_number, len(chunk))
+                chunk.append((numbers[key], copy))
+                if len(chunk) == OBJECTS_PER_STREAM:
+                    flush()
+                    chunk, chunk_number = [], None
+            del obj, copy
+            guard.release(key, size)
+        if chunk:
+            flush()
+
+        for offset in stream_offsets:
+            row(1, offset)
+        start = output.tell()
+        row(1, start)
+
+        # 교차 참조 항목도 임시 파일에서 조각 단위로 압축
+        rows.seek(0)
+        compressor = zlib.compressobj(level)
+        with tempfile.SpooledTemporaryFile(max_size=spill_bytes) as xref:
+            for block in iter(lambda: rows.read(CHUNK_BYTES), b""):
+                xref.write(compressor.compress(block))
+            xref.write(compressor.flush())
+            trailer = _xref_trailer(_trailer_entries(reader.trailer, target, generic),
+                                    next_number + 1, offset_width, generic)
+            output.write_stream_file(next_number, trailer, xref)
+        output.stream.write(f"startxref\n{start}\n%%EOF\n".encode("ascii"))
+
+    guard.sample()
+    return {
+        "objects_in": objects_in,
+        "objects_out": len(live),
+        "duplicates": len(alias),
+        "recompressed": recompressed,
+        "spilled_streams": spilled,
+        "cache_evictions": guard.evictions,
+        "peak_rss_bytes": guard.peak,
+    }
+
+
+def rewrite_pdf(input_file, output_file, level=DEFAULT_FLATE_LEVEL, object_streams=True, transform=None,
+                memory_limit=None):
+    """
+    PDF를 다시 써서 압축
+    - level: Flate 압축 수준 (1~9)
+    - object_streams: 객체 스트림/교차 참조 스트림 사용 (PDF 1.5)
+    - transform(reader, generic): 스트림 교체 목록 {(번호, 세대): (사전 변경값, 새 데이터)} 반환
+      (사전 변경값은 {이름: 새 값 또는 삭제할 때 None}, 교체한 스트림은 다시 압축하지 않음)
+    - memory_limit: 메모리 상한(바이트)을 주면 스트리밍 모드 사용 (객체 스트림 항상 사용, transform 사용 불가)
+    - 반환값: 처리 정보 {"objects_in", "objects_out", "duplicates", "recompressed"}
+      (스트리밍 모드는 "spilled_streams", "cache_evictions", "peak_rss_bytes" 추가)
+    """
+    if memory_limit and transform:
+        raise ValueError("스트리밍 모드에서는 transform을 사용할 수 없습니다.")
+    PyPDF2 = _require_pypdf2()
+    generic = PyPDF2.generic
+    # 파일 경로를 넘기면 PyPDF2가 파일 전체를 메모리로 읽으므로 파일 객체로 전달
+    with open(input_file, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        if reader.is_encrypted:
+            raise RuntimeError("암호화된 PDF는 Python 엔진으로 압축할 수 없습니다.")
+        if memory_limit:
+            return _rewrite_streaming(reader, generic, output_file, level, memory_limit)
+        return _rewrite(reader, generic, output_file, level, object_streams, transform)
+
+
+def rewrite_pdf_timed(input_file, output_file, level=DEFAULT_FLATE_LEVEL, memory_limit=None):
+    """
+    프로세스 풀에서 rewrite_pdf 실행 (GIL을 나눠 쓰지 않도록 작업마다 다른 프로세스)
+    - 반환값: (처리 정보, 이 작업의 CPU 시간(초))
+    """
+    started = time.process_time()
+    stats = rewrite_pdf(input_file, output_file, level, memory_limit=memory_limit)
+    return stats, time.process_time() - started
+
+
+def _rewrite(reader, generic, output_file, level, object_streams, transform):
+    """전체 객체를 메모리에 올려서 다시 쓰기 (rewrite_pdf 참고)"""
+    replacements = transform(reader, generic) if transform else {}
+    objects = _Objects(reader, generic)
+    duplicates = objects.deduplicate()
+    live = objects.live()
+    numbers = {key: number for number, key in enumerate(live, start=1)}
+
+    def target(ref):
+        number = numbers.get(objects.resolve(ref))
+        return generic.IndirectObject(number, 0, None) if number else generic.NullObject()
+
+    version = "1.5" if object_streams else reader.pdf_header[5:8] or "1.4"
+    recompressed = 0
+    with open(output_file, "wb") as f:
+        output = _PdfOutput(f, version, generic)
+        plain = {}
+        for key in live:
+            obj = objects.objects[key]
+            copy = _remap(obj, target, generic)
+            if key in replacements:
+                updates, data = replacements[key]
+                for name, value in updates.items():
+                    if value is None:
+                        copy.pop(name, None)
+                    else:
+                        copy[generic.NameObject(name)] = value
+                output.write_object(numbers[key], copy, data)
+            elif isinstance(obj, generic.StreamObject):
+                copy, data, changed = recompress(copy, obj._data or b"", level, generic)
+                recompressed += changed
+                output.write_object(numbers[key], copy, data)
+            elif object_streams:
+                plain[numbers[key]] = copy
+            else:
+                output.write_object(numbers[key], copy)
+
+        trailer = _trailer_entries(objects.trailer, target, generic)
+        if object_streams:
+            compressed, xref_number = _write_object_streams(output, plain, len(live) + 1, level, generic)
+            _write_xref_stream(output, xref_number, compressed, trailer, level, generic)
+        else:
+            _write_xref_table(output, len(live) + 1, trailer, generic)
+
+    return {
+        "objects_in": len(objects.objects),
+        "objects_out": len(live),
+        "duplicates": duplicates,
+        "recompressed": recompressed,
+    }
@@ -0,0 +1,116 @@
+"""
+작업 순서 정하기 (스케줄러)
+- 파일 크기와 페이지 수로 작업별 예상 시간을 계산하고, 측정값 로그(pdf_metrics JSONL)가 있으면
+  프리셋/엔진별로 실제 걸린 시간에 맞게 보정
+- 예상 시간이 긴 작업부터 시작 (LPT: 큰 파일 하나가 마지막에 남아 배치 전체가 기다리는 일을 줄임)
+- 우선순위 레인: interactive 레인의 작업은 항상 batch 레인보다 먼저 시작
+  (작은 대화형 작업이 대용량 보관 작업 뒤에서 기다리지 않음)
+
+페이지 수는 파일 앞/뒤 일부만 읽어 추정하므로 (pdf_progress.probe_page_count) 큰 파일이 많아도 빠릅니다.
+"""
+import json
+import os
+
+import pdf_progress
+
+# 우선순위 레인 (앞에 있을수록 먼저 시작)
+LANES = ("interactive", "batch")
+DEFAULT_LANE = "batch"
+
+# 측정 기록이 없을 때 쓰는 기본 예상 시간
+SECONDS_PER_MB = 0.5
+SECONDS_PER_PAGE = 0.05
+# 보정에 쓰려면 필요한 최소 기록 수 (프리셋/엔진별)
+MIN_HISTORY = 3
+# 페이지 수를 모를 때 가정하는 페이지당 크기 (바이트)
+BYTES_PER_PAGE = 100 * 1024
+
+
+def base_cost(input_bytes, pages=None):
+    """보정 전 예상 시간 (초)"""
+    if pages is None:
+        pages = input_bytes / BYTES_PER_PAGE
+    return input_bytes / (1024 * 1024) * SECONDS_PER_MB + pages * SECONDS_PER_PAGE
+
+
+class CostModel:
+    """
+    작업별 예상 시간 계산
+    - observe(): 끝난 작업의 측정값(CompressionBatch.job_metrics 기록 형식)으로 보정 계수 갱신
+    - 보정 계수 = 실제 시간 합 / 보정 전 예상 시간 합 (프리셋/엔진별, 기록이 MIN_HISTORY개 미만이면 1)
+    """
+    def __init__(self):
+        # (프리셋, 엔진) -> [실제 시간 합, 보정 전 예상 시간 합, 기록 수]
+        self._history = {}
+
+    @classmethod
+    def from_jsonl(cls, path):
+        """측정값 JSONL 로그에서 기록 읽기 (파일이 없거나 깨진 줄은 무시)"""
+        model = cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        model.observe(json.loads(line))
+                    except (ValueError, AttributeError):
+                        continue
+        except OSError:
+            pass
+        return model
+
+    def observe(self, record):
+        """작업 하나의 측정값 반영 (실패, 취소, 캐시에서 가져온 작업은 제외)"""
+        if record.get("status") != "ok" or record.get("cached"):
+            return
+        wall_seconds, input_bytes = record.get("wall_seconds"), record.get("input_bytes")
+        if not wall_seconds or not input_bytes:
+            return
+        key = (record.get("preset"), record.get("engine", "ghostscript"))
+        history = self._history.setdefault(key, [0.0, 0.0, 0])
+        history[0] += wall_seconds
+        history[1] += base_cost(input_bytes, record.get("pages"))
+        history[2] += 1
+
+    def scale(self, preset, engine):
+        """보정 계수"""
+        history = self._history.get((preset, engine))
+        if history is None or history[2] < MIN_HISTORY or history[1] <= 0:
+            return 1.0
+        return history[0] / history[1]
+
+    def estimate(self, input_bytes, pages, preset, engine):
+        """예상 시간 (초)"""
+        return base_cost(input_bytes, pages) * self.scale(preset, engine)
+
+
+def plan(jobs, preset, model=None, engines=None, default_engine="ghostscript", lanes=None, page_counts=None):
+    """
+    작업 순서 정하기
+    - jobs: [(입력 파일, 출력 파일), ...]
+    - engines / lanes: {입력 파일: 엔진 / 레인} (없으면 default_engine / DEFAULT_LANE)
+    - page_counts: 이미 읽어 둔 페이지 수 {입력 파일: 페이지 수} (없는 파일만 추정)
+    - 반환값: (정렬한 작업 목록, {입력 파일: {"lane", "pages", "estimated_seconds"}})
+      레인 순서대로, 같은 레인에서는 예상 시간이 긴 순서대로 (같으면 원래 순서)
+    """
+    model = model or CostModel()
+    engines = engines or {}
+    lanes = lanes or {}
+    page_counts = page_counts or {}
+    estimates = {}
+    keys = []
+    for index, (input_file, output_file) in enumerate(jobs):
+        try:
+            input_bytes = os.path.getsize(input_file)
+        except OSError:
+            # 없는 파일은 바로 실패하므로 가장 짧은 작업으로 봄
+            input_bytes = 0
+        pages = page_counts.get(input_file)
+        if pages is None and input_bytes:
+            pages = pdf_progress.probe_page_count(input_file)
+        engine = engines.get(input_file, default_engine)
+        lane = lanes.get(input_file, DEFAULT_LANE)
+        seconds = model.estimate(input_bytes, pages, preset, engine)
+        estimates[input_file] = {"lane": lane, "pages": pages, "estimated_seconds": round(seconds, 3)}
+        keys.append(((LANES.index(lane), -seconds, index), (input_file, output_file)))
+    keys.sort(key=lambda item: item[0])
+    return [job for _, job in keys], estimates
@@ -0,0 +1,91 @@
+"""
+원자적 출력 (scratch 폴더)
+- 압축 결과는 먼저 scratch 폴더(tmpfs, 로컬 SSD 등)의 임시 파일에 씀
+  (gs의 잦은 작은 쓰기가 네트워크 공유 폴더로 바로 가지 않음)
+- 임시 파일을 검사(%PDF- 헤더, %%EOF)한 뒤 최종 경로로 한 번에 교체
+  같은 파일 시스템이면 rename, 다르면 대상 폴더의 임시 파일에 큰 단위로 순차 복사하고 rename
+- 중간에 꺼져도 최종 경로에는 이전 파일이 그대로 있거나 완성된 파일만 있음 (잘린 출력이 남지 않음)
+- scratch 폴더를 지정하지 않으면 출력 파일과 같은 폴더의 임시 파일 사용
+"""
+import errno
+import os
+import shutil
+import uuid
+
+# 파일 시스템이 다를 때 복사 단위 (바이트)
+COPY_CHUNK_BYTES = 16 * 1024 * 1024
+# 헤더와 %%EOF를 찾는 범위 (바이트)
+HEADER_PROBE_BYTES = 1024
+EOF_PROBE_BYTES = 2048
+TEMP_PREFIX = ".pdfc-"
+
+
+def scratch_path(output_file, scratch_dir=None):
+    """
+    출력 파일에 대한 임시 파일 경로 (파일은 만들지 않음)
+    - 이름에 gs가 형식 문자로 해석하는 %가 들어가지 않도록 임의의 16진수 사용
+    """
+    folder = scratch_dir or os.path.dirname(os.path.abspath(output_file))
+    return os.path.join(folder, f"{TEMP_PREFIX}{uuid.uuid4().hex}.pdf")
+
+
+def validate_output(path):
+    """PDF 헤더와 %%EOF가 있는지 확인 (잘리거나 비어 있는 출력이면 RuntimeError)"""
+    try:
+        with open(path, "rb") as f:
+            validate_stream(f, os.path.getsize(path))
+    except OSError as e:
+        raise RuntimeError(f"출력 파일을 읽을 수 없습니다: {e}")
+
+
+def validate_stream(f, size):
+    """validate_output과 같은 검사를 되감을 수 있는 파일 객체에 적용 (위치는 처음으로 되돌림)"""
+    f.seek(0)
+    header = f.read(HEADER_PROBE_BYTES)
+    f.seek(max(0, size - EOF_PROBE_BYTES))
+    tail = f.read(EOF_PROBE_BYTES)
+    f.seek(0)
+    if b"%PDF-" not in header or b"%%EOF" not in tail:
+        raise RuntimeError("출력 파일이 올바른 PDF가 아닙니다 (잘렸거나 비어 있음).")
+
+
+def _fsync(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def publish_output(source, destination):
+    """
+    임시 파일을 최종 경로로 원자적으로 옮김
+    - 같은 파일 시스템: 디스크에 기록(fsync)한 뒤 rename
+    - 다른 파일 시스템: 대상 폴더의 임시 파일에 순차 복사, fsync, rename 후 원래 임시 파일 삭제
+    """
+    _fsync(source)
+    try:
+        os.replace(source, destination)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    temp_path = scratch_path(destination)
+    try:
+        with open(source, "rb") as src, open(temp_path, "xb") as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.remove(source)
+
+
+def check_scratch_dir(scratch_dir):
+    """scratch 폴더를 만들고 쓸 수 있는지 확인 (쓸 수 없으면 OSError)"""
+    os.makedirs(scratch_dir, exist_ok=True)
+    probe = scratch_path(os.path.join(scratch_dir, "probe"), scratch_dir)
+    with open(probe, "xb"):
+        pass
+    os.remove(probe)
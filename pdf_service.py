@@ -0,0 +1,550 @@
+"""
+로컬 압축 HTTP 서비스 (asyncio, 표준 라이브러리만 사용)
+- POST /compress?preset=ebook : 요청 본문의 PDF를 압축해 응답 본문으로 돌려줌
+  - 본문은 메모리에 모으지 않고 조각 단위로 scratch 폴더의 임시 파일에 씀 (Content-Length 또는 chunked)
+  - 결과도 파일에서 조각 단위로 읽어 보냄
+  - preset: screen, ebook, printer, prepress, /ebook 또는 화면 표시 이름 (COMPRESSION_LEVELS)
+- GET /status : 대기/실행 중인 작업 수, 누적 처리 수, 지연 시간 분포(JSON)
+- 대기열 크기가 정해져 있어 가득 차면 본문을 받지 않고 바로 429 (Retry-After)
+- 본문 조각이 BODY_TIMEOUT 안에 오지 않으면 연결을 끊어 느린 업로드가 대기열 자리를 붙잡지 않게 함
+- 작은 요청은 우선 레인(pdf_schedule.LANES)으로 큰 요청보다 먼저 처리
+- 압축은 프리셋별 CompressionBatch.measure_job을 작업 스레드에서 실행
+  (엔진, 캐시, 자원 제한, 원자적 출력 설정을 그대로 사용)
+- ghostscript 엔진에서 pipe_below보다 작은 요청은 파일을 만들지 않고 메모리에서 gs 파이프로 압축
+  (pdf_engine.compress_stream, 캐시와 제한 초과 시 대체 처리는 적용하지 않음)
+
+사용 예:
+    python pdf_service.py --port 8765 -j 4
+    curl --data-binary @in.pdf -o out.pdf "http://127.0.0.1:8765/compress?preset=screen"
+    curl http://127.0.0.1:8765/status
+"""
+import argparse
+import asyncio
+import collections
+import functools
+import itertools
+import json
+import os
+import queue
+import signal
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import pdf_engine
+import pdf_limits
+from pdf_cache import ResultCache
+from pdf_metrics import MetricsLog
+from pdf_rewrite import DEFAULT_FLATE_LEVEL
+from pdf_schedule import DEFAULT_LANE, LANES
+from pdf_scratch import check_scratch_dir, scratch_path
+from pdf_target import parse_size
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 작업 스레드 하나당 대기열 크기
+QUEUE_PER_WORKER = 8
+# 받고 보내는 조각 크기 (바이트)
+CHUNK_BYTES = 256 * 1024
+# 요청 본문 최대 크기 (바이트)
+DEFAULT_MAX_UPLOAD = 2 * 1024 * 1024 * 1024
+# 이보다 작은 요청은 우선 레인 (바이트)
+DEFAULT_INTERACTIVE_BELOW = 4 * 1024 * 1024
+# 이보다 작은 요청은 파이프 모드 (바이트, 본문을 메모리에 받음)
+DEFAULT_PIPE_BELOW = 8 * 1024 * 1024
+# 요청 줄과 헤더를 기다리는 시간 (초)
+HEADER_TIMEOUT = 30.0
+# 본문 조각 하나를 기다리는 시간 (초, 넘으면 연결을 끊고 대기열 자리를 돌려줌)
+BODY_TIMEOUT = 30.0
+MAX_HEADERS = 100
+# 429 응답의 Retry-After (초)
+RETRY_AFTER = 1
+# 지연 시간 분포에 쓰는 최근 요청 수
+LATENCY_WINDOW = 1000
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    429: "Too Many Requests",
+    503: "Service Unavailable",
+}
+
+
+def _discard(result):
+    """작업 결과 정리 (출력 파일 경로면 삭제, 파이프 모드 버퍼면 닫음)"""
+    if isinstance(result, str):
+        if os.path.lexists(result):
+            os.remove(result)
+    elif result is not None:
+        result.close()
+
+
+def _percentile(values, share):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * share))], 4)
+
+
+class CompressionService:
+    """
+    압축 HTTP 서비스
+    - make_batch(프리셋): 프리셋별 CompressionBatch를 만드는 함수 (처음 요청될 때 한 번 호출)
+    - workers: 동시에 압축하는 작업 수, queue_size: 기다릴 수 있는 작업 수 (넘으면 429)
+    - interactive_below(바이트)보다 작은 요청은 우선 레인
+    - pipe_options(pdf_engine.compress_stream 인수)가 주어지면 pipe_below(바이트) 이하인 요청은 파이프 모드
+    """
+    def __init__(self, make_batch, workers, scratch_dir, queue_size=None, max_upload=DEFAULT_MAX_UPLOAD,
+                 interactive_below=DEFAULT_INTERACTIVE_BELOW, pipe_options=None, pipe_below=DEFAULT_PIPE_BELOW):
+        self.make_batch = make_batch
+        self.workers = max(1, workers)
+        self.scratch_dir = scratch_dir
+        self.capacity = self.workers + (queue_size if queue_size is not None else self.workers * QUEUE_PER_WORKER)
+        self.max_upload = max_upload
+        self.interactive_below = interactive_below
+        self.pipe_options = pipe_options
+        self.pipe_below = pipe_below
+        self.batches = {}
+        self.jobs = None
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.started = time.monotonic()
+        # 본문을 받는 중이거나 대기열에 있거나 압축 중인 요청 수
+        self.pending = 0
+        self.running = 0
+        self.counts = collections.Counter()
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._sequence = itertools.count()
+        self._workers = []
+
+    def batch_for(self, preset):
+        batch = self.batches.get(preset)
+        if batch is None:
+            batch = self.batches[preset] = self.make_batch(preset)
+            batch.open()
+        return batch
+
+    async def start(self):
+        self.jobs = asyncio.PriorityQueue()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def close(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        for batch in self.batches.values():
+            batch.cancel()
+        self.executor.shutdown(wait=True)
+        for batch in self.batches.values():
+            batch.close()
+
+    def status(self):
+        latencies = list(self.latencies)
+        return {
+            "uptime": round(time.monotonic() - self.started, 1),
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "pending": self.pending,
+            "queued": self.jobs.qsize() if self.jobs is not None else 0,
+            "running": self.running,
+            "presets": sorted(self.batches),
+            "counts": dict(self.counts),
+            "latency": {
+                "samples": len(latencies),
+                "p50": _percentile(latencies, 0.5),
+                "p95": _percentile(latencies, 0.95),
+                "p99": _percentile(latencies, 0.99),
+            },
+        }
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, run, future = await self.jobs.get()
+            if future.done():
+                # 기다리던 클라이언트가 연결을 끊음
+                continue
+            self.running += 1
+            try:
+                result = await loop.run_in_executor(self.executor, run)
+            finally:
+                self.running -= 1
+            if not future.done():
+                future.set_result(result)
+            else:
+                # 결과를 기다리던 요청이 먼저 끝났으면 직접 정리
+                _discard(result[3])
+
+    @staticmethod
+    def _run_batch(batch, input_file, output_file):
+        """파일 모드 작업 (작업 스레드에서 실행) -> (오류, details, 측정값, 출력 파일)"""
+        try:
+            error = None if batch.measure_job(input_file, output_file) else "취소됨"
+        except Exception as e:
+            error = str(e)
+        details, metrics = batch.forget(input_file)
+        return error, details, metrics, output_file
+
+    def _run_pipe(self, data, preset):
+        """파이프 모드 작업 (작업 스레드에서 실행) -> (오류, details, 측정값, 결과 버퍼)"""
+        started = time.monotonic()
+        try:
+            result = pdf_engine.compress_stream(data, preset, **self.pipe_options)
+        except (RuntimeError, OSError) as e:
+            return str(e), {}, None, None
+        return None, {"engine": "ghostscript-pipe"}, {"wall_seconds": round(time.monotonic() - started, 4)}, result
+
+    async def handle(self, reader, writer):
+        """연결 하나 처리 (keep-alive면 여러 요청)"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_head(reader), HEADER_TIMEOUT)
+                except ValueError as e:
+                    await self._send_json(writer, 400, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                keep_alive = await self._dispatch(reader, writer, *request)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_head(self, reader):
+        """요청 줄과 헤더 읽기 -> (메서드, 경로, 쿼리, 헤더) (연결이 끝났으면 None, 잘못된 요청이면 ValueError)"""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise ValueError("잘못된 요청 줄입니다.")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise ValueError("헤더가 너무 많습니다.")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if version == "HTTP/1.0":
+            headers.setdefault("connection", "close")
+        url = urlsplit(target)
+        return method.upper(), url.path, parse_qs(url.query), headers
+
+    async def _dispatch(self, reader, writer, method, path, query, headers):
+        """요청 처리 -> 연결을 유지할지 여부"""
+        keep_alive = headers.get("connection", "").lower() != "close"
+        has_body = "content-length" in headers or "transfer-encoding" in headers
+        if path == "/status":
+            if method != "GET":
+                await self._send_json(writer, 405, {"error": "GET만 사용할 수 있습니다."}, keep_alive=False)
+                return False
+            await self._send_json(writer, 200, self.status(), keep_alive=keep_alive and not has_body)
+            return keep_alive and not has_body
+        if path == "/compress":
+            if method != "POST":
+                await self._send_json(writer, 405, {"error": "POST만 사용할 수 있습니다."}, keep_alive=False)
+                return False
+            return await self._compress(reader, writer, query, headers, keep_alive)
+        await self._send_json(writer, 404, {"error": f"없는 경로입니다: {path}"}, keep_alive=False)
+        return False
+
+    async def _compress(self, reader, writer, query, headers, keep_alive):
+        started = time.monotonic()
+        try:
+            preset = pdf_engine.normalize_compression(query.get("preset", [pdf_engine.DEFAULT_COMPRESSION])[0])
+        except ValueError as e:
+            await self._send_json(writer, 400, {"error": str(e)}, keep_alive=False)
+            return False
+        chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+        length = None
+        if not chunked:
+            try:
+                length = int(headers["content-length"])
+            except (KeyError, ValueError):
+                await self._send_json(writer, 411, {"error": "Content-Length가 필요합니다."}, keep_alive=False)
+                return False
+            if length > self.max_upload:
+                await self._send_json(writer, 413, {"error": "요청 본문이 너무 큽니다."}, keep_alive=False)
+                return False
+
+        # 본문을 받기 전에 자리 확인 (과부하 시 업로드를 받지 않고 바로 거절)
+        if self.pending >= self.capacity:
+            self.counts["rejected"] += 1
+            await self._send_json(writer, 429, {"error": "대기열이 가득 찼습니다."}, keep_alive=False,
+                                  extra_headers={"Retry-After": str(RETRY_AFTER)})
+            return False
+        if headers.get("expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+
+        self.pending += 1
+        input_file = scratch_path(os.path.join(self.scratch_dir, "input.pdf"), self.scratch_dir)
+        output_file = scratch_path(os.path.join(self.scratch_dir, "output.pdf"), self.scratch_dir)
+        future = None
+        result = None
+        try:
+            if self.pipe_options is not None and length is not None and length <= self.pipe_below:
+                size = length
+                run = functools.partial(self._run_pipe, await self._read_exactly(reader, length), preset)
+            else:
+                try:
+                    size = await self._receive(reader, input_file, length)
+                except ValueError as e:
+                    await self._send_json(writer, 400, {"error": str(e)}, keep_alive=False)
+                    return False
+                if size is None:
+                    await self._send_json(writer, 413, {"error": "요청 본문이 너무 큽니다."}, keep_alive=False)
+                    return False
+                run = functools.partial(self._run_batch, self.batch_for(preset), input_file, output_file)
+            lane = "interactive" if size < self.interactive_below else DEFAULT_LANE
+            future = asyncio.get_running_loop().create_future()
+            await self.jobs.put((LANES.index(lane), next(self._sequence), run, future))
+            error, details, metrics, result = await future
+
+            if error is not None:
+                self.counts["failed"] += 1
+                await self._send_json(writer, 422, {"error": error.strip()}, keep_alive=keep_alive)
+                return keep_alive
+            self.counts["ok"] += 1
+            extra_headers = {
+                "X-Input-Bytes": str(size),
+                "X-Preset": preset,
+                "X-Lane": lane,
+            }
+            if metrics is not None:
+                extra_headers["X-Wall-Seconds"] = str(metrics["wall_seconds"])
+            for key in ("engine", "passthrough", "limit", "fallback"):
+                if key in details:
+                    extra_headers[f"X-{key.capitalize()}"] = str(details[key])
+            if isinstance(result, str):
+                with open(result, "rb") as f:
+                    await self._send_file(writer, f, os.path.getsize(result), extra_headers, keep_alive)
+            else:
+                result.seek(0, 2)
+                size = result.tell()
+                result.seek(0)
+                await self._send_file(writer, result, size, extra_headers, keep_alive)
+            self.latencies.append(time.monotonic() - started)
+            return keep_alive
+        finally:
+            if future is not None and not future.done():
+                future.cancel()
+            self.pending -= 1
+            _discard(result)
+            for path in (input_file, output_file):
+                if os.path.lexists(path):
+                    os.remove(path)
+
+    @staticmethod
+    async def _read_exactly(reader, length):
+        """본문을 메모리로 받음 (조각마다 BODY_TIMEOUT, 느린 업로드는 asyncio.TimeoutError)"""
+        data = bytearray()
+        while len(data) < length:
+            part = await asyncio.wait_for(reader.read(min(CHUNK_BYTES, length - len(data))), BODY_TIMEOUT)
+            if not part:
+                raise asyncio.IncompleteReadError(bytes(data), length)
+            data += part
+        return bytes(data)
+
+    async def _receive(self, reader, path, length):
+        """
+        요청 본문을 조각 단위로 파일에 씀 (length가 None이면 chunked)
+        - 읽기마다 BODY_TIMEOUT을 적용하고, 디스크 쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행
+        - 반환값: 받은 바이트 수 (chunked 본문이 max_upload를 넘으면 None)
+        """
+        loop = asyncio.get_running_loop()
+        size = 0
+        with open(path, "xb") as f:
+            if length is not None:
+                while size < length:
+                    data = await asyncio.wait_for(reader.read(min(CHUNK_BYTES, length - size)), BODY_TIMEOUT)
+                    if not data:
+                        raise asyncio.IncompleteReadError(b"", length - size)
+                    await loop.run_in_executor(None, f.write, data)
+                    size += len(data)
+                return size
+            while True:
+                line = await asyncio.wait_for(reader.readline(), BODY_TIMEOUT)
+                try:
+                    chunk_size = int(line.split(b";")[0].strip(), 16)
+                except ValueError:
+                    raise ValueError("잘못된 chunked 본문입니다.")
+                if chunk_size == 0:
+                    # 트레일러 건너뜀
+                    while (await asyncio.wait_for(reader.readline(), BODY_TIMEOUT)) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return size
+                if size + chunk_size > self.max_upload:
+                    return None
+                remaining = chunk_size
+                while remaining:
+                    data = await asyncio.wait_for(reader.readexactly(min(CHUNK_BYTES, remaining)), BODY_TIMEOUT)
+                    await loop.run_in_executor(None, f.write, data)
+                    remaining -= len(data)
+                size += chunk_size
+                await asyncio.wait_for(reader.readline(), BODY_TIMEOUT)
+
+    def _head(self, status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}"]
+        headers = dict(headers)
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send_json(self, writer, status, body, keep_alive, extra_headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8", "Content-Length": str(len(data))}
+        headers.update(extra_headers or {})
+        writer.write(self._head(status, headers, keep_alive) + data)
+        await writer.drain()
+
+    async def _send_file(self, writer, f, size, extra_headers, keep_alive):
+        """파일 객체의 내용을 조각 단위로 보냄 (보내는 속도에 맞춰 스레드에서 읽음)"""
+        loop = asyncio.get_running_loop()
+        headers = {"Content-Type": "application/pdf", "Content-Length": str(size)}
+        headers.update(extra_headers)
+        writer.write(self._head(200, headers, keep_alive))
+        while True:
+            data = await loop.run_in_executor(None, f.read, CHUNK_BYTES)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        await writer.drain()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pdf_service.py", description="로컬 PDF 압축 HTTP 서비스")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"받을 주소 (기본값: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본값: {DEFAULT_PORT})")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="동시에 압축할 요청 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--queue-size", type=int,
+                        help=f"기다릴 수 있는 요청 수, 넘으면 429 (기본값: 동시 처리 수 x {QUEUE_PER_WORKER})")
+    parser.add_argument("--max-upload", type=parse_size, default=DEFAULT_MAX_UPLOAD, metavar="SIZE",
+                        help="요청 본문 최대 크기 (기본값: 2GB)")
+    parser.add_argument("--interactive-below", type=parse_size, default=DEFAULT_INTERACTIVE_BELOW, metavar="SIZE",
+                        help="이 크기보다 작은 요청은 큰 요청보다 먼저 처리 (기본값: 4MB)")
+    parser.add_argument("--pipe-below", type=parse_size, default=DEFAULT_PIPE_BELOW, metavar="SIZE",
+                        help="ghostscript 엔진에서 이 크기 이하인 요청은 임시 파일 없이 gs 파이프로 압축 "
+                             "(0이면 사용 안 함, 기본값: 8MB)")
+    parser.add_argument("--scratch-dir", help="업로드와 결과를 둘 임시 폴더 (기본값: 시스템 임시 폴더)")
+    parser.add_argument("--gs", dest="ghostscript_path", help="Ghostscript 실행 파일 경로")
+    parser.add_argument("--engine", choices=pdf_engine.ENGINES, default=pdf_engine.DEFAULT_ENGINE,
+                        help="압축 엔진 (pdf_cli.py와 같음, 기본값: ghostscript)")
+    parser.add_argument("--flate-level", type=int, choices=range(1, 10), default=DEFAULT_FLATE_LEVEL,
+                        metavar="1-9", help=f"python 엔진의 Flate 압축 수준 (기본값: {DEFAULT_FLATE_LEVEL})")
+    parser.add_argument("--persistent", action="store_true", help="상주 Ghostscript 인터프리터 사용")
+    parser.add_argument("--timeout", dest="job_timeout", type=float, metavar="SECONDS",
+                        help="요청 하나의 Ghostscript 실행 시간 상한")
+    parser.add_argument("--cpu-limit", type=int, metavar="SECONDS", help="gs 프로세스 하나의 CPU 시간 상한")
+    parser.add_argument("--memory-cap", type=parse_size, metavar="SIZE", help="gs 프로세스 하나의 주소 공간 상한")
+    parser.add_argument("--fallback", choices=pdf_limits.FALLBACKS, default=pdf_limits.DEFAULT_FALLBACK,
+                        help="제한에 걸린 요청 처리 (pdf_cli.py와 같음, 기본값: screen)")
+    parser.add_argument("--cache-dir", help="결과 캐시 폴더")
+    parser.add_argument("--metrics-log", metavar="PATH", help="요청별 측정값을 JSONL로 추가 기록")
+    parser.add_argument("--prometheus", metavar="PATH", help="집계 측정값을 Prometheus 텍스트 형식 파일로 저장")
+    return parser.parse_args(argv)
+
+
+async def serve(args, service):
+    await service.start()
+    server = await asyncio.start_server(service.handle, args.host, args.port, backlog=1024)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, AttributeError):  # Windows
+            pass
+    address = server.sockets[0].getsockname()
+    print(f"서비스 시작: http://{address[0]}:{address[1]} (동시 {service.workers}, 최대 {service.capacity}개 요청)",
+          file=sys.stderr)
+    try:
+        await stop.wait()
+    finally:
+        print("중지하는 중...", file=sys.stderr)
+        server.close()
+        await service.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.persistent and args.cpu_limit:
+        print("오류: --persistent는 --cpu-limit과 함께 쓸 수 없습니다 (상주 인터프리터는 작업마다 CPU 시간을 나눌 수 없음).",
+              file=sys.stderr)
+        return 2
+
+    ghostscript_path = args.ghostscript_path or pdf_engine.find_ghostscript()
+    if not ghostscript_path and args.engine == "ghostscript":
+        print("오류: Ghostscript를 찾을 수 없습니다.", file=sys.stderr)
+        return 2
+
+    scratch_dir = args.scratch_dir or tempfile.mkdtemp(prefix="pdf_service_")
+    try:
+        check_scratch_dir(scratch_dir)
+    except OSError as e:
+        print(f"오류: scratch 폴더를 사용할 수 없습니다: {e}", file=sys.stderr)
+        return 2
+
+    cache = ResultCache(args.cache_dir) if args.cache_dir else None
+    telemetry = None
+    if args.metrics_log or args.prometheus:
+        telemetry = MetricsLog(args.metrics_log, args.prometheus)
+    # measure_job만 쓰므로 배치 이벤트는 쌓이지 않음 (읽지 않는 큐)
+    events = queue.Queue()
+
+    def make_batch(preset):
+        return pdf_engine.CompressionBatch(
+            ghostscript_path, preset, [], args.jobs, events, cache=cache,
+            persistent=args.persistent,
+            telemetry=telemetry,
+            engine=args.engine,
+            flate_level=args.flate_level,
+            job_timeout=args.job_timeout,
+            cpu_limit=args.cpu_limit,
+            address_space_limit=args.memory_cap,
+            fallback=args.fallback
+        )
+
+    pipe_options = None
+    if args.engine == "ghostscript" and args.pipe_below:
+        pipe_options = {
+            "ghostscript_path": ghostscript_path,
+            "timeout": args.job_timeout,
+            "cpu_limit": args.cpu_limit,
+            "address_space_limit": args.memory_cap,
+        }
+    service = CompressionService(make_batch, args.jobs, scratch_dir, args.queue_size, args.max_upload,
+                                 args.interactive_below, pipe_options, args.pipe_below)
+    try:
+        asyncio.run(serve(args, service))
+    except OSError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if telemetry is not None:
+            telemetry.close()
+        if not args.scratch_dir:
+            os.rmdir(scratch_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
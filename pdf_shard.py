@@ -0,0 +1,118 @@
+"""
+대용량 PDF 페이지 범위 분할 압축
+- 문서를 -dFirstPage/-dLastPage 범위로 나눠 여러 gs 프로세스에서 동시에 압축
+- 압축된 조각을 PyPDF2로 하나의 페이지 트리로 합치고 원본의 목차(outline)와 문서 정보를 복원
+
+참고: 페이지 사이를 잇는 문서 내부 링크는 조각마다 따로 처리되므로 유지되지 않을 수 있습니다.
+"""
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# 이 쪽수보다 긴 문서만 분할 (기본값)
+DEFAULT_SHARD_THRESHOLD = 500
+# 조각 하나의 최소 쪽수 (너무 잘게 나누면 gs 시작 비용이 커짐)
+MIN_SHARD_PAGES = 50
+
+
+def _require_pypdf2():
+    try:
+        import PyPDF2
+    except ImportError:
+        raise RuntimeError(
+            "분할 압축에는 PyPDF2 라이브러리가 필요합니다.\n"
+            "'pip install PyPDF2'를 실행하여 설치해주세요."
+        )
+    return PyPDF2
+
+
+def count_pages(input_file):
+    """PDF 페이지 수"""
+    PyPDF2 = _require_pypdf2()
+    return len(PyPDF2.PdfReader(input_file).pages)
+
+
+def plan_shards(page_count, workers, min_pages=MIN_SHARD_PAGES):
+    """페이지 범위 목록 [(첫 쪽, 끝 쪽), ...] (1부터 시작, 끝 쪽 포함)"""
+    shard_pages = max(min_pages, math.ceil(page_count / max(1, workers)))
+    return [
+        (first, min(first + shard_pages - 1, page_count))
+        for first in range(1, page_count + 1, shard_pages)
+    ]
+
+
+def _copy_outline(reader, items, writer, parent=None):
+    """원본 목차를 같은 페이지 번호로 복사 (하위 목차는 바로 앞 항목의 자식)"""
+    last = None
+    for item in items:
+        if isinstance(item, list):
+            if last is not None:
+                _copy_outline(reader, item, writer, last)
+            continue
+        try:
+            page_number = reader.get_destination_page_number(item)
+        except Exception:
+            page_number = None
+        if page_number is None or page_number < 0:
+            continue
+        last = writer.add_outline_item(item.title, page_number, parent=parent)
+
+
+def merge_shards(input_file, shard_files, output_file):
+    """압축된 조각을 하나의 PDF로 합치고 원본 목차와 문서 정보 복원"""
+    PyPDF2 = _require_pypdf2()
+    original = PyPDF2.PdfReader(input_file)
+    writer = PyPDF2.PdfWriter()
+
+    for shard_file in shard_files:
+        for page in PyPDF2.PdfReader(shard_file).pages:
+            writer.add_page(page)
+
+    if len(writer.pages) != len(original.pages):
+        raise RuntimeError(
+            f"분할 압축 결과의 페이지 수가 원본과 다릅니다: {len(writer.pages)} != {len(original.pages)}"
+        )
+
+    try:
+        _copy_outline(original, original.outline, writer)
+    except Exception:
+        # 손상된 목차 때문에 압축 전체를 실패시키지는 않음
+        pass
+
+    if original.metadata:
+        writer.add_metadata({
+            key: value for key, value in original.metadata.items() if isinstance(value, str)
+        })
+
+    with open(output_file, 'wb') as f:
+        writer.write(f)
+
+
+def compress_sharded(input_file, output_file, page_count, build_shard_command, run, workers):
+    """
+    페이지 범위별로 압축한 뒤 합치기
+    - build_shard_command(첫 쪽, 끝 쪽, 조각 출력 경로): gs 명령어 반환
+    - run(명령어): gs 실행, 취소되면 False 반환 / 실패 시 예외
+    - 반환값: 성공 여부 (취소 시 False)
+    """
+    shards = plan_shards(page_count, workers)
+    temp_dir = tempfile.mkdtemp(prefix="pdf_shard_")
+    try:
+        shard_files = [
+            os.path.join(temp_dir, f"shard_{index:04d}.pdf") for index in range(len(shards))
+        ]
+        commands = [
+            build_shard_command(first, last, shard_file)
+            for (first, last), shard_file in zip(shards, shard_files)
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(commands)))) as executor:
+            results = list(executor.map(run, commands))
+        if not all(results):
+            return False
+
+        merge_shards(input_file, shard_files, output_file)
+        return True
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,182 @@
+"""
+목표 크기 모드
+- "10 MB 이하"처럼 크기 상한이 있을 때 이미지 해상도와 JPEG 품질을 조절하며 탐색
+- 품질이 높은 순서로 정렬된 후보 목록(LADDER)에서 상한을 만족하는 첫 후보를 찾음
+- 목표 크기에 가장 가까운 프리셋 위치에서 시작하여, 한 번에 여러 후보를 동시에 시험하며 범위를 좁힘
+- 이미 시험한 후보의 결과는 다시 계산하지 않음
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# (이미지 해상도 dpi, JPEG 품질) - 품질이 높은 것부터
+LADDER = [
+    (300, 90),
+    (300, 80),
+    (250, 80),
+    (200, 75),
+    (175, 70),
+    (150, 70),
+    (150, 60),
+    (120, 60),
+    (100, 55),
+    (96, 50),
+    (85, 45),
+    (72, 40),
+    (72, 30),
+    (60, 25),
+    (50, 20),
+]
+
+# 각 프리셋과 비슷한 후보 위치
+PRESET_ANCHORS = {
+    "/prepress": 0,
+    "/printer": 1,
+    "/ebook": 6,
+    "/screen": 11,
+}
+
+# 결과가 목표 크기의 이 비율 이상이면 더 높은 품질을 찾지 않고 바로 종료
+GOOD_ENOUGH_RATIO = 0.95
+
+
+def parse_size(text):
+    """'10MB', '500k', '2.5 GB', '1048576' 등을 바이트 수로 변환"""
+    value = text.strip().upper().replace(" ", "")
+    units = {"GB": 1024 ** 3, "G": 1024 ** 3, "MB": 1024 ** 2, "M": 1024 ** 2,
+             "KB": 1024, "K": 1024, "B": 1}
+    for unit, factor in units.items():
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * factor)
+    return int(float(value))
+
+
+def jpeg_qfactor(quality):
+    """JPEG 품질(1-100)을 Ghostscript DCTEncode QFactor로 변환 (IJG 배율 기준)"""
+    quality = max(1, min(100, quality))
+    scale = 200 - 2 * quality if quality >= 50 else 5000 / quality
+    return max(0.01, scale / 100)
+
+
+def candidate_arguments(index):
+    """후보의 Ghostscript 추가 인수와 distiller 파라미터(PostScript)"""
+    resolution, quality = LADDER[index]
+    arguments = [
+        "-dDownsampleColorImages=true",
+        "-dDownsampleGrayImages=true",
+        "-dDownsampleMonoImages=true",
+        f"-dColorImageResolution={resolution}",
+        f"-dGrayImageResolution={resolution}",
+        f"-dMonoImageResolution={min(resolution * 2, 600)}",
+        "-dColorImageDownsampleThreshold=1.0",
+        "-dGrayImageDownsampleThreshold=1.0",
+        "-dAutoFilterColorImages=false",
+        "-dAutoFilterGrayImages=false",
+        "-dColorImageFilter=/DCTEncode",
+        "-dGrayImageFilter=/DCTEncode",
+    ]
+    image_dict = f"<< /QFactor {jpeg_qfactor(quality):.2f} /Blend 1 /HSamples [2 1 1 2] /VSamples [2 1 1 2] >>"
+    postscript = (
+        f"<< /ColorImageDict {image_dict} /GrayImageDict {image_dict} "
+        f"/ColorACSImageDict {image_dict} /GrayACSImageDict {image_dict} >> setdistillerparams"
+    )
+    return arguments, postscript
+
+
+def start_index(input_size, target_size, compression):
+    """탐색 시작 위치: 목표 크기 비율에 가장 가까운 프리셋"""
+    ratio = target_size / max(1, input_size)
+    if ratio >= 0.9:
+        preset = "/prepress"
+    elif ratio >= 0.6:
+        preset = "/printer"
+    elif ratio >= 0.3:
+        preset = "/ebook"
+    else:
+        preset = "/screen"
+    # 사용자가 고른 프리셋보다 품질이 높은 곳에서 시작할 필요는 없음
+    return max(PRESET_ANCHORS[preset], PRESET_ANCHORS.get(compression, 0))
+
+
+def _pick(lo, hi, tried, count, first):
+    """[lo, hi] 구간에서 아직 시험하지 않은 후보를 고르게 count개 선택"""
+    untried = [i for i in range(lo, hi + 1) if i not in tried]
+    if not untried:
+        return []
+    picks = []
+    if first is not None and first in untried:
+        picks.append(first)
+    step = len(untried) / (count + 1)
+    for k in range(1, count + 1):
+        index = untried[min(len(untried) - 1, int(step * k))]
+        if index not in picks:
+            picks.append(index)
+        if len(picks) >= count:
+            break
+    return sorted(picks)
+
+
+def compress_to_target(input_file, output_file, target_size, compression, probe, workers):
+    """
+    목표 크기 이하에서 가장 품질이 높은 결과를 output_file에 저장
+    - probe(후보 인덱스, 출력 경로): 해당 후보로 압축, 취소되면 False 반환
+    - 반환값: 선택된 후보 정보 딕셔너리 (취소 시 None)
+    - 어떤 후보로도 목표를 맞추지 못하면 RuntimeError
+    """
+    input_size = os.path.getsize(input_file)
+    temp_dir = tempfile.mkdtemp(prefix="pdf_target_")
+    sizes = {}
+
+    def run(index):
+        path = os.path.join(temp_dir, f"probe_{index:02d}.pdf")
+        if not probe(index, path):
+            return index, None
+        return index, os.path.getsize(path)
+
+    try:
+        # 불변 조건: 정답(상한을 만족하는 첫 후보)은 [lo, hi] 구간 안에 있음
+        lo, hi = 0, len(LADDER) - 1
+        first = start_index(input_size, target_size, compression)
+        workers = max(1, workers)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while lo <= hi:
+                picks = _pick(lo, hi, sizes, workers, first)
+                first = None
+                if not picks:
+                    break
+                for index, size in executor.map(run, picks):
+                    if size is None:
+                        return None
+                    sizes[index] = size
+                for index in picks:
+                    if sizes[index] <= target_size:
+                        hi = min(hi, index)
+                    else:
+                        lo = max(lo, index + 1)
+                # 목표에 충분히 가까운 결과가 나오면 조기 종료
+                if hi in sizes and sizes[hi] <= target_size and sizes[hi] >= target_size * GOOD_ENOUGH_RATIO:
+                    break
+                if lo >= hi and hi in sizes:
+                    break
+
+        passing = [index for index, size in sizes.items() if size <= target_size]
+        if not passing:
+            smallest = min(sizes.values()) if sizes else input_size
+            raise RuntimeError(
+                f"목표 크기 {target_size / 1024 / 1024:.2f} MB를 맞출 수 없습니다. "
+                f"(가장 작은 결과: {smallest / 1024 / 1024:.2f} MB)"
+            )
+
+        best = min(passing)
+        shutil.move(os.path.join(temp_dir, f"probe_{best:02d}.pdf"), output_file)
+        resolution, quality = LADDER[best]
+        return {
+            "resolution": resolution,
+            "jpeg_quality": quality,
+            "size": sizes[best],
+            "probes": len(sizes),
+        }
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -1,9 +1,18 @@
 import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2 import PdfReader
 import threading
 
+from pdf_engine import keep_smaller
+from pdf_rewrite import DEFAULT_FLATE_LEVEL, rewrite_pdf
+
+# 압축 품질 -> Flate 압축 수준
+FLATE_LEVELS = {"낮음": 1, "중간": 6, "높음": 9}
+# 이보다 큰 파일은 스트리밍 모드로 처리 (객체를 모두 메모리에 올리지 않음)
+STREAMING_THRESHOLD = 256 * 1024 * 1024
+STREAMING_MEMORY_LIMIT = 1024 * 1024 * 1024
+
 class PDFCompressorApp:
     def __init__(self, root):
         self.root = root
@@ -139,27 +148,15 @@ class PDFCompressorApp:
                     self.update_status("작업 취소됨.")
                     return
             
-            # 압축 품질 설정 (PyPDF2는 direct compression level 설정은 없지만, 이 예제에서는 개념적 수준으로 적용)
-            # 실제 PyPDF2의 압축은 copy_writer가 객체를 다시 쓰는 과정에서 이루어지며,
-            # 내부적으로 스트림 압축(FlateDecode)을 적용합니다.
-            # quality 설정은 사용자에게 옵션을 제공하는 UI적 요소입니다.
-            quality = self.quality_var.get()
-            # if quality == "낮음":
-            #     # 품질을 낮춘다기보다 압축을 '덜' 하거나, 이미지 품질을 조정하는 것이 실제 압축
-            #     # PyPDF2는 이런 직접적인 품질 제어는 어렵습니다.
-            #     pass 
-            # elif quality == "중간":
-            #     pass
-            # else: # "높음"
-            #     pass
+            # 압축 수준 설정 (무손실 재작성이므로 품질 대신 Flate 압축 강도를 조절)
+            level = FLATE_LEVELS.get(self.quality_var.get(), DEFAULT_FLATE_LEVEL)
 
             self.update_status("PDF 파일 로딩 중...")
             self.update_progress(10)
             
-            reader = PdfReader(input_file)
-            writer = PdfWriter()
-            
-            total_pages = len(reader.pages)
+            # 파일 경로를 넘기면 PyPDF2가 파일 전체를 메모리로 읽으므로 파일 객체로 전달
+            with open(input_file, "rb") as f:
+                total_pages = len(PdfReader(f).pages)
             
             if total_pages == 0:
                 messagebox.showwarning("경고", "선택된 PDF 파일에 페이지가 없습니다.")
@@ -167,28 +164,26 @@ class PDFCompressorApp:
                 self.update_status("대기 중...")
                 return
 
-            # 각 페이지를 Writer에 추가하며 진행 상태 업데이트
-            for i, page in enumerate(reader.pages):
-                # PyPDF2는 페이지를 다시 쓸 때 내부적으로 최적화를 시도합니다.
-                # 명시적인 압축 레벨 설정은 PyPDF2 자체에서는 지원하지 않습니다.
-                # (ex. 이미지 DPI 감소, 폰트 서브세팅 등은 다른 라이브러리 필요)
-                writer.add_page(page)
-                
-                # 진행 상태 업데이트
-                progress = 10 + (i / total_pages) * 80
-                self.update_progress(progress)
-                self.update_status(f"페이지 처리 중... ({i+1}/{total_pages})")
-            
-            self.update_status("PDF 파일 저장 중...")
-            self.update_progress(90)
+            # 중복 객체 제거, 스트림 재압축, 객체 스트림으로 다시 쓰기
+            memory_limit = None
+            if os.path.getsize(input_file) > STREAMING_THRESHOLD:
+                memory_limit = STREAMING_MEMORY_LIMIT
+            self.update_status(f"PDF 파일 압축 중... ({total_pages}쪽{', 대용량 모드' if memory_limit else ''})")
+            self.update_progress(30)
+            stats = rewrite_pdf(input_file, output_file, level, memory_limit=memory_limit)
             
-            # 최종 PDF 저장
-            with open(output_file, "wb") as f:
-                writer.write(f) # PyPDF2는 이 과정에서 FlateDecode 압축을 적용합니다.
+            # 결과가 원본보다 크면 원본으로 교체
+            keep_smaller(input_file, output_file)
             
             self.update_progress(100)
             self.update_status("압축 완료!")
-            messagebox.showinfo("완료", f"PDF 파일이 성공적으로 압축되었습니다.\n저장 위치: {output_file}")
+            memory_info = ""
+            if "peak_rss_bytes" in stats:
+                memory_info = f"최대 메모리 사용량: {stats['peak_rss_bytes'] / 1024 / 1024:.0f} MB\n"
+            messagebox.showinfo("완료", f"PDF 파일이 성공적으로 압축되었습니다.\n"
+                                      f"중복 객체 {stats['duplicates']}개 제거, 스트림 {stats['recompressed']}개 재압축\n"
+                                      f"{memory_info}"
+                                      f"저장 위치: {output_file}")
             
         except Exception as e:
             messagebox.showerror("오류", f"PDF 압축 중 오류가 발생했습니다: {str(e)}")
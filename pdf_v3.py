@@ -2,8 +2,8 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import subprocess
 import os
-import sys
-import shutil
+
+import pdf_engine
 
 class PDFCompressorApp:
     """
@@ -61,18 +61,7 @@ class PDFCompressorApp:
         시스템 경로에서 Ghostscript 실행 파일을 찾습니다.
         Windows와 Unix 계열 시스템을 모두 지원합니다.
         """
-        if sys.platform.startswith('win'):
-            # Windows에서는 gswin64c.exe 또는 gswin32c.exe를 찾습니다.
-            for cmd in ('gswin64c', 'gswin32c', 'gs'):
-                path = shutil.which(cmd)
-                if path:
-                    return path
-        else:
-            # Linux, macOS 등에서는 'gs'를 찾습니다.
-            path = shutil.which('gs')
-            if path:
-                return path
-        return None
+        return pdf_engine.find_ghostscript()
 
     def check_ghostscript_installed(self):
         """
@@ -129,20 +118,15 @@ class PDFCompressorApp:
         try:
             # Ghostscript 명령어 실행
             # -dPDFSETTINGS=/ebook: 중간 품질 및 크기로 압축 (옵션: /screen, /printer, /prepress)
-            command = [
-                self.ghostscript_path,
-                "-sDEVICE=pdfwrite",
-                "-dCompatibilityLevel=1.4",
-                "-dPDFSETTINGS=/ebook",
-                "-dNOPAUSE",
-                "-dQUIET",
-                "-dBATCH",
-                f"-sOutputFile={output_file_path}",
-                self.input_file_path
-            ]
+            command = pdf_engine.build_command(
+                self.ghostscript_path, self.input_file_path, output_file_path, "/ebook"
+            )
             
             # subprocess.run을 사용하여 Ghostscript 실행
             result = subprocess.run(command, check=True, capture_output=True, text=True)
+            
+            # 압축 결과가 원본보다 크면 원본으로 교체
+            pdf_engine.keep_smaller(self.input_file_path, output_file_path)
 
             original_size = os.path.getsize(self.input_file_path) / (1024 * 1024)
             compressed_size = os.path.getsize(output_file_path) / (1024 * 1024)
@@ -1,12 +1,175 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+import tkinter.font as tkfont
 import subprocess
 import os
 import sys
-import shutil
+import queue
+import sqlite3
+import threading
 from PIL import Image, ImageTk
 from datetime import datetime
 
+from pdf_engine import COMPRESSION_LEVELS, DEFAULT_COMPRESSION, CompressionBatch
+import pdf_engine
+from pdf_cache import ResultCache
+from pdf_journal import JobJournal
+from pdf_manifest import FolderManifest, iter_pdf_files
+from pdf_progress import format_duration
+from pdf_shard import DEFAULT_SHARD_THRESHOLD
+from pdf_target import parse_size
+
+# 폴더 검색 결과를 UI로 넘기는 단위 (파일 수)
+SCAN_CHUNK_SIZE = 2000
+# 사전 분석에서 압축할 가치가 있다고 보는 최소 예상 절감률
+PREFLIGHT_MIN_SAVINGS = 0.1
+# 화면 표시 이름 -> 압축 엔진
+ENGINE_LABELS = {
+    "Ghostscript (다시 렌더링)": "ghostscript",
+    "Python (무손실 재작성, PyPDF2 필요)": "python",
+    "이미지만 줄이기 (Pillow, 스캔/사진 문서용)": "images",
+    "자동 (이미지가 적은 문서는 Python)": "auto",
+}
+
+class VirtualListbox(ttk.Frame):
+    """
+    가상화된 파일 목록
+    - 화면에 보이는 행만 Listbox에 그려서 항목이 수십만 개여도 느려지지 않음
+    - items 리스트를 참조로 공유하므로 변경 후 refresh() 호출
+    - 선택은 데이터 인덱스 집합으로 관리 (스크롤해도 유지)
+    - Ctrl/Shift 없이 클릭하면 보이지 않는 행의 선택도 해제
+    - 위/아래 화살표는 선택을 옮기고 그 행이 보이도록 스크롤
+    """
+    def __init__(self, master, items, height=8, display=os.path.basename):
+        super().__init__(master)
+        self.items = items
+        self.display = display
+        self.first = 0
+        self.rows = height
+        self.selected = set()
+        # 키보드 선택 기준 (현재 행, Shift 범위 선택의 시작 행; 데이터 인덱스)
+        self.cursor = None
+        self.anchor = None
+        # 방금 누른 클릭이 Ctrl/Shift 없는 단순 클릭인지
+        self.plain_click = False
+        
+        self.listbox = tk.Listbox(self, height=height, selectmode=tk.EXTENDED,
+                                  activestyle=tk.NONE, exportselection=False)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scrollbar)
+        
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.line_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+        self.listbox.bind("<Configure>", self.on_resize)
+        self.listbox.bind("<Button-1>", self.on_click)
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", self.on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(3))
+        self.listbox.bind("<Up>", lambda e: self.move_cursor(-1))
+        self.listbox.bind("<Down>", lambda e: self.move_cursor(1))
+        self.listbox.bind("<Shift-Up>", lambda e: self.move_cursor(-1, extend=True))
+        self.listbox.bind("<Shift-Down>", lambda e: self.move_cursor(1, extend=True))
+        self.listbox.bind("<Prior>", lambda e: self.scroll(-self.rows))
+        self.listbox.bind("<Next>", lambda e: self.scroll(self.rows))
+    
+    def refresh(self):
+        """보이는 행 다시 그리기"""
+        total = len(self.items)
+        self.first = max(0, min(self.first, total - self.rows))
+        last = min(total, self.first + self.rows)
+        
+        self.listbox.delete(0, tk.END)
+        if last > self.first:
+            self.listbox.insert(tk.END, *(self.display(item) for item in self.items[self.first:last]))
+        for row, index in enumerate(range(self.first, last)):
+            if index in self.selected:
+                self.listbox.selection_set(row)
+        # Listbox 자체 스크롤은 쓰지 않음
+        self.listbox.yview_moveto(0)
+        
+        if total:
+            self.scrollbar.set(self.first / total, last / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def scroll(self, delta):
+        self.first += delta
+        self.refresh()
+        return "break"
+    
+    def on_scrollbar(self, action, amount, unit=None):
+        total = len(self.items)
+        if action == "moveto":
+            self.first = int(float(amount) * total)
+        elif action == "scroll":
+            step = self.rows if unit == "pages" else 1
+            self.first += int(amount) * step
+        self.refresh()
+    
+    def on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+    
+    def on_resize(self, event):
+        rows = max(1, event.height // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.refresh()
+    
+    def on_click(self, event):
+        """클릭한 행을 키보드 선택 기준으로 기억 (Shift는 0x1, Ctrl은 0x4)"""
+        self.plain_click = not event.state & 0x0005
+        if self.items:
+            self.cursor = min(len(self.items) - 1, self.first + self.listbox.nearest(event.y))
+            if not event.state & 0x0001 or self.anchor is None:
+                self.anchor = self.cursor
+    
+    def on_select(self, event):
+        """보이는 행의 선택 상태를 데이터 인덱스 집합에 반영"""
+        visible = set(range(self.first, min(len(self.items), self.first + self.rows)))
+        chosen = {self.first + row for row in self.listbox.curselection()}
+        if self.plain_click:
+            # 단순 클릭은 스크롤해서 보이지 않는 행의 선택까지 모두 해제
+            self.selected = chosen
+            self.plain_click = False
+        else:
+            self.selected -= visible - chosen
+            self.selected |= chosen
+    
+    def move_cursor(self, delta, extend=False):
+        """선택을 위/아래로 옮기고 (Shift면 범위 확장) 그 행이 보이도록 스크롤"""
+        total = len(self.items)
+        if not total:
+            return "break"
+        if self.cursor is None:
+            self.cursor = self.first if delta > 0 else min(total, self.first + self.rows) - 1
+        else:
+            self.cursor = max(0, min(total - 1, self.cursor + delta))
+        if not extend or self.anchor is None:
+            self.anchor = self.cursor
+        low, high = sorted((self.anchor, self.cursor))
+        self.selected = set(range(low, high + 1))
+        
+        if self.cursor < self.first:
+            self.first = self.cursor
+        elif self.cursor >= self.first + self.rows:
+            self.first = self.cursor - self.rows + 1
+        self.refresh()
+        self.listbox.activate(self.cursor - self.first)
+        return "break"
+    
+    def curselection(self):
+        """선택된 항목의 데이터 인덱스 (오름차순)"""
+        return tuple(sorted(i for i in self.selected if i < len(self.items)))
+    
+    def clear_selection(self):
+        self.selected.clear()
+        self.cursor = None
+        self.anchor = None
+        self.refresh()
+
+
 class PDFCompressorApp:
     """
     향상된 PDF 압축 프로그램
@@ -28,21 +191,47 @@ class PDFCompressorApp:
             pass
 
         self.input_files = []
+        # 중복 확인과 제거를 위한 집합 인덱스
+        self.input_index = set()
+        # 폴더로 추가한 파일 -> 그 폴더 (출력 폴더 아래에 하위 폴더 구조를 유지하는 기준)
+        self.input_bases = {}
+        # 폴더 검색 스레드와 결과 큐
+        self.scan_thread = None
+        self.scan_events = queue.Queue()
+        self.scan_found = 0
+        self.scan_added = 0
         self.output_dir = ""
         self.ghostscript_path = self.find_ghostscript()
-        self.compression_levels = {
-            "최고 품질 (최소 압축)": "/prepress",
-            "고품질 (인쇄용)": "/printer",
-            "중간 품질 (전자책)": "/ebook",
-            "저품질 (웹용)": "/screen"
-        }
-        self.current_compression = "/ebook"
+        self.compression_levels = dict(COMPRESSION_LEVELS)
+        self.current_compression = DEFAULT_COMPRESSION
+        # 동시에 실행할 Ghostscript 프로세스 수 (기본값: CPU 코어 수)
+        self.max_workers = os.cpu_count() or 1
+        # 백그라운드 배치와 진행 이벤트 큐
+        self.batch = None
+        self.batch_output_dir = None
+        self.events = queue.Queue()
+        # 압축 결과 캐시 (처음 사용할 때 생성)
+        self.cache = None
+        # 증분 모드에서 사용하는 폴더별 매니페스트 (폴더 경로 -> FolderManifest)
+        self.manifests = {}
+        self.batch_succeeded = []
+        self.batch_settings = None
+        # 상태 표시줄 (파일 진행 / 페이지 진행)
+        self.file_status = ""
+        self.page_status = ""
+        # 작업 저널 (처음 사용할 때 열기), 실행 중인 배치의 저널 기록, 이어서 실행할 (기록, 작업 목록)
+        self.journal = None
+        self.journal_run = None
+        self.resume = None
         
         # UI 초기화
         self.setup_ui()
         
         # Ghostscript 설치 확인
         self.check_ghostscript_installed()
+        
+        # 지난번에 중단된 배치가 있으면 이어서 할지 묻기
+        self.master.after(200, self.offer_resume)
 
     def setup_ui(self):
         """UI 컴포넌트 초기화"""
@@ -68,6 +257,13 @@ class PDFCompressorApp:
                                         "중간 품질 (전자책)", *self.compression_levels.keys())
         compression_menu.grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
         
+        # 동시 작업 수 선택
+        ttk.Label(settings_frame, text="동시 작업 수:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
+        
+        self.workers_var = tk.IntVar(value=self.max_workers)
+        ttk.Spinbox(settings_frame, from_=1, to=max(self.max_workers * 2, 1),
+                   textvariable=self.workers_var, width=5).grid(row=0, column=3, sticky=tk.W, padx=5, pady=5)
+        
         # 출력 폴더 선택
         ttk.Button(settings_frame, text="출력 폴더 선택", 
                   command=self.select_output_dir).grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
@@ -76,6 +272,51 @@ class PDFCompressorApp:
         ttk.Label(settings_frame, textvariable=self.output_dir_var, 
                  wraplength=400).grid(row=1, column=1, columnspan=2, sticky=tk.W, padx=5)
         
+        # 결과 캐시 사용 여부
+        self.cache_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(settings_frame, text="결과 캐시 사용 (변경되지 않은 파일은 다시 압축하지 않음)",
+                       variable=self.cache_var).grid(row=2, column=0, columnspan=4, sticky=tk.W, padx=5, pady=5)
+        
+        # 증분 모드 (폴더 추가 시 새 파일/바뀐 파일만 추가)
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="증분 모드 (폴더 추가 시 지난번 이후 새로 생기거나 바뀐 파일만 추가)",
+                       variable=self.incremental_var).grid(row=3, column=0, columnspan=4, sticky=tk.W, padx=5, pady=5)
+        
+        # 대용량 문서 분할 압축 (페이지 범위별로 여러 코어에서 동시에 압축)
+        self.shard_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text=f"대용량 문서 분할 압축 ({DEFAULT_SHARD_THRESHOLD}쪽 초과 문서를 나눠서 동시에 압축)",
+                       variable=self.shard_var).grid(row=4, column=0, columnspan=4, sticky=tk.W, padx=5, pady=5)
+        
+        # 목표 크기 모드 (비워 두면 선택한 압축 품질 그대로 사용)
+        ttk.Label(settings_frame, text="목표 크기 (MB):").grid(row=5, column=0, sticky=tk.W, padx=5, pady=5)
+        
+        self.target_size_var = tk.StringVar(value="")
+        ttk.Entry(settings_frame, textvariable=self.target_size_var, width=8).grid(row=5, column=1, sticky=tk.W, padx=5, pady=5)
+        ttk.Label(settings_frame, text="비워 두면 사용 안 함", style="Status.TLabel").grid(row=5, column=2, columnspan=2, sticky=tk.W, padx=5)
+        
+        # 사전 분석 (효과가 적을 것으로 예상되는 파일은 원본 그대로 복사)
+        self.preflight_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text=f"사전 분석: 예상 절감률 {int(PREFLIGHT_MIN_SAVINGS * 100)}% 미만 파일은 압축하지 않고 원본 복사 (PyPDF2 필요)",
+                       variable=self.preflight_var).grid(row=6, column=0, columnspan=4, sticky=tk.W, padx=5, pady=5)
+        
+        # 상주 Ghostscript (작은 파일이 많을 때 gs 시작 비용 절약)
+        self.persistent_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="상주 Ghostscript 사용 (작은 파일이 많을 때 빠름)",
+                       variable=self.persistent_var).grid(row=7, column=0, columnspan=4, sticky=tk.W, padx=5, pady=5)
+        
+        # 압축 엔진 선택 (Python 엔진은 Ghostscript 없이 동작)
+        ttk.Label(settings_frame, text="압축 엔진:").grid(row=8, column=0, sticky=tk.W, padx=5, pady=5)
+        
+        engine_labels = list(ENGINE_LABELS)
+        self.engine_var = tk.StringVar(value=engine_labels[0])
+        ttk.OptionMenu(settings_frame, self.engine_var, engine_labels[0],
+                      *engine_labels).grid(row=8, column=1, columnspan=3, sticky=tk.W, padx=5, pady=5)
+        
+        # 페이지 단위 진행 표시 (gs 출력을 줄 단위로 읽으므로 끄면 조금 가벼움)
+        self.page_progress_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(settings_frame, text="페이지 단위 진행률과 남은 시간 표시",
+                       variable=self.page_progress_var).grid(row=9, column=0, columnspan=4, sticky=tk.W, padx=5, pady=5)
+        
         # 파일 목록 프레임
         list_frame = ttk.Frame(main_frame)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
@@ -83,13 +324,9 @@ class PDFCompressorApp:
         # 파일 목록 헤더
         ttk.Label(list_frame, text="선택된 파일 목록:").pack(anchor=tk.W)
         
-        # 스크롤바가 있는 파일 목록
-        self.file_listbox = tk.Listbox(list_frame, height=8, selectmode=tk.EXTENDED)
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.file_listbox.yview)
-        self.file_listbox.configure(yscrollcommand=scrollbar.set)
-        
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.file_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # 스크롤바가 있는 파일 목록 (보이는 행만 그림)
+        self.file_listbox = VirtualListbox(list_frame, self.input_files, height=8)
+        self.file_listbox.pack(fill=tk.BOTH, expand=True)
         
         # 버튼 프레임
         button_frame = ttk.Frame(main_frame)
@@ -114,6 +351,12 @@ class PDFCompressorApp:
                                      style="Accent.TButton")
         self.compress_btn.pack(fill=tk.X, pady=(10, 0))
         
+        # 취소 버튼
+        self.cancel_btn = ttk.Button(main_frame, text="취소",
+                                   command=self.cancel_compression,
+                                   state=tk.DISABLED)
+        self.cancel_btn.pack(fill=tk.X, pady=(5, 0))
+        
         # 스타일 설정
         self.setup_styles()
     
@@ -144,29 +387,21 @@ class PDFCompressorApp:
     
     def find_ghostscript(self):
         """시스템에서 Ghostscript 실행 파일 찾기"""
-        if sys.platform.startswith('win'):
-            for cmd in ('gswin64c', 'gswin32c', 'gs'):
-                path = shutil.which(cmd)
-                if path:
-                    return path
-        else:
-            path = shutil.which('gs')
-            if path:
-                return path
-        return None
+        return pdf_engine.find_ghostscript()
     
     def check_ghostscript_installed(self):
         """Ghostscript 설치 여부 확인"""
         if not self.ghostscript_path:
-            self.show_error(
+            self.show_warning(
                 "Ghostscript 미설치",
-                "PDF 압축을 위해서는 Ghostscript가 필요합니다.\n\n"
+                "Ghostscript가 없어 Python 엔진(무손실 재작성)만 사용할 수 있습니다.\n"
+                "이미지까지 압축하려면 Ghostscript를 설치하세요.\n\n"
                 "Windows: ghostscript.com에서 설치\n"
                 "macOS: 'brew install ghostscript' 실행\n"
                 "Linux: 'sudo apt-get install ghostscript' 실행"
             )
-            self.compress_btn.config(state=tk.DISABLED)
-            self.status_var.set("오류: Ghostscript를 찾을 수 없음")
+            self.engine_var.set(next(label for label, engine in ENGINE_LABELS.items() if engine == "python"))
+            self.status_var.set("경고: Ghostscript를 찾을 수 없음 (Python 엔진 사용)")
         else:
             self.status_var.set(f"Ghostscript 감지됨: {os.path.basename(self.ghostscript_path)}")
     
@@ -184,43 +419,145 @@ class PDFCompressorApp:
             self.add_to_list(files)
     
     def add_folder(self):
-        """폴더에서 PDF 파일 추가"""
+        """폴더에서 PDF 파일 추가 (검색은 백그라운드 스레드에서 진행)"""
+        if self.scan_thread is not None:
+            self.show_warning("검색 중", "이전 폴더 검색이 아직 끝나지 않았습니다.")
+            return
+        
         folder = filedialog.askdirectory(title="PDF 파일이 있는 폴더 선택")
-        if folder:
-            pdf_files = []
-            for root, _, files in os.walk(folder):
-                for file in files:
-                    if file.lower().endswith('.pdf'):
-                        pdf_files.append(os.path.join(root, file))
+        if not folder:
+            return
+        
+        # 증분 모드: 매니페스트와 비교하여 새 파일이나 바뀐 파일만 추가
+        manifest = None
+        if self.incremental_var.get():
+            manifest = FolderManifest(folder)
+            self.manifests[manifest.folder] = manifest
+        
+        self.scan_found = 0
+        self.scan_added = 0
+        self.status_var.set("폴더 검색 중...")
+        self.scan_thread = threading.Thread(
+            target=self.scan_folder,
+            args=(folder, manifest, self.current_settings()),
+            daemon=True
+        )
+        self.scan_thread.start()
+        self.master.after(50, self.poll_scan_events)
+    
+    def scan_folder(self, folder, manifest, settings):
+        """폴더를 훑어 찾은 파일을 묶음 단위로 큐에 전달 (작업 스레드에서 실행)"""
+        if manifest is not None:
+            entries = manifest.iter_scan(settings)
+        else:
+            entries = ((path, True) for path, _ in iter_pdf_files(folder))
+        
+        chunk = []
+        unchanged = 0
+        for path, needs_work in entries:
+            if not needs_work:
+                unchanged += 1
+                continue
+            chunk.append(path)
+            if len(chunk) >= SCAN_CHUNK_SIZE:
+                self.scan_events.put(("files", chunk, folder))
+                chunk = []
+        self.scan_events.put(("files", chunk, folder))
+        self.scan_events.put(("done", manifest is not None, unchanged))
+    
+    def poll_scan_events(self):
+        """폴더 검색 결과를 UI 스레드에서 목록에 추가"""
+        while True:
+            try:
+                event = self.scan_events.get_nowait()
+            except queue.Empty:
+                break
             
-            if pdf_files:
-                self.add_to_list(pdf_files)
-            else:
-                self.show_warning("PDF 파일 없음", "선택한 폴더에서 PDF 파일을 찾을 수 없습니다.")
+            if event[0] == "files":
+                self.scan_found += len(event[1])
+                self.scan_added += self.add_to_list(event[1], update_status=False, base_dir=event[2])
+                self.status_var.set(f"폴더 검색 중... {self.scan_found}개 발견, 총 {len(self.input_files)}개 파일")
+            elif event[0] == "done":
+                _, incremental, unchanged = event
+                self.scan_thread = None
+                self.finish_scan(incremental, unchanged)
+                return
+        
+        self.master.after(50, self.poll_scan_events)
+    
+    def finish_scan(self, incremental, unchanged):
+        """폴더 검색 완료 메시지 표시"""
+        if not self.scan_found and not unchanged:
+            self.show_warning("PDF 파일 없음", "선택한 폴더에서 PDF 파일을 찾을 수 없습니다.")
+            return
+        
+        if not incremental:
+            self.status_var.set(f"{self.scan_added}개의 파일이 추가되었습니다. 총 {len(self.input_files)}개 파일")
+            return
+        
+        message = f"증분 모드: {self.scan_added}개 파일 추가, 변경 없는 {unchanged}개 파일 건너뜀"
+        self.status_var.set(message + f". 총 {len(self.input_files)}개 파일")
+        if not self.scan_found:
+            messagebox.showinfo("변경 없음", f"{message}\n\n마지막 압축 이후 바뀐 파일이 없습니다.")
     
-    def add_to_list(self, files):
-        """파일 목록에 추가"""
+    def current_settings(self):
+        """매니페스트에 기록할 압축 설정 (결과에 영향을 주는 옵션 전부)"""
+        return {
+            "compression": self.compression_levels.get(self.compression_var.get(), DEFAULT_COMPRESSION),
+            "engine": ENGINE_LABELS.get(self.engine_var.get(), pdf_engine.DEFAULT_ENGINE),
+            "target_size": self.target_size_var.get().strip() or None,
+            "min_savings": PREFLIGHT_MIN_SAVINGS if self.preflight_var.get() else None,
+            "shard_threshold": DEFAULT_SHARD_THRESHOLD if self.shard_var.get() else None,
+        }
+    
+    def update_manifests(self):
+        """성공한 파일을 매니페스트에 기록하고 저장"""
+        if not self.manifests or not self.batch_succeeded:
+            return
+        touched = set()
+        for input_file in self.batch_succeeded:
+            for manifest in self.manifests.values():
+                if manifest.contains(input_file):
+                    manifest.record(input_file, self.batch_settings)
+                    touched.add(manifest)
+        for manifest in touched:
+            try:
+                manifest.save()
+            except OSError as e:
+                self.show_warning("매니페스트 저장 실패", f"{manifest.path}: {str(e)}")
+    
+    def add_to_list(self, files, update_status=True, base_dir=None):
+        """파일 목록에 추가 (추가된 파일 수 반환, base_dir: 폴더로 추가한 경우 그 폴더)"""
         added = 0
         for file in files:
-            if file not in self.input_files:
+            if file not in self.input_index:
+                self.input_index.add(file)
                 self.input_files.append(file)
-                self.file_listbox.insert(tk.END, os.path.basename(file))
+                if base_dir is not None:
+                    self.input_bases[file] = base_dir
                 added += 1
         
         if added > 0:
-            self.status_var.set(f"{added}개의 파일이 추가되었습니다. 총 {len(self.input_files)}개 파일")
-            self.compress_btn.config(state=tk.NORMAL if self.ghostscript_path else tk.DISABLED)
+            self.file_listbox.refresh()
+            if update_status:
+                self.status_var.set(f"{added}개의 파일이 추가되었습니다. 총 {len(self.input_files)}개 파일")
+            # Ghostscript가 없어도 Python 엔진으로 압축할 수 있음 (엔진 확인은 start_compression에서)
+            self.compress_btn.config(state=tk.NORMAL)
+        return added
     
     def remove_selected(self):
         """선택된 파일 제거"""
         selection = self.file_listbox.curselection()
         if not selection:
             return
-            
-        # 역순으로 제거 (인덱스가 바뀌지 않도록)
-        for i in reversed(selection):
-            self.input_files.pop(i)
-            self.file_listbox.delete(i)
+        
+        # 목록을 한 번만 다시 만들어 제거 (목록 위젯과 같은 리스트 객체 유지)
+        removed = {self.input_files[i] for i in selection}
+        self.input_files[:] = [file for file in self.input_files if file not in removed]
+        self.input_index -= removed
+        for file in removed:
+            self.input_bases.pop(file, None)
+        self.file_listbox.clear_selection()
         
         self.status_var.set(f"{len(selection)}개 파일 제거됨. 남은 파일: {len(self.input_files)}개")
         
@@ -234,7 +571,9 @@ class PDFCompressorApp:
             
         if messagebox.askyesno("확인", "모든 파일을 목록에서 제거하시겠습니까?"):
             self.input_files.clear()
-            self.file_listbox.delete(0, tk.END)
+            self.input_index.clear()
+            self.input_bases.clear()
+            self.file_listbox.clear_selection()
             self.status_var.set("모든 파일이 제거되었습니다.")
             self.compress_btn.config(state=tk.DISABLED)
     
@@ -246,7 +585,10 @@ class PDFCompressorApp:
             self.output_dir_var.set(folder)
     
     def start_compression(self):
-        """압축 프로세스 시작"""
+        """압축 프로세스 시작 (실제 작업은 백그라운드 스레드에서 실행)"""
+        if self.batch is not None:
+            return
+        
         if not self.input_files:
             self.show_warning("파일 없음", "압축할 PDF 파일을 추가하세요.")
             return
@@ -254,57 +596,270 @@ class PDFCompressorApp:
         # 압축 품질 설정
         self.current_compression = self.compression_levels.get(
             self.compression_var.get(), 
-            "/ebook"  # 기본값
+            DEFAULT_COMPRESSION  # 기본값
         )
         
-        # 출력 폴더 설정
-        output_dir = self.output_dir if self.output_dir else None
-        
-        # 압축 시작
-        self.compress_btn.config(state=tk.DISABLED, text="압축 중...")
-        self.master.update()
+        # 압축 엔진 설정
+        engine = ENGINE_LABELS.get(self.engine_var.get(), pdf_engine.DEFAULT_ENGINE)
+        if engine == "ghostscript" and not self.ghostscript_path:
+            self.show_error("Ghostscript 미설치", "Ghostscript 엔진을 사용할 수 없습니다. Python 엔진을 선택하세요.")
+            return
         
+        # 동시 작업 수 설정
         try:
-            total_files = len(self.input_files)
-            success_count = 0
-            
-            for i, input_file in enumerate(self.input_files, 1):
-                self.status_var.set(f"처리 중 ({i}/{total_files}): {os.path.basename(input_file)}")
-                self.progress_var.set((i-1) / total_files * 100)
-                self.master.update()
-                
+            self.max_workers = max(1, int(self.workers_var.get()))
+        except (tk.TclError, ValueError):
+            self.max_workers = os.cpu_count() or 1
+            self.workers_var.set(self.max_workers)
+        
+        # 목표 크기 설정 (숫자만 입력하면 MB 단위)
+        target_size = None
+        target_text = self.target_size_var.get().strip()
+        if target_text:
+            try:
+                target_size = parse_size(target_text + ("MB" if target_text.replace(".", "", 1).isdigit() else ""))
+            except ValueError:
+                self.show_warning("목표 크기 오류", f"목표 크기를 이해할 수 없습니다: {target_text}")
+                return
+        
+        # 증분 모드용 설정 기록
+        self.batch_settings = self.current_settings()
+        self.batch_succeeded = []
+        self.file_status = f"처리 중: {self.max_workers}개 작업 동시 실행"
+        self.page_status = ""
+        
+        # 출력 폴더 설정
+        self.batch_output_dir = self.output_dir if self.output_dir else None
+        
+        if self.resume is not None:
+            # 이어하기: 저널에 남은 작업과 출력 경로 그대로 (덜 쓰인 출력은 덮어씀)
+            self.journal_run, jobs = self.resume
+            self.resume = None
+        else:
+            # 출력 경로 확인 (덮어쓰기 확인은 작업 시작 전에 UI 스레드에서 처리)
+            # 하위 폴더 구조를 유지해도 출력 경로가 겹치는 파일은 서로 덮어쓰지 않도록 건너뜀
+            jobs = []
+            owners = set()
+            conflicts = []
+            for input_file in self.input_files:
                 try:
-                    if self.compress_pdf(input_file, output_dir):
-                        success_count += 1
+                    output_file = self.get_output_path(
+                        input_file, self.batch_output_dir, self.input_bases.get(input_file), owners
+                    )
                 except Exception as e:
                     self.show_error("압축 오류", f"{os.path.basename(input_file)} 처리 중 오류: {str(e)}")
-            
-            # 완료 메시지
-            self.progress_var.set(100)
-            self.status_var.set(f"완료! {success_count}/{total_files}개 파일 압축 성공")
-            
-            if success_count > 0 and output_dir:
-                if messagebox.askyesno("완료", f"{success_count}개 파일 압축 완료!\n\n압축된 파일이 저장된 폴더를 열까요?"):
-                    self.open_folder(output_dir if output_dir else os.path.dirname(self.input_files[0]))
+                    continue
+                if output_file is False:
+                    conflicts.append(input_file)
+                elif output_file is not None:
+                    jobs.append((input_file, output_file))
+            if conflicts:
+                names = "\n".join(os.path.basename(input_file) for input_file in conflicts[:10])
+                self.show_warning(
+                    "출력 경로 겹침",
+                    f"출력 경로가 다른 입력과 겹치는 {len(conflicts)}개 파일은 건너뜁니다.\n\n{names}"
+                )
+            self.journal_run = self.start_journal_run(engine, target_size, jobs)
+        
+        # 압축 시작
+        self.compress_btn.config(state=tk.DISABLED, text="압축 중...")
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.progress_var.set(0)
+        self.status_var.set(self.file_status)
         
-        except Exception as e:
-            self.show_error("알 수 없는 오류", f"압축 중 오류가 발생했습니다: {str(e)}")
+        self.batch = CompressionBatch(
+            self.ghostscript_path,
+            self.current_compression,
+            jobs,
+            self.max_workers,
+            self.events,
+            total=len(self.input_files),
+            cache=self.get_cache(),
+            shard_threshold=DEFAULT_SHARD_THRESHOLD if self.shard_var.get() else None,
+            target_size=target_size,
+            min_savings=PREFLIGHT_MIN_SAVINGS if self.preflight_var.get() else None,
+            persistent=self.persistent_var.get(),
+            page_progress=self.page_progress_var.get(),
+            engine=engine,
+            journal=self.journal_run
+        )
+        self.batch.start()
+        self.master.after(100, self.poll_events)
+    
+    def poll_events(self):
+        """작업 스레드가 보낸 진행 이벤트를 UI 스레드에서 처리"""
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            
+            if event[0] == "progress":
+                _, completed, total, input_file, error = event
+                self.file_status = f"처리 중 ({completed}/{total}): {os.path.basename(input_file)}"
+                self.status_var.set(self.file_status + self.page_status + self.cache_summary())
+                if error:
+                    self.show_error("압축 오류", f"{os.path.basename(input_file)} 처리 중 오류: {error}")
+                else:
+                    self.batch_succeeded.append(input_file)
+            elif event[0] == "pages":
+                # 진행 막대는 파일 수가 아닌 페이지 수 기준 (큰 파일 하나도 진행이 보이도록)
+                _, done_pages, total_pages, rate, eta = event
+                self.progress_var.set(done_pages / total_pages * 100 if total_pages else 0)
+                self.page_status = f" - {done_pages}/{total_pages}쪽, {rate:.1f}쪽/초"
+                if eta is not None:
+                    self.page_status += f", 남은 시간 {format_duration(eta)}"
+                self.status_var.set(self.file_status + self.page_status + self.cache_summary())
+            elif event[0] == "done":
+                _, success_count, total, cancelled = event
+                self.finish_compression(success_count, total, cancelled)
+                return
+        
+        self.master.after(100, self.poll_events)
+    
+    def finish_compression(self, success_count, total_files, cancelled):
+        """배치 종료 후 UI 상태 복원 및 결과 표시"""
+        cache_summary = self.cache_summary()
+        self.batch = None
+        self.update_manifests()
+        self.compress_btn.config(state=tk.NORMAL, text="압축 시작")
+        self.cancel_btn.config(state=tk.DISABLED, text="취소")
+        
+        if cancelled:
+            self.status_var.set(f"취소됨: {success_count}/{total_files}개 파일 압축 성공" + cache_summary)
+            return
         
-        finally:
-            self.compress_btn.config(state=tk.NORMAL, text="압축 시작")
+        # 완료 메시지
+        self.progress_var.set(100)
+        self.status_var.set(f"완료! {success_count}/{total_files}개 파일 압축 성공" + cache_summary)
+        
+        # 실패한 파일만 다시 시도
+        if self.journal_run is not None:
+            failed = self.journal_run.counts()["failed"]
+            if failed and messagebox.askyesno("다시 시도", f"{failed}개 파일이 실패했습니다.\n\n실패한 파일만 다시 압축할까요?"):
+                self.resume_run(self.journal_run, retry_failed=True)
+                return
+        
+        output_dir = self.batch_output_dir
+        if success_count > 0 and output_dir:
+            if messagebox.askyesno("완료", f"{success_count}개 파일 압축 완료!\n\n압축된 파일이 저장된 폴더를 열까요?"):
+                self.open_folder(output_dir)
+    
+    def get_journal(self):
+        """작업 저널 (열 수 없으면 경고 후 None, 저널 없이 계속 진행)"""
+        if self.journal is None:
+            try:
+                self.journal = JobJournal()
+            except (OSError, sqlite3.Error) as e:
+                self.show_warning("작업 저널 사용 불가", f"작업 저널을 열 수 없어 이어하기를 사용할 수 없습니다: {str(e)}")
+                self.journal = False
+        return self.journal or None
+    
+    def start_journal_run(self, engine, target_size, jobs):
+        """새 배치를 저널에 기록 (설정은 pdf_cli.py와 같은 이름으로 저장)"""
+        journal = self.get_journal()
+        if journal is None:
+            return None
+        settings = {
+            "quality": self.current_compression,
+            "engine": engine,
+            "target_size": target_size,
+            "output_dir": self.batch_output_dir,
+        }
+        try:
+            return journal.start_run(settings, jobs)
+        except sqlite3.Error as e:
+            self.show_warning("작업 저널 기록 실패", str(e))
+            return None
+    
+    def offer_resume(self):
+        """마지막 배치에 끝나지 않은 파일이 있으면 이어서 할지 묻기"""
+        journal = self.get_journal()
+        if journal is None or self.batch is not None:
+            return
+        run = journal.latest_run()
+        if run is None:
+            return
+        remaining = len(run.pending())
+        if remaining and messagebox.askyesno(
+            "이전 작업 이어하기",
+            f"{datetime.fromtimestamp(run.created):%Y-%m-%d %H:%M}에 시작한 작업이 끝나지 않았습니다 "
+            f"({remaining}개 파일 남음).\n\n멈춘 곳부터 이어서 압축할까요?"
+        ):
+            self.resume_run(run)
+    
+    def resume_run(self, run, retry_failed=False):
+        """저널의 배치를 같은 설정으로 이어서 실행"""
+        jobs = run.pending(retry_failed)
+        if not jobs:
+            return
+        settings = run.settings
+        for label, value in self.compression_levels.items():
+            if value == settings.get("quality"):
+                self.compression_var.set(label)
+        for label, value in ENGINE_LABELS.items():
+            if value == settings.get("engine"):
+                self.engine_var.set(label)
+        target_size = settings.get("target_size")
+        self.target_size_var.set(f"{target_size / 1024 / 1024:g}" if target_size else "")
+        self.output_dir = settings.get("output_dir") or ""
+        self.output_dir_var.set(self.output_dir or "원본 파일과 같은 폴더에 저장")
+        
+        # 목록을 남은 파일로 교체 (목록 위젯과 같은 리스트 객체 유지)
+        self.input_files[:] = [input_file for input_file, _ in jobs]
+        self.input_index = set(self.input_files)
+        self.input_bases = {}
+        self.file_listbox.clear_selection()
+        self.resume = (run, jobs)
+        self.start_compression()
     
-    def compress_pdf(self, input_file, output_dir=None):
-        """단일 PDF 파일 압축"""
+    def get_cache(self):
+        """캐시 사용이 켜져 있으면 결과 캐시 반환"""
+        if not self.cache_var.get():
+            return None
+        if self.cache is None:
+            try:
+                self.cache = ResultCache()
+            except OSError as e:
+                self.show_warning("캐시 사용 불가", f"캐시 폴더를 만들 수 없습니다: {str(e)}")
+                self.cache_var.set(False)
+                return None
+        # 적중/미스 카운터는 배치마다 새로 셈
+        self.cache.reset_stats()
+        return self.cache
+    
+    def cache_summary(self):
+        """상태 표시줄에 붙일 캐시 적중/미스 요약"""
+        if self.batch is None or self.batch.cache is None:
+            return ""
+        return f" | {self.batch.cache.describe()}"
+    
+    def cancel_compression(self):
+        """실행 중인 배치 취소"""
+        if self.batch is None:
+            return
+        self.cancel_btn.config(state=tk.DISABLED, text="취소 중...")
+        self.status_var.set("취소 중: 실행 중인 Ghostscript 프로세스를 종료합니다...")
+        self.batch.cancel()
+    
+    def get_output_path(self, input_file, output_dir=None, base_dir=None, owners=None):
+        """
+        출력 파일 경로 결정 (덮어쓰기를 거부하면 None 반환)
+        - base_dir: 폴더로 추가한 파일이면 그 폴더 (출력 폴더 아래에 하위 폴더 구조 유지)
+        - owners: 이번 배치에서 이미 정한 출력 경로 집합 (겹치면 False 반환, 아니면 추가)
+        """
         if not os.path.exists(input_file):
             raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_file}")
         
         # 출력 경로 설정
+        output_file = pdf_engine.get_output_path(input_file, output_dir, base_dir)
+        if owners is not None:
+            key = os.path.normcase(os.path.abspath(output_file))
+            if key in owners:
+                return False
+            owners.add(key)
         if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            output_file = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(input_file))[0]}_compressed.pdf")
-        else:
-            dirname, filename = os.path.split(input_file)
-            output_file = os.path.join(dirname, f"{os.path.splitext(filename)[0]}_compressed.pdf")
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
         # 중복 파일 확인
         if os.path.exists(output_file):
@@ -312,37 +867,9 @@ class PDFCompressorApp:
                 "파일 덮어쓰기",
                 f"'{os.path.basename(output_file)}' 파일이 이미 존재합니다.\n덮어쓰시겠습니까?"
             ):
-                return False
-        
-        # Ghostscript 명령어 구성
-        command = [
-            self.ghostscript_path,
-            "-sDEVICE=pdfwrite",
-            "-dCompatibilityLevel=1.4",
-            f"-dPDFSETTINGS={self.current_compression}",
-            "-dNOPAUSE",
-            "-dQUIET",
-            "-dBATCH",
-            f"-sOutputFile={output_file}",
-            input_file
-        ]
-        
-        # 압축 실행
-        result = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"Ghostscript 오류: {result.stderr}")
-        
-        # 원본과 동일한 파일이 생성되었는지 확인
-        if not os.path.exists(output_file):
-            raise RuntimeError("출력 파일이 생성되지 않았습니다.")
+                return None
         
-        return True
+        return output_file
     
     def open_folder(self, folder_path):
         """파일 탐색기에서 폴더 열기"""
@@ -0,0 +1,538 @@
+"""
+폴더 감시 모드 (drop folder 서비스)
+- 감시 폴더에 새 PDF가 들어오면 파일이 다 쓰일 때까지 기다린 뒤 압축 대기열에 넣음
+  (크기와 수정 시각이 SETTLE_SECONDS 동안 그대로이고 파일 끝에 %%EOF가 있어야 함)
+- Linux에서는 inotify(ctypes)로 바로 감지하고, 그 외 환경이나 inotify를 쓸 수 없으면 주기적으로 폴더를 훑음
+- 출력은 감시 폴더와 같은 구조의 출력 폴더에 같은 이름으로 저장 (임시 파일에 쓴 뒤 교체, pdf_scratch 참고)
+- 대기열 크기가 정해져 있어 가득 차면 새 파일은 대기 목록에 남겨 두었다가 자리가 나면 넣음
+- interactive_below보다 작은 파일은 우선 레인(pdf_schedule.LANES)으로 큰 파일보다 먼저 대기열에 넣고 먼저 처리
+- 압축은 CompressionBatch.measure_job으로 실행하므로 엔진, 캐시, 동시 실행 수, 측정값 설정을 그대로 사용
+- 처리한 파일은 감시 폴더의 매니페스트(pdf_manifest)에 기록하여 다시 시작해도 중복 처리하지 않음
+- 실패한 파일은 크기나 수정 시각이 바뀔 때까지 다시 처리하지 않음 (손상 파일을 계속 재시도하지 않도록)
+
+사용 예:
+    python pdf_watch.py inbox/ -o outbox/ -q ebook -j 4
+    python pdf_watch.py /mnt/share/inbox -o /mnt/share/outbox --poll   # 네트워크 공유 폴더 (inotify 불가)
+"""
+import argparse
+import ctypes
+import itertools
+import os
+import queue
+import select
+import signal
+import struct
+import sys
+import threading
+import time
+
+import pdf_engine
+import pdf_limits
+from pdf_cache import ResultCache
+from pdf_manifest import FolderManifest, iter_pdf_files
+from pdf_metrics import MetricsLog
+from pdf_rewrite import DEFAULT_FLATE_LEVEL
+from pdf_schedule import DEFAULT_LANE, LANES
+from pdf_scratch import check_scratch_dir
+from pdf_target import parse_size
+
+# 파일 크기와 수정 시각이 이 시간(초) 동안 그대로여야 다 쓰인 것으로 봄
+SETTLE_SECONDS = 2.0
+# 끝에 %%EOF가 없어도 이 시간(초) 동안 바뀌지 않으면 처리 (손상 파일은 압축 단계에서 실패로 기록)
+INCOMPLETE_GRACE = 60.0
+# 파일 끝에서 %%EOF를 찾는 범위 (바이트)
+EOF_PROBE_BYTES = 1024
+# 폴링 모드에서 폴더를 훑는 간격 (초)
+POLL_INTERVAL = 2.0
+# inotify 모드에서도 놓친 변경을 잡기 위해 폴더 전체를 다시 훑는 간격 (초)
+RESCAN_INTERVAL = 30.0
+# 작업 스레드 하나당 대기열 크기
+QUEUE_PER_WORKER = 2
+
+# inotify 이벤트 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """ctypes로 호출하는 최소한의 inotify 래퍼"""
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify는 Linux에서만 사용할 수 있습니다.")
+        libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify를 지원하지 않는 C 라이브러리입니다.")
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.watches = {}
+
+    def add_watch(self, path):
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        self.watches[wd] = path
+
+    def read(self, timeout):
+        """이벤트 목록 [(경로, mask)] (timeout초 동안 이벤트가 없으면 빈 목록)"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            folder = self.watches.get(wd)
+            if mask & IN_Q_OVERFLOW or folder is None:
+                events.append((None, mask))
+            else:
+                events.append((os.path.join(folder, os.fsdecode(name)), mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """
+    감시 폴더의 변경 감지
+    - mode: "inotify" 또는 "poll" (inotify를 만들 수 없거나 감시 수 한도를 넘으면 poll)
+    - changes(timeout): 바뀐 것으로 보이는 PDF 경로 목록, 폴더 전체를 다시 훑어야 하면 None
+    """
+    def __init__(self, folder, poll=False):
+        self.folder = folder
+        self.mode = "poll"
+        self._inotify = None
+        if poll:
+            return
+        try:
+            self._inotify = _Inotify()
+            self._watch_tree(folder)
+            self.mode = "inotify"
+        except OSError:
+            self.close()
+
+    def _watch_tree(self, root):
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            self._inotify.add_watch(current)
+            try:
+                with os.scandir(current) as it:
+                    stack.extend(entry.path for entry in it if entry.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+
+    def changes(self, timeout):
+        if self._inotify is None:
+            time.sleep(timeout)
+            return None
+        paths = []
+        for path, mask in self._inotify.read(timeout):
+            if path is None:
+                return None
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # 새 하위 폴더: 감시를 추가하고 감시 전에 들어온 파일도 확인
+                    try:
+                        self._watch_tree(path)
+                    except OSError:
+                        return None
+                    paths.extend(pdf for pdf, _ in iter_pdf_files(path))
+            elif path.lower().endswith(".pdf"):
+                paths.append(path)
+        return paths
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def looks_complete(path, size):
+    """파일 끝 부분에 %%EOF가 있는지 확인 (복사 중인 파일 걸러내기)"""
+    try:
+        with open(path, "rb") as f:
+            f.seek(max(0, size - EOF_PROBE_BYTES))
+            return b"%%EOF" in f.read(EOF_PROBE_BYTES)
+    except OSError:
+        return False
+
+
+class WatchService:
+    """
+    감시 폴더 -> 대기열 -> 작업 스레드 -> 출력 폴더
+    - batch: 압축에 쓸 CompressionBatch (작업 목록은 비워 두고 measure_job만 사용)
+    - 작업 스레드 수는 batch.worker_threads, 대기열 크기는 queue_size (가득 차면 감지한 파일은 대기 목록에 남음)
+    - settings: 매니페스트에 기록할 압축 설정 (설정이 바뀌면 이미 처리한 파일도 다시 처리)
+    - interactive_below(바이트)보다 작은 파일은 interactive 레인 (대기열에 먼저 넣고 먼저 꺼냄)
+
+    큐에 들어가는 이벤트:
+    - ("watching", 감지 방식)
+    - ("queued", 입력 파일, 대기열 길이)
+    - ("backpressure", 대기 중인 파일 수)  (대기열이 가득 찼을 때 한 번)
+    - ("finished", 입력 파일, 출력 파일, 오류 메시지 또는 None, 감지부터 완료까지 걸린 시간(초))
+    """
+    def __init__(self, folder, output_dir, batch, events, settings, queue_size=None, poll=False,
+                 settle_seconds=SETTLE_SECONDS, interactive_below=None):
+        self.folder = os.path.abspath(folder)
+        self.output_dir = os.path.abspath(output_dir)
+        self.batch = batch
+        self.events = events
+        self.settings = settings
+        self.poll = poll
+        self.settle_seconds = settle_seconds
+        self.interactive_below = interactive_below
+        # (레인 순서, 넣은 순서, 입력 파일, 처음 감지한 시각)
+        self.jobs = queue.PriorityQueue(maxsize=queue_size or batch.worker_threads * QUEUE_PER_WORKER)
+        self._sequence = itertools.count()
+        self.manifest = FolderManifest(self.folder)
+        self.watcher = None
+
+        # 감지했지만 아직 대기열에 넣지 않은 파일 {경로: [크기, 수정 시각, 마지막 변경 시각, 처음 감지한 시각]}
+        self._pending = {}
+        # 대기열에 있거나 처리 중인 파일
+        self._in_flight = set()
+        # 압축에 실패한 파일 {경로: (크기, 수정 시각)} (파일이 바뀔 때까지 다시 처리하지 않음, 다시 시작하면 재시도)
+        self._failed = {}
+        self._lock = threading.Lock()
+        self._manifest_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._backpressure = False
+
+    def start(self):
+        """감시 스레드와 작업 스레드 시작"""
+        if self.output_dir == self.folder or self.folder.startswith(self.output_dir + os.sep):
+            raise ValueError("출력 폴더는 감시 폴더와 같거나 감시 폴더를 포함할 수 없습니다.")
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.batch.open()
+        self.watcher = FolderWatcher(self.folder, self.poll)
+        self.events.put(("watching", self.watcher.mode))
+        self._threads = [threading.Thread(target=self._watch_loop, daemon=True)]
+        self._threads += [threading.Thread(target=self._work, daemon=True) for _ in range(self.batch.worker_threads)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, cancel=False):
+        """
+        감시 중지 (대기열에 남은 파일은 버리고 다음 실행에서 다시 감지)
+        - cancel=False: 처리 중인 파일은 끝까지 처리
+        - cancel=True: 처리 중인 gs 프로세스도 종료
+        """
+        self._stop_event.set()
+        if cancel:
+            self.batch.cancel()
+        while True:
+            try:
+                _, _, input_file, _ = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._in_flight.discard(input_file)
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+        if self.watcher is not None:
+            self.watcher.close()
+        self.batch.close()
+
+    @property
+    def running(self):
+        return not self._stop_event.is_set()
+
+    def output_path(self, input_file):
+        """출력 폴더에서 입력 파일과 같은 상대 경로"""
+        return os.path.join(self.output_dir, os.path.relpath(input_file, self.folder))
+
+    def _excluded(self, path):
+        return path == self.output_dir or path.startswith(self.output_dir + os.sep)
+
+    def _watch_loop(self):
+        self._rescan()
+        next_rescan = time.monotonic() + RESCAN_INTERVAL
+        while not self._stop_event.is_set():
+            interval = POLL_INTERVAL if self.watcher.mode == "poll" else 1.0
+            if self._pending:
+                interval = min(interval, self.settle_seconds / 2)
+            paths = self.watcher.changes(interval)
+            if paths is None or time.monotonic() >= next_rescan:
+                self._rescan()
+                next_rescan = time.monotonic() + RESCAN_INTERVAL
+            else:
+                for path in paths:
+                    try:
+                        self._notice(path, os.stat(path))
+                    except OSError:
+                        self._pending.pop(path, None)
+            self._offer_ready()
+
+    def _rescan(self):
+        for path, stat in iter_pdf_files(self.folder):
+            self._notice(path, stat)
+
+    def _notice(self, path, stat):
+        """감지한 파일을 대기 목록에 넣거나 바뀐 크기/수정 시각 갱신"""
+        if self._excluded(path) or not path.lower().endswith(".pdf"):
+            return
+        with self._lock:
+            if path in self._in_flight:
+                return
+            failed = self._failed.get(path)
+            if failed is not None:
+                if failed == (stat.st_size, stat.st_mtime_ns):
+                    return
+                del self._failed[path]
+        if self.manifest.is_current(path, stat, self.settings):
+            return
+        now = time.monotonic()
+        entry = self._pending.get(path)
+        if entry is None:
+            self._pending[path] = [stat.st_size, stat.st_mtime_ns, now, now]
+        elif (entry[0], entry[1]) != (stat.st_size, stat.st_mtime_ns):
+            entry[0], entry[1], entry[2] = stat.st_size, stat.st_mtime_ns, now
+
+    def lane(self, size):
+        """파일 크기 -> 레인"""
+        if self.interactive_below and size < self.interactive_below:
+            return "interactive"
+        return DEFAULT_LANE
+
+    def _offer_ready(self):
+        """다 쓰인 파일을 레인 순서, 감지한 순서대로 대기열에 넣음 (가득 차면 다음 기회에)"""
+        now = time.monotonic()
+        ordered = sorted(self._pending.items(), key=lambda item: (LANES.index(self.lane(item[1][0])), item[1][3]))
+        for path, entry in ordered:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            if (entry[0], entry[1]) != (stat.st_size, stat.st_mtime_ns):
+                entry[0], entry[1], entry[2] = stat.st_size, stat.st_mtime_ns, now
+                continue
+            settled_for = now - entry[2]
+            if settled_for < self.settle_seconds:
+                continue
+            if not looks_complete(path, stat.st_size) and settled_for < INCOMPLETE_GRACE:
+                continue
+            with self._lock:
+                self._in_flight.add(path)
+            try:
+                lane = LANES.index(self.lane(stat.st_size))
+                self.jobs.put_nowait((lane, next(self._sequence), path, entry[3]))
+            except queue.Full:
+                with self._lock:
+                    self._in_flight.discard(path)
+                if not self._backpressure:
+                    self._backpressure = True
+                    self.events.put(("backpressure", len(self._pending)))
+                return
+            del self._pending[path]
+            self._backpressure = False
+            self.events.put(("queued", path, self.jobs.qsize()))
+
+    def _work(self):
+        while not self._stop_event.is_set():
+            try:
+                _, _, input_file, first_seen = self.jobs.get(timeout=1)
+            except queue.Empty:
+                continue
+            output_file = self.output_path(input_file)
+            error = stat = None
+            try:
+                stat = os.stat(input_file)
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                if self.batch.measure_job(input_file, output_file):
+                    with self._manifest_lock:
+                        self.manifest.record(input_file, self.settings, stat)
+                        self.manifest.save()
+                else:
+                    error = "취소됨"
+            except Exception as e:
+                error = str(e)
+                if stat is not None:
+                    with self._lock:
+                        self._failed[input_file] = (stat.st_size, stat.st_mtime_ns)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(input_file)
+            self.events.put(("finished", input_file, output_file, error, time.monotonic() - first_seen))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pdf_watch.py", description="폴더를 감시하며 새 PDF 자동 압축")
+    parser.add_argument("folder", help="감시할 폴더 (하위 폴더 포함)")
+    parser.add_argument("-o", "--output-dir", required=True, help="출력 폴더 (감시 폴더와 같은 구조로 저장)")
+    parser.add_argument("-q", "--quality", default="ebook",
+                        help="압축 품질: screen, ebook, printer, prepress (기본값: ebook)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="동시에 처리할 파일 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="부하와 메모리에 따라 동시 처리 수 자동 조절 (-j 값에서 시작)")
+    parser.add_argument("--min-jobs", type=int, default=1, help="자동 조절 시 최소 동시 처리 수 (기본값: 1)")
+    parser.add_argument("--max-jobs", type=int, help="자동 조절 시 최대 동시 처리 수 (기본값: CPU 코어 수 x 2)")
+    parser.add_argument("--queue-size", type=int,
+                        help=f"대기열 크기 (기본값: 동시 처리 수 x {QUEUE_PER_WORKER})")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS, metavar="SECONDS",
+                        help=f"파일이 이 시간 동안 바뀌지 않으면 다 쓰인 것으로 봄 (기본값: {SETTLE_SECONDS:g})")
+    parser.add_argument("--interactive-below", type=parse_size, metavar="SIZE",
+                        help="이 크기보다 작은 파일은 큰 파일보다 먼저 처리 (예: 5MB)")
+    parser.add_argument("--poll", action="store_true",
+                        help="inotify 대신 주기적으로 폴더 훑기 (네트워크 공유 폴더 등)")
+    parser.add_argument("--gs", dest="ghostscript_path", help="Ghostscript 실행 파일 경로")
+    parser.add_argument("--engine", choices=pdf_engine.ENGINES, default=pdf_engine.DEFAULT_ENGINE,
+                        help="압축 엔진 (pdf_cli.py와 같음, 기본값: ghostscript)")
+    parser.add_argument("--flate-level", type=int, choices=range(1, 10), default=DEFAULT_FLATE_LEVEL,
+                        metavar="1-9", help=f"python 엔진의 Flate 압축 수준 (기본값: {DEFAULT_FLATE_LEVEL})")
+    parser.add_argument("--memory-limit", type=parse_size, metavar="SIZE",
+                        help="python 엔진을 스트리밍 모드로 실행할 메모리 상한 (예: 1GB)")
+    parser.add_argument("--persistent", action="store_true", help="상주 Ghostscript 인터프리터 사용")
+    parser.add_argument("--scratch-dir", help="압축 중 임시 출력 폴더 (tmpfs, 로컬 SSD 등, 기본값: 출력 폴더)")
+    parser.add_argument("--timeout", dest="job_timeout", type=float, metavar="SECONDS",
+                        help="파일 하나의 Ghostscript 실행 시간 상한")
+    parser.add_argument("--cpu-limit", type=int, metavar="SECONDS", help="gs 프로세스 하나의 CPU 시간 상한")
+    parser.add_argument("--memory-cap", type=parse_size, metavar="SIZE", help="gs 프로세스 하나의 주소 공간 상한")
+    parser.add_argument("--fallback", choices=pdf_limits.FALLBACKS, default=pdf_limits.DEFAULT_FALLBACK,
+                        help="제한에 걸린 파일 처리 (pdf_cli.py와 같음, 기본값: screen)")
+    parser.add_argument("--cache-dir", help="결과 캐시 폴더")
+    parser.add_argument("--metrics-log", metavar="PATH", help="작업별 측정값을 JSONL로 추가 기록")
+    parser.add_argument("--prometheus", metavar="PATH", help="집계 측정값을 Prometheus 텍스트 형식 파일로 저장")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    try:
+        compression = pdf_engine.normalize_compression(args.quality)
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    if not os.path.isdir(args.folder):
+        print(f"오류: 폴더를 찾을 수 없습니다: {args.folder}", file=sys.stderr)
+        return 2
+
+    if args.persistent and args.cpu_limit:
+        print("오류: --persistent는 --cpu-limit과 함께 쓸 수 없습니다 (상주 인터프리터는 작업마다 CPU 시간을 나눌 수 없음).",
+              file=sys.stderr)
+        return 2
+
+    ghostscript_path = args.ghostscript_path or pdf_engine.find_ghostscript()
+    if not ghostscript_path and args.engine == "ghostscript":
+        print("오류: Ghostscript를 찾을 수 없습니다.", file=sys.stderr)
+        return 2
+
+    if args.scratch_dir:
+        try:
+            check_scratch_dir(args.scratch_dir)
+        except OSError as e:
+            print(f"오류: scratch 폴더를 사용할 수 없습니다: {e}", file=sys.stderr)
+            return 2
+
+    cache = ResultCache(args.cache_dir) if args.cache_dir else None
+    telemetry = None
+    if args.metrics_log or args.prometheus:
+        telemetry = MetricsLog(args.metrics_log, args.prometheus)
+
+    events = queue.Queue()
+    batch = pdf_engine.CompressionBatch(
+        ghostscript_path, compression, [], args.jobs, events, cache=cache,
+        persistent=args.persistent,
+        telemetry=telemetry,
+        engine=args.engine,
+        flate_level=args.flate_level,
+        memory_limit=args.memory_limit,
+        scratch_dir=args.scratch_dir,
+        adaptive=(args.min_jobs, args.max_jobs or 2 * (os.cpu_count() or 1)) if args.adaptive else None,
+        job_timeout=args.job_timeout,
+        cpu_limit=args.cpu_limit,
+        address_space_limit=args.memory_cap,
+        fallback=args.fallback
+    )
+    # 매니페스트 설정: 결과에 영향을 주는 옵션이 하나라도 바뀌면 이미 처리한 파일도 다시 처리
+    settings = {
+        "compression": compression,
+        "engine": args.engine,
+        "flate_level": args.flate_level,
+        "memory_limit": args.memory_limit,
+        "job_timeout": args.job_timeout,
+        "cpu_limit": args.cpu_limit,
+        "memory_cap": args.memory_cap,
+        "fallback": args.fallback,
+        "output_dir": os.path.abspath(args.output_dir),
+    }
+    service = WatchService(args.folder, args.output_dir, batch, events, settings,
+                           queue_size=args.queue_size, poll=args.poll, settle_seconds=args.settle,
+                           interactive_below=args.interactive_below)
+
+    # SIGTERM(컨테이너 종료 등)도 Ctrl+C와 같이 처리
+    signal.signal(signal.SIGTERM, lambda signum, frame: signal.raise_signal(signal.SIGINT))
+    try:
+        service.start()
+    except (OSError, ValueError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        while True:
+            try:
+                event = events.get(timeout=1)
+            except queue.Empty:
+                continue
+            if event[0] == "watching":
+                print(f"감시 시작 ({event[1]}): {service.folder} -> {service.output_dir}", file=sys.stderr)
+            elif event[0] == "queued":
+                print(f"대기열 추가: {event[1]} (대기 {event[2]}개)", file=sys.stderr)
+            elif event[0] == "concurrency":
+                print(f"동시 처리 수 {event[1]} -> {event[2]}: {event[3]}", file=sys.stderr)
+            elif event[0] == "backpressure":
+                print(f"대기열이 가득 찼습니다. 대기 중인 파일 {event[1]}개", file=sys.stderr)
+            elif event[0] == "finished":
+                _, input_file, output_file, error, latency = event
+                if error:
+                    print(f"실패: {input_file} ({error.strip()})", file=sys.stderr)
+                else:
+                    details = batch.details.get(input_file, {})
+                    note = ""
+                    if "fallback" in details:
+                        note = f", {pdf_limits.LIMIT_NAMES[details['limit']]} -> {details['fallback']}"
+                    print(f"완료: {input_file} -> {output_file} ({latency:.1f}초{note})", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("중지하는 중... (처리 중인 파일을 마칩니다. 다시 누르면 바로 종료)", file=sys.stderr)
+        service.stop()
+        try:
+            service.join()
+        except KeyboardInterrupt:
+            service.stop(cancel=True)
+            service.join()
+    finally:
+        if telemetry is not None:
+            telemetry.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 모듈이 저장소 최상위에 바로 있으므로 (패키지 아님) 가져올 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
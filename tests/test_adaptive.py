@@ -0,0 +1,103 @@
+import pytest
+
+from pdf_adaptive import (
+    GROW_COOLDOWN,
+    MEMORY_RESERVE_MIN,
+    MEMORY_RESERVE_SHARE,
+    ConcurrencyController,
+    ConcurrencyLimit,
+)
+
+GB = 1024 * 1024 * 1024
+MB = 1024 * 1024
+
+
+def make_controller(limit=4, minimum=1, maximum=8):
+    return ConcurrencyController(ConcurrencyLimit(limit), minimum, maximum, lambda: [])
+
+
+def make_sample(**values):
+    sample = {
+        "load": None,
+        "memory_total": None,
+        "memory_available": None,
+        "children": 0,
+        "child_rss": None,
+        "io_pressure": None,
+        "active": 4,
+        "waiting": 0,
+    }
+    sample.update(values)
+    return sample
+
+
+@pytest.fixture
+def controller():
+    controller = make_controller()
+    controller.cpu_count = 4
+    return controller
+
+
+def test_no_change_when_nothing_waits(controller):
+    assert controller.decide(make_sample(load=0.0), 100.0) == (4, None)
+
+
+def test_grows_when_jobs_wait_and_resources_are_free(controller):
+    target, reason = controller.decide(make_sample(load=0.0, waiting=3), GROW_COOLDOWN + 1)
+    assert target == 5
+    assert reason
+
+
+def test_does_not_grow_during_cooldown(controller):
+    assert controller.decide(make_sample(load=0.0, waiting=3), GROW_COOLDOWN - 1) == (4, None)
+
+
+def test_does_not_grow_under_load(controller):
+    assert controller.decide(make_sample(load=4 * 1.0, waiting=3), GROW_COOLDOWN + 1) == (4, None)
+
+
+def test_shrinks_by_one_under_high_load(controller):
+    target, reason = controller.decide(make_sample(load=4 * 2.0), 100.0)
+    assert target == 3
+    assert "부하" in reason
+
+
+def test_shrinks_under_io_pressure(controller):
+    target, reason = controller.decide(make_sample(io_pressure=80.0), 100.0)
+    assert target == 3
+    assert "I/O" in reason
+
+
+def test_memory_shortage_shrinks_by_missing_children(controller):
+    # 남겨 둘 메모리보다 512MB 모자라고 자식 하나가 256MB -> 2개 줄임
+    reserve = max(MEMORY_RESERVE_MIN, 8 * GB * MEMORY_RESERVE_SHARE)
+    sample = make_sample(memory_total=8 * GB, memory_available=reserve - 512 * MB, child_rss=256 * MB)
+    target, reason = controller.decide(sample, 0.0)
+    assert target == 2
+    assert "메모리" in reason
+
+
+def test_never_goes_below_minimum():
+    controller = make_controller(limit=1, minimum=1, maximum=4)
+    assert controller.decide(make_sample(load=100.0, active=1), 100.0) == (1, None)
+
+
+def test_limit_above_maximum_is_clamped():
+    controller = make_controller(limit=8, minimum=1, maximum=2)
+    target, reason = controller.decide(make_sample(), 0.0)
+    assert target == 2
+    assert reason
+
+
+def test_limit_below_minimum_is_raised():
+    controller = make_controller(limit=1, minimum=3, maximum=6)
+    assert controller.decide(make_sample(), 0.0)[0] == 3
+
+
+def test_step_records_decision_and_applies_limit():
+    controller = make_controller(limit=8, minimum=1, maximum=2)
+    controller.sample = lambda: make_sample()
+    decision = controller.step()
+    assert controller.limit.limit == 2
+    assert (decision["from"], decision["to"]) == (8, 2)
+    assert controller.decisions == [decision]
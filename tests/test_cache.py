@@ -0,0 +1,60 @@
+import os
+
+from pdf_cache import CACHE_LOW_WATERMARK, ResultCache
+
+
+def write(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+def key(n):
+    return f"{n:064x}"
+
+
+def test_restore_same_key_does_not_double_count(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=10000)
+    cache.store(key(1), write(tmp_path / "a.pdf", 1000))
+    cache.store(key(1), write(tmp_path / "b.pdf", 300))
+    assert cache.stats()["bytes"] == 300
+
+
+def test_evicts_least_recently_used_down_to_low_watermark(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=1000)
+    output = write(tmp_path / "out.pdf", 300)
+    for n in range(3):
+        cache.store(key(n), output)
+    # 0번을 사용하면 가장 오래 사용하지 않은 항목은 1번
+    assert cache.fetch(key(0), str(tmp_path / "hit.pdf"))
+    cache.store(key(3), output)
+    assert cache.stats()["bytes"] <= 1000 * CACHE_LOW_WATERMARK
+    assert not cache.fetch(key(1), str(tmp_path / "miss.pdf"))
+    assert cache.fetch(key(0), str(tmp_path / "hit2.pdf"))
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=10000)
+    cache.store(key(1), write(tmp_path / "a.pdf", 400))
+    cache.store(key(2), write(tmp_path / "b.pdf", 600))
+    reopened = ResultCache(str(tmp_path / "cache"), max_bytes=10000)
+    assert reopened.stats()["bytes"] == 1000
+
+
+def test_missing_entry_is_dropped_from_index(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=10000)
+    cache.store(key(1), write(tmp_path / "a.pdf", 400))
+    os.remove(cache._path(key(1)))
+    assert not cache.fetch(key(1), str(tmp_path / "miss.pdf"))
+    assert cache.stats()["bytes"] == 0
+
+
+def test_editing_fetched_output_does_not_change_cache(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=10000)
+    cache.store(key(1), write(tmp_path / "a.pdf", 400))
+    fetched = str(tmp_path / "hit.pdf")
+    assert cache.fetch(key(1), fetched)
+    with open(fetched, "r+b") as f:
+        f.write(b"edited")
+    with open(cache._path(key(1)), "rb") as f:
+        assert f.read() == b"x" * 400
@@ -0,0 +1,76 @@
+import hashlib
+import io
+import socket
+import threading
+
+import pytest
+
+from pdf_distributed import FRAME_HEADER, MAX_HEADER_BYTES, recv_message, recv_payload, send_message
+
+
+@pytest.fixture
+def pair():
+    left, right = socket.socketpair()
+    yield left, right
+    left.close()
+    right.close()
+
+
+def test_message_round_trip(pair):
+    left, right = pair
+    send_message(left, {"type": "hello", "name": "작업자"})
+    assert recv_message(right) == {"type": "hello", "name": "작업자"}
+
+
+def test_payload_round_trip(pair):
+    left, right = pair
+    data = bytes(range(256)) * 1000
+    # 소켓 버퍼보다 크므로 받는 쪽과 동시에 보냄
+    sender = threading.Thread(target=send_message, args=(left, {"type": "job", "size": len(data)}, io.BytesIO(data)))
+    sender.start()
+    message = recv_message(right)
+    sink = io.BytesIO()
+    recv_payload(right, message["size"], sink)
+    sender.join()
+    assert sink.getvalue() == data
+
+
+def test_corrupted_payload_fails_checksum_but_keeps_connection(pair):
+    left, right = pair
+    data = b"%PDF-1.4 hello"
+    header = FRAME_HEADER.pack(len(b"{}")) + b"{}"
+    left.sendall(header + b"%PDF-1.4 jello" + hashlib.sha256(data).digest())
+    send_message(left, {"type": "next"})
+    assert recv_message(right) == {}
+    with pytest.raises(ValueError):
+        recv_payload(right, len(data), io.BytesIO())
+    # 다이제스트까지 다 읽었으므로 다음 메시지를 그대로 받을 수 있음
+    assert recv_message(right) == {"type": "next"}
+
+
+def test_payload_shorter_than_size_is_rejected(pair):
+    left, _ = pair
+    with pytest.raises(RuntimeError):
+        send_message(left, {"type": "job", "size": 10}, io.BytesIO(b"short"))
+
+
+def test_oversized_header_is_rejected(pair):
+    left, right = pair
+    left.sendall(FRAME_HEADER.pack(MAX_HEADER_BYTES + 1))
+    with pytest.raises(ValueError):
+        recv_message(right)
+
+
+def test_non_object_header_is_rejected(pair):
+    left, right = pair
+    left.sendall(FRAME_HEADER.pack(2) + b"[]")
+    with pytest.raises(ValueError):
+        recv_message(right)
+
+
+def test_closed_connection_raises(pair):
+    left, right = pair
+    left.sendall(FRAME_HEADER.pack(100) + b"{")
+    left.close()
+    with pytest.raises(ConnectionError):
+        recv_message(right)
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from pdf_journal import DONE, FAILED, QUEUED, RUNNING, JobJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = JobJournal(str(tmp_path / "journal.sqlite3"))
+    yield journal
+    journal.close()
+
+
+def absolute(jobs):
+    return [(os.path.abspath(input_file), os.path.abspath(output_file)) for input_file, output_file in jobs]
+
+
+JOBS = [("a.pdf", "out/a.pdf"), ("b.pdf", "out/b.pdf"), ("c.pdf", "out/c.pdf")]
+
+
+def test_new_run_is_all_queued(journal):
+    run = journal.start_run({"quality": "ebook"}, JOBS)
+    assert run.counts() == {QUEUED: 3, RUNNING: 0, DONE: 0, FAILED: 0}
+    assert run.pending() == absolute(JOBS)
+
+
+def test_pending_keeps_unfinished_and_running_in_order(journal):
+    run = journal.start_run({}, JOBS)
+    run.mark("a.pdf", RUNNING)
+    run.mark("a.pdf", DONE)
+    run.mark("b.pdf", RUNNING)
+    run.mark("c.pdf", RUNNING)
+    run.mark("c.pdf", FAILED, "오류")
+    # 꺼질 때 running이던 b는 다시 실행, 실패한 c는 retry_failed일 때만
+    assert run.pending() == absolute(JOBS[1:2])
+    assert run.pending(retry_failed=True) == absolute(JOBS[1:])
+    assert run.counts() == {QUEUED: 0, RUNNING: 1, DONE: 1, FAILED: 1}
+
+
+def test_running_counts_attempts(journal):
+    run = journal.start_run({}, JOBS[:1])
+    run.mark("a.pdf", RUNNING)
+    run.mark("a.pdf", QUEUED)
+    run.mark("a.pdf", RUNNING)
+    run.mark("a.pdf", FAILED, "오류")
+    rows = journal._execute("SELECT attempts, error FROM jobs WHERE run_id = ?", (run.id,))
+    assert rows == [(2, "오류")]
+
+
+def test_latest_run_survives_reopen(tmp_path):
+    path = str(tmp_path / "journal.sqlite3")
+    journal = JobJournal(path)
+    journal.start_run({"quality": "screen"}, JOBS[:1])
+    run = journal.start_run({"quality": "ebook", "target_size": None}, JOBS)
+    run.mark("a.pdf", DONE)
+    journal.close()
+
+    reopened = JobJournal(path)
+    try:
+        latest = reopened.latest_run()
+        assert latest.id == run.id
+        assert latest.settings == {"quality": "ebook", "target_size": None}
+        assert latest.pending() == absolute(JOBS[1:])
+    finally:
+        reopened.close()
+
+
+def test_latest_run_is_none_for_empty_journal(journal):
+    assert journal.latest_run() is None
@@ -0,0 +1,42 @@
+import signal
+
+import pytest
+
+from pdf_limits import classify_failure, limit_preexec
+
+SIGKILL = -signal.SIGKILL
+SIGXCPU = -getattr(signal, "SIGXCPU", 0)
+
+
+def test_timeout_wins():
+    assert classify_failure(SIGKILL, "", True, cpu_seconds=10) == "timeout"
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGXCPU"), reason="SIGXCPU 없음")
+def test_sigxcpu_is_cpu_limit():
+    assert classify_failure(SIGXCPU, "", False, cpu_seconds=10) == "cpu"
+
+
+def test_sigxcpu_without_cpu_limit_is_not_a_limit():
+    assert classify_failure(SIGXCPU, "", False) is None
+
+
+def test_sigkill_is_cpu_only_when_cpu_time_reached_the_limit():
+    assert classify_failure(SIGKILL, "", False, cpu_seconds=10, cpu_used=15.0) == "cpu"
+    # OOM killer 등 다른 원인
+    assert classify_failure(SIGKILL, "", False, cpu_seconds=10, cpu_used=2.0) is None
+    assert classify_failure(SIGKILL, "", False, cpu_seconds=10) is None
+
+
+def test_memory_markers_need_address_space_limit():
+    output = "Error: /VMerror in --run--"
+    assert classify_failure(1, output, False, address_space=512 * 1024 * 1024) == "memory"
+    assert classify_failure(1, output, False) is None
+
+
+def test_plain_failure_is_not_a_limit():
+    assert classify_failure(1, "Error: /undefined in foo", False, cpu_seconds=10, address_space=1024) is None
+
+
+def test_limit_preexec_is_none_without_limits():
+    assert limit_preexec() is None
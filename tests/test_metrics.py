@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pdf_metrics import MeasuredPopen
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "wait4"), reason="os.wait4 없음")
+
+
+def test_communicate_collects_rusage_and_exit_code():
+    process = MeasuredPopen([sys.executable, "-c", "import sys; sys.exit(3)"], stdout=subprocess.PIPE)
+    process.communicate()
+    assert process.returncode == 3
+    assert process.rusage is not None
+    assert process.rusage.ru_maxrss > 0
+
+
+def test_killed_process_reports_signal():
+    process = MeasuredPopen([sys.executable, "-c", "import time; time.sleep(30)"])
+    process.kill()
+    assert process.wait() == -9
+    assert process.rusage is not None
+
+
+def test_wait_with_timeout_keeps_default_behaviour():
+    process = MeasuredPopen([sys.executable, "-c", "import time; time.sleep(30)"])
+    with pytest.raises(subprocess.TimeoutExpired):
+        process.wait(0.01)
+    process.kill()
+    process.wait()
@@ -0,0 +1,97 @@
+from pdf_schedule import MIN_HISTORY, SECONDS_PER_MB, SECONDS_PER_PAGE, CostModel, base_cost, plan
+
+MB = 1024 * 1024
+
+
+def make_file(folder, name, size):
+    path = folder / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def record(wall_seconds, input_bytes=MB, pages=10, preset="/ebook", engine="ghostscript", **extra):
+    values = {"status": "ok", "wall_seconds": wall_seconds, "input_bytes": input_bytes, "pages": pages,
+              "preset": preset, "engine": engine}
+    values.update(extra)
+    return values
+
+
+def test_base_cost_uses_size_and_pages():
+    assert base_cost(2 * MB, 10) == 2 * SECONDS_PER_MB + 10 * SECONDS_PER_PAGE
+
+
+def test_scale_needs_min_history():
+    model = CostModel()
+    for _ in range(MIN_HISTORY - 1):
+        model.observe(record(base_cost(MB, 10) * 3))
+    assert model.scale("/ebook", "ghostscript") == 1.0
+    model.observe(record(base_cost(MB, 10) * 3))
+    assert abs(model.scale("/ebook", "ghostscript") - 3.0) < 1e-9
+
+
+def test_scale_is_per_preset_and_engine():
+    model = CostModel()
+    for _ in range(MIN_HISTORY):
+        model.observe(record(base_cost(MB, 10) * 2, engine="python"))
+    assert model.scale("/ebook", "ghostscript") == 1.0
+    assert model.scale("/screen", "python") == 1.0
+    assert abs(model.estimate(MB, 10, "/ebook", "python") - base_cost(MB, 10) * 2) < 1e-9
+
+
+def test_observe_ignores_failed_and_cached_records():
+    model = CostModel()
+    for _ in range(MIN_HISTORY):
+        model.observe(record(100.0, status="failed"))
+        model.observe(record(100.0, cached=True))
+        model.observe(record(None))
+    assert model.scale("/ebook", "ghostscript") == 1.0
+
+
+def test_from_jsonl_skips_broken_lines(tmp_path):
+    log = tmp_path / "metrics.jsonl"
+    lines = ['{"status": "ok", "wall_seconds": %r, "input_bytes": %d, "pages": 10, "preset": "/ebook"}'
+             % (base_cost(MB, 10) * 4, MB)] * MIN_HISTORY
+    log.write_text("\n".join(lines + ["not json", "[1, 2]"]) + "\n", encoding="utf-8")
+    model = CostModel.from_jsonl(str(log))
+    assert abs(model.scale("/ebook", "ghostscript") - 4.0) < 1e-9
+    assert CostModel.from_jsonl(str(tmp_path / "missing.jsonl")).scale("/ebook", "ghostscript") == 1.0
+
+
+def test_plan_orders_longest_first_within_lane(tmp_path):
+    small = make_file(tmp_path, "small.pdf", 1000)
+    large = make_file(tmp_path, "large.pdf", 50000)
+    middle = make_file(tmp_path, "middle.pdf", 10000)
+    jobs = [(small, "s"), (large, "l"), (middle, "m")]
+    ordered, estimates = plan(jobs, "/ebook", page_counts={small: 1, large: 1, middle: 1})
+    assert [input_file for input_file, _ in ordered] == [large, middle, small]
+    assert estimates[large]["lane"] == "batch"
+    assert estimates[large]["pages"] == 1
+
+
+def test_plan_puts_interactive_lane_first(tmp_path):
+    small = make_file(tmp_path, "small.pdf", 1000)
+    large = make_file(tmp_path, "large.pdf", 50000)
+    ordered, _ = plan([(large, "l"), (small, "s")], "/ebook", lanes={small: "interactive"},
+                      page_counts={small: 1, large: 1})
+    assert ordered[0][0] == small
+
+
+def test_plan_keeps_original_order_for_ties_and_missing_files(tmp_path):
+    first = make_file(tmp_path, "first.pdf", 1000)
+    second = make_file(tmp_path, "second.pdf", 1000)
+    missing = str(tmp_path / "missing.pdf")
+    ordered, estimates = plan([(missing, "x"), (first, "a"), (second, "b")], "/ebook",
+                              page_counts={first: 1, second: 1})
+    assert [input_file for input_file, _ in ordered] == [first, second, missing]
+    assert estimates[missing]["estimated_seconds"] == 0
+
+
+def test_plan_uses_engine_scale(tmp_path):
+    model = CostModel()
+    for _ in range(MIN_HISTORY):
+        model.observe(record(base_cost(MB, 10) * 10, engine="python"))
+    slow = make_file(tmp_path, "slow.pdf", 1000)
+    fast = make_file(tmp_path, "fast.pdf", 5000)
+    ordered, _ = plan([(fast, "f"), (slow, "s")], "/ebook", model=model, engines={slow: "python"},
+                      page_counts={slow: 1, fast: 1})
+    assert ordered[0][0] == slow
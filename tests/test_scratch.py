@@ -0,0 +1,88 @@
+import errno
+import os
+
+import pytest
+
+import pdf_scratch
+from pdf_scratch import TEMP_PREFIX, publish_output, scratch_path, validate_output
+
+PDF = b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\ntrailer\n<<>>\n%%EOF\n"
+
+
+def write(path, data=PDF):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_scratch_path_is_hidden_and_free_of_percent(tmp_path):
+    path = scratch_path(str(tmp_path / "100%.pdf"))
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.basename(path).startswith(TEMP_PREFIX)
+    assert "%" not in os.path.basename(path)
+    assert not os.path.exists(path)
+
+
+def test_publish_replaces_destination(tmp_path):
+    source = write(scratch_path(str(tmp_path / "out.pdf")))
+    destination = write(tmp_path / "out.pdf", b"old")
+    publish_output(source, destination)
+    assert not os.path.exists(source)
+    with open(destination, "rb") as f:
+        assert f.read() == PDF
+
+
+def test_publish_copies_across_file_systems(tmp_path, monkeypatch):
+    source = write(tmp_path / "scratch.pdf")
+    destination = str(tmp_path / "dest" / "out.pdf")
+    os.makedirs(os.path.dirname(destination))
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # 첫 rename만 다른 파일 시스템인 것처럼 실패 (복사한 임시 파일의 rename은 그대로)
+        if src == source:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(pdf_scratch.os, "replace", replace)
+    publish_output(source, destination)
+    assert not os.path.exists(source)
+    with open(destination, "rb") as f:
+        assert f.read() == PDF
+    assert os.listdir(os.path.dirname(destination)) == ["out.pdf"]
+
+
+def test_failed_cross_device_copy_leaves_no_temp_file(tmp_path, monkeypatch):
+    source = write(tmp_path / "scratch.pdf")
+    destination = str(tmp_path / "dest" / "out.pdf")
+    os.makedirs(os.path.dirname(destination))
+
+    def replace(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    def copy(src, dst, length):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(pdf_scratch.os, "replace", replace)
+    monkeypatch.setattr(pdf_scratch.shutil, "copyfileobj", copy)
+    with pytest.raises(OSError):
+        publish_output(source, destination)
+    assert os.path.exists(source)
+    assert os.listdir(os.path.dirname(destination)) == []
+
+
+def test_other_rename_errors_are_raised(tmp_path):
+    source = write(tmp_path / "scratch.pdf")
+    with pytest.raises(OSError):
+        publish_output(source, str(tmp_path / "missing" / "out.pdf"))
+    assert os.path.exists(source)
+
+
+@pytest.mark.parametrize("data", [b"", b"%PDF-1.4\ntruncated", b"not a pdf %%EOF"])
+def test_validate_output_rejects_broken_files(tmp_path, data):
+    with pytest.raises(RuntimeError):
+        validate_output(write(tmp_path / "broken.pdf", data))
+
+
+def test_validate_output_accepts_pdf(tmp_path):
+    validate_output(write(tmp_path / "ok.pdf"))